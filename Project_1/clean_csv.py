@@ -1,5 +1,6 @@
-# clean_csv.py  (strict, resilient)
-import csv, sys, re, io
+# clean_csv.py  (strict, resilient, incremental)
+import csv, sys, re, os, shutil, hashlib
+from results_store import Store, store_for
 
 # canonical header we expect
 EXPECTED = [
@@ -7,12 +8,39 @@ EXPECTED = [
     "median_ms","p10_ms","p90_ms","gflops","gibps","cpe",
     "label","hint","check"
 ]
+# added by the threaded harness (memlab vec); older rows get the defaults
+OPTIONAL = {"threads": 1, "scaling": "none"}
 
 inp  = sys.argv[1] if len(sys.argv) > 1 else "results_ascii.csv"
 outp = sys.argv[2] if len(sys.argv) > 2 else "results_clean.csv"
+full = "--full" in sys.argv   # ignore the saved offset and rebuild everything
 
-# 1) Read raw bytes, strip NULs, decode robustly
-raw = open(inp, "rb").read().replace(b"\x00", b"")
+fieldnames = EXPECTED + ["vecmode"] + list(OPTIONAL)
+store = Store(store_for(outp))
+
+# 0) Resume after the bytes the last run consumed, if the input only grew since
+#    (same path, and the 4 KiB before the saved offset are unchanged)
+def tail_sha1(path, end):
+    with open(path, "rb") as f:
+        f.seek(max(0, end - 4096))
+        return hashlib.sha1(f.read(end - max(0, end - 4096))).hexdigest()
+
+src, size = store.source, os.path.getsize(inp)
+resume = (not full and os.path.exists(outp) and src.get("path") == os.path.abspath(inp)
+          and src.get("offset", 0) <= size and tail_sha1(inp, src["offset"]) == src.get("tail_sha1"))
+start = src["offset"] if resume else 0
+if not resume and os.path.isdir(store.path):
+    shutil.rmtree(store.path)
+    store = Store(store.path)
+
+# 1) Read new raw bytes, strip NULs, decode robustly; an unterminated last line
+#    (sweep still writing) is left for the next run
+with open(inp, "rb") as f:
+    f.seek(start)
+    raw = f.read()
+cut = raw.rfind(b"\n") + 1
+raw, end = raw[:cut], start + cut
+raw = raw.replace(b"\x00", b"")
 for enc in ("utf-8-sig", "utf-8", "cp1252", "latin-1"):
     try:
         txt = raw.decode(enc)
@@ -23,18 +51,31 @@ for enc in ("utf-8-sig", "utf-8", "cp1252", "latin-1"):
 # normalize newlines
 txt = txt.replace("\r\n", "\n").replace("\r", "\n")
 
-# 2) Ensure a header exists; if not, insert our expected header
+# 2) Ensure a header exists; if not, insert our expected header. On resume the
+#    header is the one in effect where the last run stopped.
 lines = [ln for ln in txt.split("\n") if ln.strip() != ""]
-if not lines or not lines[0].lower().startswith("kernel,"):
-    lines.insert(0, ",".join(EXPECTED))
+header = src.get("header") if resume else None
+if lines and lines[0].lower().startswith("kernel,"):
+    header = next(csv.reader([lines.pop(0)]))
+header = header or EXPECTED
+
+# 3) Parse and build STRICT rows (ignore unknown columns completely). A header
+#    line mid-file (concatenated runs) replaces the current one.
+def as_int(x):
+    try: return int(float(x))
+    except: return x
+def as_float(x):
+    try: return float(x)
+    except: return x
 
-# 3) Parse and build STRICT rows (ignore unknown columns completely)
-reader = csv.DictReader(io.StringIO("\n".join(lines)))
 rows = []
-for r in reader:
-    # skip stray header lines that appeared mid-file
-    if (r.get("kernel","").lower() == "kernel") or (not r.get("kernel")):
+for fields in csv.reader(lines):
+    if not fields or not fields[0]:
+        continue
+    if fields[0].lower() == "kernel":
+        header = fields
         continue
+    r = dict(zip(header, fields))
 
     # build a clean row with only EXPECTED keys
     clean = {k: (r.get(k) or "").strip() for k in EXPECTED}
@@ -43,28 +84,26 @@ for r in reader:
     hint = clean.get("hint","")
     m = re.search(r"mode:([A-Za-z0-9_+\-]+)", hint, re.IGNORECASE)
     clean["vecmode"] = m.group(1).upper() if m else "UNKNOWN"
+    for k, dflt in OPTIONAL.items():
+        clean[k] = (r.get(k) or "").strip() or dflt
 
     # coerce types (best effort)
-    def as_int(x):
-        try: return int(float(x))
-        except: return x
-    def as_float(x):
-        try: return float(x)
-        except: return x
-
-    for k in ("N","stride","misalign","tail"):
+    for k in ("N","stride","misalign","tail","threads"):
         clean[k] = as_int(clean[k])
     for k in ("median_ms","p10_ms","p90_ms","gflops","gibps","cpe","check"):
         clean[k] = as_float(clean[k])
 
     rows.append(clean)
 
-# 4) Write back with a fixed schema
-fieldnames = EXPECTED + ["vecmode"]
-with open(outp, "w", newline="", encoding="utf-8") as f:
+# 4) Append (or write, on a rebuild) with a fixed schema, then extend the columnar store
+with open(outp, "a" if resume else "w", newline="", encoding="utf-8") as f:
     w = csv.DictWriter(f, fieldnames=fieldnames)
-    w.writeheader()
+    if not resume:
+        w.writeheader()
     for r in rows:
         w.writerow(r)
+store.append(rows, {"path": os.path.abspath(inp), "offset": end,
+                    "tail_sha1": tail_sha1(inp, end), "header": header})
 
-print(f"Wrote {outp} with {len(rows)} rows and strict columns: {fieldnames}")
+verb = f"Appended {len(rows)} new rows to" if resume else f"Wrote {len(rows)} rows to"
+print(f"{verb} {outp} and {store.path} ({store.rows} rows) with strict columns: {fieldnames}")
@@ -0,0 +1,81 @@
+# plot_blocked.py
+import sys, re
+import pandas as pd
+import matplotlib.pyplot as plt
+
+def parse_mode_from_hint(hint: str) -> str:
+    if not isinstance(hint, str):
+        return "UNKNOWN"
+    m = re.search(r"mode:([A-Za-z0-9_+\-]+)", hint, flags=re.IGNORECASE)
+    return m.group(1).upper() if m else "UNKNOWN"
+
+def parse_token(hint, key):
+    m = re.search(rf"{key}:(\d+)", hint) if isinstance(hint, str) else None
+    return int(m.group(1)) if m else None
+
+def main():
+    if len(sys.argv) < 4:
+        print("Usage: plot_blocked.py <csv> <dtype> <mode> [--save out.png]")
+        sys.exit(1)
+    path, dtype, mode = sys.argv[1], sys.argv[2], sys.argv[3].upper()
+    out = sys.argv[sys.argv.index("--save")+1] if "--save" in sys.argv else None
+
+    df = pd.read_csv(path, encoding="utf-8", on_bad_lines="skip")
+    needed = {"kernel","dtype","N","median_ms","gibps","label","hint"}
+    missing = [c for c in needed if c not in df.columns]
+    if missing:
+        print("CSV missing required columns (run `memlab vec --sweep=blocked`):", missing); sys.exit(1)
+    df["vecmode"] = df["hint"].apply(parse_mode_from_hint)
+    df["threads"] = pd.to_numeric(df["threads"], errors="coerce").fillna(1).astype(int) if "threads" in df.columns else 1
+    df["steps"] = df["hint"].apply(lambda h: parse_token(h, "steps"))
+
+    base = df[(df["kernel"] == "stencil") & (df["dtype"] == dtype) & (df["vecmode"] == mode)
+              & df["label"].isin(["naive", "tuned"])]
+    if base.empty:
+        print(f"No blocked rows for dtype={dtype}, mode={mode}."); sys.exit(1)
+    if base["steps"].nunique() > 1:
+        print("Several step counts in the CSV; plotting steps =", int(base["steps"].max()))
+    base = base[base["steps"] == base["steps"].max()]
+    steps = int(base["steps"].iloc[0])
+    g = base.groupby(["label", "threads", "N"]).agg(ms=("median_ms", "median"), gibps=("gibps", "median"),
+                                                    hint=("hint", "first")).reset_index()
+    naive, tuned = g[g["label"] == "naive"], g[g["label"] == "tuned"]
+    # naive is timed on one thread and on the tuned team; pair each tuned row with naive on the same team
+    pair = tuned.merge(naive, on=["threads", "N"], suffixes=("", "_naive"))
+    serial = naive[naive["threads"] == 1].set_index("N")
+
+    fig, (ax_bw, ax_sp) = plt.subplots(1, 2, figsize=(11, 4))
+    for t, sub in naive.groupby("threads"):
+        ax_bw.plot(sub["N"], sub["gibps"], marker="o", label=f"naive x{t}")
+    for t, sub in tuned.groupby("threads"):
+        ax_bw.plot(sub["N"], sub["gibps"], marker="s", label=f"tuned (blocked) x{t}")
+    for _, row in tuned.iterrows():   # winning tile/depth per N
+        ax_bw.annotate(f"{parse_token(row['hint'], 'tile')}/{parse_token(row['hint'], 'depth')}",
+                       (row["N"], row["gibps"]), xytext=(0, 6), textcoords="offset points",
+                       fontsize=7, ha="center", color="tab:orange")
+    ax_bw.set_xscale("log", base=2)
+    ax_bw.set_xlabel("N (elements)"); ax_bw.set_ylabel("GiB/s (naive-equivalent traffic)")
+    ax_bw.set_title("Throughput (labels: tile/depth; xT = threads)")
+    ax_bw.grid(True, alpha=0.3); ax_bw.legend()
+
+    for t, sub in pair.sort_values("N").groupby("threads"):
+        ax_sp.plot(sub["N"], sub["ms_naive"] / sub["ms"], marker="o",
+                   label=f"blocking only x{t} (naive on the same threads)")
+    tot = tuned.groupby("N")["ms"].min()
+    common = serial.index.intersection(tot.index)
+    if len(common) and (tuned["threads"] > 1).any():
+        ax_sp.plot(common, serial.loc[common, "ms"] / tot.loc[common], marker="s", color="tab:purple",
+                   linestyle="--", label="blocking + threads (vs naive x1)")
+    ax_sp.axhline(1.0, linestyle=":", color="gray")
+    ax_sp.set_xscale("log", base=2)
+    ax_sp.set_xlabel("N (elements)"); ax_sp.set_ylabel("Speedup (naive / tuned)")
+    ax_sp.set_title("Locality gain")
+    ax_sp.grid(True, alpha=0.3); ax_sp.legend(fontsize=8)
+
+    fig.suptitle(f"Blocked stencil — {dtype} [{mode}], {steps} steps")
+    fig.tight_layout()
+    if out: fig.savefig(out, dpi=160, bbox_inches="tight")
+    else:   plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,7 @@
-import sys, re, math
+import sys, math
 import pandas as pd
 import matplotlib.pyplot as plt
-
-def parse_mode_from_hint(hint: str) -> str:
-    if not isinstance(hint, str):
-        return "UNKNOWN"
-    m = re.search(r"mode:([A-Za-z0-9_+\-]+)", hint, flags=re.IGNORECASE)
-    return m.group(1).upper() if m else "UNKNOWN"
+import results_store
 
 def coerce_numeric(s):
     return pd.to_numeric(s, errors="coerce")
@@ -23,32 +18,32 @@ def filter_unit(df: pd.DataFrame) -> pd.DataFrame:
 
 def main():
     if len(sys.argv) < 6:
-        print("Usage: plot_locality.py <csv> <kernel> <dtype> <mode> <gflops|gibps> [--save out.png]")
+        print("Usage: plot_locality.py <csv> <kernel> <dtype> <mode> <gflops|gibps> [--threads T] [--save out.png]")
         sys.exit(1)
 
     path, kernel, dtype, mode, metric = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4].upper(), sys.argv[5].lower()
     out = sys.argv[sys.argv.index("--save")+1] if "--save" in sys.argv else None
 
-    # tolerant read
-    df = pd.read_csv(path, encoding="utf-8", on_bad_lines="skip")
+    # indexed lookup in the columnar store clean_csv.py keeps next to the CSV (tolerant CSV read otherwise)
+    base = results_store.query(path, kernel, dtype, mode)
 
     # ensure columns
     needed = {"kernel","dtype","N","stride","misalign","tail","median_ms","gflops","gibps"}
-    missing = [c for c in needed if c not in df.columns]
+    missing = [c for c in needed if c not in base.columns]
     if missing:
         print("CSV missing required columns:", missing); sys.exit(1)
-    if "hint" not in df.columns: df["hint"] = ""
 
-    df["vecmode"] = df["hint"].apply(parse_mode_from_hint)
+    # threaded rows (memlab vec --threads) are plotted one thread count at a time
+    threads = int(sys.argv[sys.argv.index("--threads")+1]) if "--threads" in sys.argv else 1
+    if "threads" in base.columns:
+        base = base[coerce_numeric(base["threads"]).fillna(1) == threads]
 
-    # base filter
-    base = df[(df["kernel"] == kernel) & (df["dtype"] == dtype) & (df["vecmode"] == mode)]
     if base.empty:
         print(f"No rows for kernel={kernel}, dtype={dtype}, mode={mode}.")
         # show quick diagnostics
-        print("Distinct kernels:", sorted(df["kernel"].dropna().unique().tolist()))
-        print("Distinct dtypes:", sorted(df["dtype"].dropna().unique().tolist()))
-        print("Distinct modes:", sorted(df["vecmode"].dropna().unique().tolist()))
+        print("Distinct kernels:", results_store.distinct(path, "kernel"))
+        print("Distinct dtypes:", results_store.distinct(path, "dtype"))
+        print("Distinct modes:", results_store.distinct(path, "vecmode"))
         sys.exit(1)
 
     unit = filter_unit(base)
@@ -80,7 +75,7 @@ def main():
     plt.xlabel("N (elements)")
     plt.ylabel(ylabel)
     title_detail = "unit-stride/aligned/no-tail" if use is unit else "best-per-N (no unit filter)"
-    plt.title(f"Locality — {kernel} {dtype} [{mode}] — {title_detail}")
+    plt.title(f"Locality — {kernel} {dtype} [{mode}{f' x{threads}T' if threads > 1 else ''}] — {title_detail}")
     plt.grid(True, which="both", linestyle="--", alpha=0.4)
     plt.legend()
     if out: plt.savefig(out, dpi=160, bbox_inches="tight")
@@ -1,10 +1,5 @@
-import sys, re, numpy as np, pandas as pd, matplotlib.pyplot as plt
-
-def parse_mode_from_hint(hint: str) -> str:
-    if not isinstance(hint, str):
-        return "UNKNOWN"
-    m = re.search(r"mode:([A-Za-z0-9_+\-]+)", hint, flags=re.IGNORECASE)
-    return m.group(1).upper() if m else "UNKNOWN"
+import sys, numpy as np, pandas as pd, matplotlib.pyplot as plt
+import results_store
 
 def coerce_numeric(s):
     return pd.to_numeric(s, errors="coerce")
@@ -17,31 +12,65 @@ def filter_unit(df: pd.DataFrame) -> pd.DataFrame:
     tail_is_zero = (tail_num.fillna(0) == 0) | (tail_str.isin(["0","false","no","n"]))
     return df[(stride == 1) & (misalign == 0) & (tail_is_zero)]
 
+# operand arrays each kernel streams; footprint = N * sizeof(dtype) * arrays
+ARRAYS = {"saxpy": 2, "dot": 2, "mul": 3, "stencil": 2}
+
+def load_profile(path, dtype, mode, threads):
+    """Ceilings from `memlab calib`: (peak GFLOP/s, [(level, cache_bytes, GiB/s), ...]) for the
+    calibrated thread count closest to `threads`."""
+    prof = pd.read_csv(path, encoding="utf-8")
+    prof["threads"] = coerce_numeric(prof["threads"])
+    t = prof.loc[(prof["threads"] - threads).abs().idxmin(), "threads"]
+    prof = prof[prof["threads"] == t]
+    base_mode = mode.replace("_MASKED", "")
+    fl = prof[(prof["ceiling"] == "flops") & (prof["dtype"] == dtype) & (prof["vecmode"] == base_mode)]
+    if fl.empty:
+        print(f"Profile has no {dtype} {base_mode} peak; modes present:",
+              sorted(prof.loc[prof["ceiling"] == "flops", "vecmode"].dropna().unique().tolist()))
+        sys.exit(1)
+    bw = prof[prof["ceiling"] == "bw"]
+    levels = [(r["level"], int(r["cache_bytes"]), float(r["best"])) for _, r in bw.iterrows()]
+    if int(t) != threads:
+        print(f"Profile calibrated with {int(t)} thread(s); using it for {threads}.")
+    return float(fl["best"].iloc[0]), levels
+
+def level_of(footprint, levels):
+    for name, cap, _ in levels:
+        if cap > 0 and footprint <= cap:
+            return name
+    return levels[-1][0] if levels else "?"
+
 def main():
-    if len(sys.argv) < 8:
-        print("Usage: plot_roofline.py <csv> <kernel> <dtype> <mode> <peakGF> <memGiBps> [--save out.png]")
+    profile = sys.argv[sys.argv.index("--profile")+1] if "--profile" in sys.argv else None
+    if len(sys.argv) < (5 if profile else 7):
+        print("Usage: plot_roofline.py <csv> <kernel> <dtype> <mode> (<peakGF> <memGiBps> | --profile machine_profile.csv)"
+              " [--threads T] [--save out.png]")
         sys.exit(1)
 
     path, kernel, dtype, mode = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4].upper()
-    peakGF, memBW = float(sys.argv[5]), float(sys.argv[6])
     out = sys.argv[sys.argv.index("--save")+1] if "--save" in sys.argv else None
 
-    df = pd.read_csv(path, encoding="utf-8", on_bad_lines="skip")
+    base = results_store.query(path, kernel, dtype, mode)
 
     needed = {"kernel","dtype","N","stride","misalign","tail","median_ms","gflops","gibps"}
-    missing = [c for c in needed if c not in df.columns]
+    missing = [c for c in needed if c not in base.columns]
     if missing:
         print("CSV missing required columns:", missing); sys.exit(1)
-    if "hint" not in df.columns: df["hint"] = ""
 
-    df["vecmode"] = df["hint"].apply(parse_mode_from_hint)
+    # threaded rows (memlab vec --threads) are plotted one thread count at a time
+    threads = int(sys.argv[sys.argv.index("--threads")+1]) if "--threads" in sys.argv else 1
+    if profile:
+        peakGF, levels = load_profile(profile, dtype, mode, threads)
+    else:
+        peakGF, memBW = float(sys.argv[5]), float(sys.argv[6])
+    if "threads" in base.columns:
+        base = base[coerce_numeric(base["threads"]).fillna(1) == threads]
 
-    base = df[(df["kernel"] == kernel) & (df["dtype"] == dtype) & (df["vecmode"] == mode)]
     if base.empty:
         print(f"No rows for kernel={kernel}, dtype={dtype}, mode={mode}.")
-        print("Distinct kernels:", sorted(df["kernel"].dropna().unique().tolist()))
-        print("Distinct dtypes:", sorted(df["dtype"].dropna().unique().tolist()))
-        print("Distinct modes:", sorted(df["vecmode"].dropna().unique().tolist()))
+        print("Distinct kernels:", results_store.distinct(path, "kernel"))
+        print("Distinct dtypes:", results_store.distinct(path, "dtype"))
+        print("Distinct modes:", results_store.distinct(path, "vecmode"))
         sys.exit(1)
 
     unit = filter_unit(base)
@@ -59,19 +88,32 @@ def main():
     ai = (best["gflops"].astype(float) * 1e9) / (best["gibps"].astype(float) * (1024.0 ** 3) + 1e-30)
     perf = best["gflops"].astype(float)
 
-    # roofline curve: min(peakGF, memBW * AI)
     xs = np.logspace(-3, 3, 256)
-    roof = np.minimum(peakGF, memBW * xs)
-
     plt.figure()
-    plt.loglog(xs, roof, label=f"Roofline (peak={peakGF} GF/s, mem={memBW} GiB/s)")
-    plt.scatter(ai, perf, s=24, label=f"{mode} results")
+    if profile:
+        # hierarchical roofline: one bandwidth ceiling per level (GiB/s -> GB/s so AI * BW is GFLOP/s)
+        # points share the colour of the level their footprint fits in
+        color = {name: f"C{i}" for i, (name, _, _) in enumerate(levels)}
+        for name, _, gib in levels:
+            plt.loglog(xs, np.minimum(peakGF, gib * 1.073741824 * xs), color=color[name], label=f"{name} {gib:.1f} GiB/s")
+        plt.axhline(peakGF, color="black", linewidth=0.8, linestyle="-.", label=f"{dtype} FMA peak {peakGF:.1f} GF/s")
+        foot = best["N"].astype(float) * (8 if dtype == "f64" else 4) * ARRAYS.get(kernel, 2)
+        where = [level_of(f, levels) for f in foot]
+        for name, _, _ in levels:
+            sel = [w == name for w in where]
+            if any(sel):
+                plt.scatter(ai[sel], perf[sel], s=24, color=color[name], label=f"{mode} results (fits {name})")
+    else:
+        # roofline curve: min(peakGF, memBW * AI)
+        roof = np.minimum(peakGF, memBW * xs)
+        plt.loglog(xs, roof, label=f"Roofline (peak={peakGF} GF/s, mem={memBW} GiB/s)")
+        plt.scatter(ai, perf, s=24, label=f"{mode} results")
     title_detail = "unit-stride/aligned/no-tail" if use is unit else "best-per-N (no unit filter)"
-    plt.title(f"Roofline — {kernel} {dtype} [{mode}] — {title_detail}")
+    plt.title(f"Roofline — {kernel} {dtype} [{mode}{f' x{threads}T' if threads > 1 else ''}] — {title_detail}")
     plt.xlabel("Arithmetic Intensity (FLOPs / Byte)")
     plt.ylabel("GFLOP/s (achieved)")
     plt.grid(True, which="both", linestyle="--", alpha=0.4)
-    plt.legend()
+    plt.legend(fontsize=8 if profile else None)
     if out: plt.savefig(out, dpi=160, bbox_inches="tight")
     else:   plt.show()
 
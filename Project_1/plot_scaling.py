@@ -0,0 +1,69 @@
+# plot_scaling.py
+import sys, re
+import pandas as pd
+import matplotlib.pyplot as plt
+
+def parse_mode_from_hint(hint: str) -> str:
+    if not isinstance(hint, str):
+        return "UNKNOWN"
+    m = re.search(r"mode:([A-Za-z0-9_+\-]+)", hint, flags=re.IGNORECASE)
+    return m.group(1).upper() if m else "UNKNOWN"
+
+def main():
+    if len(sys.argv) < 5:
+        print("Usage: plot_scaling.py <csv> <kernel> <dtype> <mode> [--save out.png]")
+        sys.exit(1)
+    path, kernel, dtype, mode = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4].upper()
+    out = sys.argv[sys.argv.index("--save")+1] if "--save" in sys.argv else None
+
+    df = pd.read_csv(path, encoding="utf-8", on_bad_lines="skip")
+    needed = {"kernel","dtype","N","median_ms","gibps","threads","scaling"}
+    missing = [c for c in needed if c not in df.columns]
+    if missing:
+        print("CSV missing required columns (run `memlab vec --sweep=scaling`):", missing); sys.exit(1)
+    if "hint" not in df.columns: df["hint"] = ""
+    df["vecmode"] = df["hint"].apply(parse_mode_from_hint)
+    df["threads"] = pd.to_numeric(df["threads"], errors="coerce")
+
+    base = df[(df["kernel"] == kernel) & (df["dtype"] == dtype) & (df["vecmode"] == mode)
+              & df["scaling"].isin(["strong", "weak"])]
+    if base.empty:
+        print(f"No scaling rows for kernel={kernel}, dtype={dtype}, mode={mode}."); sys.exit(1)
+
+    fig, (ax_s, ax_w) = plt.subplots(1, 2, figsize=(11, 4))
+    for ax, kind in ((ax_s, "strong"), (ax_w, "weak")):
+        g = base[base["scaling"] == kind].groupby("threads").agg(
+            ms=("median_ms", "median"), gibps=("gibps", "median"), N=("N", "max")).reset_index()
+        if g.empty:
+            ax.set_visible(False); continue
+        t1 = g.loc[g["threads"].idxmin()]
+        if kind == "strong":
+            eff = t1["ms"] / g["ms"]                       # speedup over the smallest team
+            ax.plot(g["threads"], g["threads"] / t1["threads"], linestyle=":", color="gray", label="ideal")
+            ylabel, title = "Speedup", f"Strong scaling (N={int(g['N'].iloc[0]):,})"
+        else:
+            eff = t1["ms"] / g["ms"]                       # efficiency: same work per thread
+            ax.axhline(1.0, linestyle=":", color="gray", label="ideal")
+            ylabel, title = "Efficiency (t1 / tT)", f"Weak scaling (N/thread={int(t1['N'] / t1['threads']):,})"
+        ax.plot(g["threads"], eff, marker="o", label=ylabel.split()[0].lower())
+        ax.set_xlabel("Threads"); ax.set_ylabel(ylabel); ax.set_title(title)
+        ax.grid(True, alpha=0.3)
+        bw = ax.twinx()
+        bw.plot(g["threads"], g["gibps"], marker="s", color="tab:orange", alpha=0.7, label="GiB/s")
+        bw.set_ylabel("GiB/s")
+        # bandwidth-bound from the first team size that adds < 10% GiB/s over the previous one
+        gain = g["gibps"].pct_change()
+        flat = g[(gain < 0.10) & (g.index > 0)]
+        if not flat.empty:
+            tb = int(flat["threads"].iloc[0])
+            ax.axvline(tb, color="tab:red", linestyle="--", alpha=0.5)
+            ax.annotate(f"GiB/s flat @ T={tb}", (tb, ax.get_ylim()[1]), xytext=(4, -14),
+                        textcoords="offset points", color="tab:red")
+        ax.legend(loc="upper left")
+    fig.suptitle(f"Scaling — {kernel} {dtype} [{mode}]")
+    fig.tight_layout()
+    if out: fig.savefig(out, dpi=160, bbox_inches="tight")
+    else:   plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,26 @@
-# plot_alignment.py
-import sys, csv, matplotlib.pyplot as plt
+# plot_stride.py
+import sys, pandas as pd, matplotlib.pyplot as plt
+import results_store
 
 def main():
     if len(sys.argv) < 6:
-        print("Usage: plot_alignment.py <csv> <kernel> <dtype> <mode> [--save out.png]")
+        print("Usage: plot_stride.py <csv> <kernel> <dtype> <mode> [--threads T] [--save out.png]")
         sys.exit(1)
     csv_path, kernel, dtype, mode = sys.argv[1:5]
     out = None
     if "--save" in sys.argv:
         out = sys.argv[sys.argv.index("--save")+1]
+    threads = int(sys.argv[sys.argv.index("--threads")+1]) if "--threads" in sys.argv else 1
 
-    xs, gflops = [], []
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            if (row.get("kernel")==kernel and row.get("dtype")==dtype and
-                    (row.get("vecmode","").upper()==mode.upper())):
-                # keep only alignment sweep rows if you labeled them "mis"
-                if row.get("label","") not in ("mis","alignment",""):
-                    # still allow if user didn’t set label
-                    pass
-                try:
-                    xs.append(int(row["misalign"]))
-                    gflops.append(float(row["gflops"]))
-                except: pass
+    # every label is kept (stride sweep rows are labeled "stride", but older runs may not be)
+    rows = results_store.query(csv_path, kernel, dtype, mode.upper(),
+                               columns=["stride", "gflops", "threads", "scaling", "label"])
+    rows = results_store.sweep_rows(rows, threads)[["stride", "gflops"]].apply(pd.to_numeric, errors="coerce").dropna()
+    rows = rows[rows["stride"] >= 1]   # the store keeps -1 where the CSV had no number
+    xs, gflops = rows["stride"].astype(int).tolist(), rows["gflops"].astype(float).tolist()
 
     if not xs:
-        print("No rows after filtering. Check kernel/dtype/mode and that alignment sweep ran.")
+        print("No rows after filtering. Check kernel/dtype/mode and that stride sweep ran.")
         return
 
     pts = sorted(zip(xs, gflops))
@@ -34,9 +28,10 @@ def main():
 
     plt.figure()
     plt.plot(xs, gflops, marker="o")
-    plt.xlabel("Misalignment (bytes)")
+    plt.xscale("log", base=2)
+    plt.xlabel("Stride (elements)")
     plt.ylabel("GFLOP/s")
-    plt.title(f"Alignment impact: {kernel} {dtype} ({mode})")
+    plt.title(f"Stride impact: {kernel} {dtype} ({mode}{f' x{threads}T' if threads > 1 else ''})")
     plt.grid(True, alpha=0.3)
     if out: plt.savefig(out, bbox_inches="tight", dpi=160)
     else: plt.show()
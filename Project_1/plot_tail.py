@@ -1,29 +1,22 @@
 # plot_tail.py
-import sys, csv, matplotlib.pyplot as plt
+import sys, pandas as pd, matplotlib.pyplot as plt
+import results_store
 from statistics import median
 
 def main():
     if len(sys.argv) < 6:
-        print("Usage: plot_tail.py <csv> <kernel> <dtype> <mode> [--save out.png]")
+        print("Usage: plot_tail.py <csv> <kernel> <dtype> <mode> [--threads T] [--save out.png]")
         sys.exit(1)
     csv_path, kernel, dtype, mode = sys.argv[1:5]
     out = None
     if "--save" in sys.argv:
         out = sys.argv[sys.argv.index("--save")+1]
+    threads = int(sys.argv[sys.argv.index("--threads")+1]) if "--threads" in sys.argv else 1
 
-    vals = {0: [], 1: []}
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            if (row.get("kernel")==kernel and row.get("dtype")==dtype and
-                    row.get("vecmode","").upper()==mode.upper()):
-                if row.get("label","") not in ("tail",""):
-                    pass
-                try:
-                    tj = int(float(row["tail"]))
-                    g = float(row["gflops"])
-                    if tj in (0,1): vals[tj].append(g)
-                except: pass
+    rows = results_store.query(csv_path, kernel, dtype, mode.upper(),
+                               columns=["tail", "gflops", "threads", "scaling", "label"])
+    rows = results_store.sweep_rows(rows, threads)[["tail", "gflops"]].apply(pd.to_numeric, errors="coerce").dropna()
+    vals = {tj: rows.loc[rows["tail"] == tj, "gflops"].astype(float).tolist() for tj in (0, 1)}
 
     if not (vals[0] or vals[1]):
         print("No rows after filtering. Did you run sweep_tail.ps1?")
@@ -35,7 +28,7 @@ def main():
     plt.figure()
     plt.bar(["tail=0","tail=1"], [m0, m1])
     plt.ylabel("GFLOP/s (median)")
-    plt.title(f"Tail handling impact: {kernel} {dtype} ({mode})")
+    plt.title(f"Tail handling impact: {kernel} {dtype} ({mode}{f' x{threads}T' if threads > 1 else ''})")
     if out: plt.savefig(out, bbox_inches="tight", dpi=160)
     else: plt.show()
 
@@ -0,0 +1,186 @@
+# results_store.py
+"""Columnar store for results_clean rows, so plots do not re-parse the CSV.
+
+A store is a directory (clean_csv.py writes ``results_clean.store`` next to
+``results_clean.csv``) with one raw little-endian file per column, read back
+through ``np.memmap``:
+
+  schema.json     row count, column dtypes, category lists, source offset
+  <col>.bin       int64 / float64 values, or int32 codes for categorical columns
+  index.bin       row ids sorted by (kernel, dtype, vecmode, N)
+  index_key.bin   matching (kernel, dtype, vecmode) composite key, for searchsorted
+
+Integer columns hold -1 where the CSV had no number, float columns NaN.
+``append()`` only writes the new rows and rebuilds the two index files.
+"""
+import json, os, re
+import numpy as np
+import pandas as pd
+
+CATEGORICAL = ("kernel", "dtype", "label", "hint", "vecmode", "scaling")
+INTS   = ("N", "stride", "misalign", "tail", "threads")
+FLOATS = ("median_ms", "p10_ms", "p90_ms", "gflops", "gibps", "cpe", "check")
+KEY    = ("kernel", "dtype", "vecmode")   # index prefix; rows inside a key are sorted by N
+SCHEMA = "schema.json"
+
+def store_for(csv_path):
+    """results_clean.csv -> results_clean.store"""
+    return os.path.splitext(csv_path)[0] + ".store"
+
+def _as_int(x):
+    try: return int(float(x))
+    except (TypeError, ValueError): return -1
+
+def _as_float(x):
+    try: return float(x)
+    except (TypeError, ValueError): return float("nan")
+
+class Store:
+    def __init__(self, path):
+        self.path = path
+        meta = os.path.join(path, SCHEMA)
+        if os.path.exists(meta):
+            with open(meta, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"version": 1, "rows": 0, "source": {},
+                         "categories": {c: [] for c in CATEGORICAL}}
+
+    @property
+    def rows(self):
+        return self.meta["rows"]
+
+    @property
+    def source(self):
+        return self.meta["source"]
+
+    def _col_file(self, col):
+        return os.path.join(self.path, col + ".bin")
+
+    @staticmethod
+    def _dtype(col):
+        return np.int32 if col in CATEGORICAL else np.int64 if col in INTS else np.float64
+
+    def column(self, col):
+        """Memory-mapped column (codes for categorical ones)."""
+        if self.rows == 0:
+            return np.empty(0, self._dtype(col))
+        return np.memmap(self._col_file(col), dtype=self._dtype(col), mode="r", shape=(self.rows,))
+
+    def code(self, col, value):
+        """Category code of `value`, or -1 if the store has never seen it."""
+        try: return self.meta["categories"][col].index(value)
+        except ValueError: return -1
+
+    def append(self, rows, source=None):
+        """Append dict rows (clean_csv.py output) and re-index. `source` is
+        recorded so the next clean_csv.py run can resume where this one stopped."""
+        os.makedirs(self.path, exist_ok=True)
+        for col in CATEGORICAL + INTS + FLOATS:   # drop bytes of an append that never reached schema.json
+            f = self._col_file(col)
+            if os.path.exists(f):
+                os.truncate(f, self.rows * np.dtype(self._dtype(col)).itemsize)
+        cats = self.meta["categories"]
+        lookup = {c: {v: i for i, v in enumerate(cats[c])} for c in CATEGORICAL}
+        for col in CATEGORICAL + INTS + FLOATS:
+            if col in CATEGORICAL:
+                codes = []
+                for r in rows:
+                    v = str(r.get(col, ""))
+                    if v not in lookup[col]:
+                        lookup[col][v] = len(cats[col]); cats[col].append(v)
+                    codes.append(lookup[col][v])
+                arr = np.asarray(codes, np.int32)
+            elif col in INTS:
+                arr = np.asarray([_as_int(r.get(col)) for r in rows], np.int64)
+            else:
+                arr = np.asarray([_as_float(r.get(col)) for r in rows], np.float64)
+            with open(self._col_file(col), "ab") as f:
+                f.write(arr.astype(arr.dtype.newbyteorder("<")).tobytes())
+        self.meta["rows"] += len(rows)
+        if source is not None:
+            self.meta["source"] = source
+        self._reindex()
+        tmp = os.path.join(self.path, SCHEMA + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.path, SCHEMA))   # schema last: readers never see a half-written store
+
+    def _composite(self, k, d, m):
+        nd = max(1, len(self.meta["categories"]["dtype"]))
+        nm = max(1, len(self.meta["categories"]["vecmode"]))
+        return (np.asarray(k, np.int64) * nd + d) * nm + m
+
+    def _reindex(self):
+        k, d, m = (self.column(c) for c in KEY)
+        order = np.lexsort((self.column("N"), m, d, k)).astype(np.int64)
+        order.tofile(os.path.join(self.path, "index.bin"))
+        self._composite(k[order], d[order], m[order]).tofile(os.path.join(self.path, "index_key.bin"))
+
+    def select(self, kernel=None, dtype=None, vecmode=None):
+        """Row ids matching the given key columns; (kernel, dtype, vecmode) together is
+        a binary search on the index, partial keys fall back to a scan of the codes."""
+        if self.rows == 0:
+            return np.empty(0, np.int64)
+        want = dict(zip(KEY, (kernel, dtype, vecmode)))
+        codes = {c: self.code(c, v) for c, v in want.items() if v is not None}
+        if any(v < 0 for v in codes.values()):
+            return np.empty(0, np.int64)
+        if len(codes) == len(KEY):
+            key = np.memmap(os.path.join(self.path, "index_key.bin"), dtype=np.int64, mode="r", shape=(self.rows,))
+            idx = np.memmap(os.path.join(self.path, "index.bin"), dtype=np.int64, mode="r", shape=(self.rows,))
+            c = int(self._composite(codes["kernel"], codes["dtype"], codes["vecmode"]))
+            return np.asarray(idx[np.searchsorted(key, c, "left"):np.searchsorted(key, c, "right")])
+        mask = np.ones(self.rows, bool)
+        for c, v in codes.items():
+            mask &= self.column(c) == v
+        return np.flatnonzero(mask)
+
+    def frame(self, ids=None, columns=None):
+        """DataFrame of the given row ids (all rows if None); categorical columns stay categorical."""
+        cols = columns or list(CATEGORICAL + INTS + FLOATS)
+        out = {}
+        for col in cols:
+            arr = self.column(col)
+            arr = np.asarray(arr if ids is None else arr[ids])
+            if col in CATEGORICAL:
+                out[col] = pd.Categorical.from_codes(arr, categories=self.meta["categories"][col])
+            else:
+                out[col] = arr
+        return pd.DataFrame(out)
+
+def query(path, kernel=None, dtype=None, vecmode=None, columns=None):
+    """Rows for a plot. `path` is a store directory or a results CSV; a CSV is
+    served from its sibling .store when that is at least as new, and parsed
+    directly otherwise (vecmode taken from the hint's mode: token)."""
+    store = path if os.path.isdir(path) else store_for(path)
+    meta = os.path.join(store, SCHEMA)
+    if os.path.exists(meta) and (path == store or os.path.getmtime(meta) >= os.path.getmtime(path)):
+        s = Store(store)
+        return s.frame(s.select(kernel, dtype, vecmode), columns)
+    df = pd.read_csv(path, encoding="utf-8", on_bad_lines="skip")
+    if "hint" not in df.columns: df["hint"] = ""
+    if "vecmode" not in df.columns:
+        df["vecmode"] = df["hint"].astype(str).str.extract(r"mode:([A-Za-z0-9_+\-]+)", flags=re.IGNORECASE)[0] \
+                                  .str.upper().fillna("UNKNOWN")
+    for col, want in (("kernel", kernel), ("dtype", dtype), ("vecmode", vecmode)):
+        if want is not None:
+            df = df[df[col] == want]
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+def sweep_rows(df, threads=1):
+    """Rows of the plain parameter sweeps at one thread count: drops the
+    strong/weak scaling grid and the blocked-stencil (naive/tuned) rows, which
+    share stride=1/misalign=0/tail=0 with them. Missing columns are ignored."""
+    if "threads" in df.columns:
+        df = df[pd.to_numeric(df["threads"], errors="coerce").fillna(1) == threads]
+    if "scaling" in df.columns:
+        df = df[~df["scaling"].astype(str).isin(["strong", "weak"])]
+    if "label" in df.columns:
+        df = df[~df["label"].astype(str).isin(["naive", "tuned"])]
+    return df
+
+def distinct(path, col):
+    """Values of one key column present in `path` (for 'no rows' diagnostics)."""
+    df = query(path, columns=[col])
+    return sorted(df[col].dropna().astype(str).unique().tolist())
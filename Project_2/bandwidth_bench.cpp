@@ -6,8 +6,9 @@
 #include <cstring>
 #include <string>
 #include <cstdint>
+#include <algorithm>
+#include <immintrin.h>
 
-enum class RW  { R, W, R70W30, R50W50 };
 enum class Pat { SEQ, RANDOM };
 
 struct Work {
@@ -18,10 +19,72 @@ struct Work {
   size_t   iters;
   Pat      pat;
   uint64_t seed;
+  Kernel   kernel;
+  bool     nt;        // non-temporal (streaming) stores for STORE/COPY/TRIAD
+  size_t   prefetch;  // random TOUCH: software prefetch this many accesses ahead (0 = off)
   double   gbps_out;
 };
 
-// Approx memory-interface traffic per touch (bytes)
+// ---------- vector primitives (compile-time ISA, CMake builds with -march=native) ----------
+#if defined(__AVX512F__)
+using vint = __m512i; using vdbl = __m512d;
+static constexpr const char* kIsa = "avx512";
+static inline vint vzero()                  { return _mm512_setzero_si512(); }
+static inline vint vset1(uint64_t x)        { return _mm512_set1_epi64((long long)x); }
+static inline vint vload(const uint8_t* p)  { return _mm512_load_si512(p); }
+static inline void vstore(uint8_t* p, vint v)  { _mm512_store_si512(p, v); }
+static inline void vstream(uint8_t* p, vint v) { _mm512_stream_si512((__m512i*)p, v); }
+static inline vint vxor(vint a, vint b)     { return _mm512_xor_si512(a, b); }
+static inline vdbl dset1(double x)          { return _mm512_set1_pd(x); }
+static inline vdbl dload(const double* p)   { return _mm512_load_pd(p); }
+static inline void dstore(double* p, vdbl v)   { _mm512_store_pd(p, v); }
+static inline void dstream(double* p, vdbl v)  { _mm512_stream_pd(p, v); }
+static inline vdbl dfma(vdbl a, vdbl b, vdbl c){ return _mm512_fmadd_pd(a, b, c); }
+#elif defined(__AVX2__)
+using vint = __m256i; using vdbl = __m256d;
+static constexpr const char* kIsa = "avx2";
+static inline vint vzero()                  { return _mm256_setzero_si256(); }
+static inline vint vset1(uint64_t x)        { return _mm256_set1_epi64x((long long)x); }
+static inline vint vload(const uint8_t* p)  { return _mm256_load_si256((const __m256i*)p); }
+static inline void vstore(uint8_t* p, vint v)  { _mm256_store_si256((__m256i*)p, v); }
+static inline void vstream(uint8_t* p, vint v) { _mm256_stream_si256((__m256i*)p, v); }
+static inline vint vxor(vint a, vint b)     { return _mm256_xor_si256(a, b); }
+static inline vdbl dset1(double x)          { return _mm256_set1_pd(x); }
+static inline vdbl dload(const double* p)   { return _mm256_load_pd(p); }
+static inline void dstore(double* p, vdbl v)   { _mm256_store_pd(p, v); }
+static inline void dstream(double* p, vdbl v)  { _mm256_stream_pd(p, v); }
+#if defined(__FMA__)
+static inline vdbl dfma(vdbl a, vdbl b, vdbl c){ return _mm256_fmadd_pd(a, b, c); }
+#else
+static inline vdbl dfma(vdbl a, vdbl b, vdbl c){ return _mm256_add_pd(_mm256_mul_pd(a, b), c); }
+#endif
+#else
+using vint = __m128i; using vdbl = __m128d;
+static constexpr const char* kIsa = "sse2";
+static inline vint vzero()                  { return _mm_setzero_si128(); }
+static inline vint vset1(uint64_t x)        { return _mm_set1_epi64x((long long)x); }
+static inline vint vload(const uint8_t* p)  { return _mm_load_si128((const __m128i*)p); }
+static inline void vstore(uint8_t* p, vint v)  { _mm_store_si128((__m128i*)p, v); }
+static inline void vstream(uint8_t* p, vint v) { _mm_stream_si128((__m128i*)p, v); }
+static inline vint vxor(vint a, vint b)     { return _mm_xor_si128(a, b); }
+static inline vdbl dset1(double x)          { return _mm_set1_pd(x); }
+static inline vdbl dload(const double* p)   { return _mm_load_pd(p); }
+static inline void dstore(double* p, vdbl v)   { _mm_store_pd(p, v); }
+static inline void dstream(double* p, vdbl v)  { _mm_stream_pd(p, v); }
+static inline vdbl dfma(vdbl a, vdbl b, vdbl c){ return _mm_add_pd(_mm_mul_pd(a, b), c); }
+#endif
+static constexpr size_t VB  = sizeof(vint);   // bytes per vector
+static constexpr size_t VPL = 64 / VB;        // vectors per cache line
+static constexpr size_t DPV = VB / sizeof(double);
+
+static inline uint64_t vfold(vint v) {
+  alignas(64) uint64_t lanes[VB / 8];
+  std::memcpy(lanes, &v, VB);
+  uint64_t x = 0; for (uint64_t l : lanes) x ^= l;
+  return x;
+}
+
+// Approx memory-interface traffic per cache line touched (bytes)
 static inline double effective_bytes_per_touch(RW rw) {
   switch (rw) {
     case RW::R:        return 64.0;                          // one cache line read
@@ -32,80 +95,212 @@ static inline double effective_bytes_per_touch(RW rw) {
   return 64.0;
 }
 
+// Distinct 64 B lines a pass over `bytes` hits when it accesses one address
+// every `step` bytes. Strides above a line still move a whole line per access;
+// strides below one share each line between several accesses.
+static inline size_t lines_touched(size_t bytes, size_t step) {
+  const size_t span = std::max<size_t>(64, step);
+  return (bytes + span - 1) / span;
+}
+
+// Bytes a pass really moves across the memory interface: lines_touched * 64
+// for the strided kernels, not the useful bytes. Regular stores pay a
+// read-for-ownership before the writeback; streaming stores bypass it.
+static inline double kernel_bytes_per_pass(Kernel k, bool nt, size_t bytes, size_t step) {
+  const double wr = nt ? 1.0 : 2.0;
+  const size_t lines = bytes < 64 ? 0 : lines_touched(bytes - 64 + 1, step);
+  switch (k) {
+    case Kernel::LOAD:  return double(lines) * 64.0;
+    case Kernel::STORE: return double(lines) * 64.0 * wr;
+    case Kernel::COPY:  { double n = double((bytes / 2) & ~size_t(63)); return n * (1.0 + wr); }
+    case Kernel::TRIAD: { double n = double((bytes / 3) & ~size_t(63)); return n * (2.0 + wr); }
+    case Kernel::TOUCH: break;
+  }
+  return 0.0;
+}
+
+// Full-line read of one line every `step` bytes; four independent accumulators.
+static uint64_t load_pass(const uint8_t* base, size_t bytes, size_t step) {
+  vint a0 = vzero(), a1 = vzero(), a2 = vzero(), a3 = vzero();
+  size_t off = 0;
+  for (; off + 3*step + 64 <= bytes; off += 4*step) {
+    for (size_t v = 0; v < VPL; ++v) {
+      a0 = vxor(a0, vload(base + off          + v*VB));
+      a1 = vxor(a1, vload(base + off +   step + v*VB));
+      a2 = vxor(a2, vload(base + off + 2*step + v*VB));
+      a3 = vxor(a3, vload(base + off + 3*step + v*VB));
+    }
+  }
+  for (; off + 64 <= bytes; off += step)
+    for (size_t v = 0; v < VPL; ++v) a0 = vxor(a0, vload(base + off + v*VB));
+  return vfold(vxor(vxor(a0, a1), vxor(a2, a3)));
+}
+
+static void store_pass(uint8_t* base, size_t bytes, size_t step, bool nt, uint64_t val) {
+  const vint x = vset1(val);
+  if (nt) {
+    for (size_t off = 0; off + 64 <= bytes; off += step)
+      for (size_t v = 0; v < VPL; ++v) vstream(base + off + v*VB, x);
+    _mm_sfence();
+  } else {
+    for (size_t off = 0; off + 64 <= bytes; off += step)
+      for (size_t v = 0; v < VPL; ++v) vstore(base + off + v*VB, x);
+  }
+}
+
+// dst[i] = src[i] over two halves of the slice
+static void copy_pass(uint8_t* base, size_t bytes, bool nt) {
+  const size_t n = (bytes / 2) & ~size_t(63);
+  const uint8_t* src = base;
+  uint8_t* dst = base + n;
+  if (nt) { for (size_t off = 0; off < n; off += VB) vstream(dst + off, vload(src + off)); _mm_sfence(); }
+  else    { for (size_t off = 0; off < n; off += VB) vstore (dst + off, vload(src + off)); }
+}
+
+// STREAM triad a[i] = b[i] + s*c[i] over three thirds of the slice
+static void triad_pass(uint8_t* base, size_t bytes, bool nt) {
+  const size_t n = ((bytes / 3) & ~size_t(63)) / sizeof(double);
+  double* a = reinterpret_cast<double*>(base);
+  const double* b = a + n;
+  const double* c = b + n;
+  const vdbl s = dset1(3.0);
+  if (nt) { for (size_t i = 0; i < n; i += DPV) dstream(a + i, dfma(s, dload(c + i), dload(b + i))); _mm_sfence(); }
+  else    { for (size_t i = 0; i < n; i += DPV) dstore (a + i, dfma(s, dload(c + i), dload(b + i))); }
+}
+
+static const char* kernel_name(Kernel k, bool nt) {
+  switch (k) {
+    case Kernel::TOUCH: return "touch";
+    case Kernel::LOAD:  return "load";
+    case Kernel::STORE: return nt ? "store_nt" : "store";
+    case Kernel::COPY:  return nt ? "copy_nt"  : "copy";
+    case Kernel::TRIAD: return nt ? "triad_nt" : "triad";
+  }
+  return "?";
+}
+
 // Tiny PRNG for random access
 static inline uint64_t xorshift64(uint64_t& x){
   x ^= x << 13; x ^= x >> 7; x ^= x << 17; return x;
 }
 
-static void worker_fn(Work& w) {
-  Timer t; t.start();
-  volatile uint64_t sink = 0;
+// Random offsets (in steps) drawn up front, so the timed loop is one
+// sequential index load per access instead of an RNG step and a 64-bit modulo.
+// 64-bit entries: a 32-bit offset would wrap past 2^32 steps (4 GiB at 1 B strides).
+// The stream is read once per pass and run_pass counts it as traffic.
+static std::vector<uint64_t> make_index_stream(size_t steps, uint64_t seed) {
+  std::vector<uint64_t> v(steps);
+  uint64_t r = seed ? seed : 0x9e3779b97f4a7c15ull;
+  for (auto& x : v) x = xorshift64(r) % steps;
+  return v;
+}
 
-  const size_t step  = (w.stride == 0 ? 64 : w.stride);
-  const size_t steps = (w.bytes + step - 1) / step;
-
-  if (w.pat == Pat::RANDOM) {
-    uint64_t r = w.seed ? w.seed : 0x9e3779b97f4a7c15ull;
-    if (w.rw == RW::R) {
-      for (size_t it=0; it<w.iters; ++it) {
-        for (size_t s=0; s<steps; ++s) {
-          size_t off = (xorshift64(r) % steps) * step;
-          sink += w.base[off];
-        }
-      }
-    } else if (w.rw == RW::W) {
-      for (size_t it=0; it<w.iters; ++it) {
-        for (size_t s=0; s<steps; ++s) {
-          size_t off = (xorshift64(r) % steps) * step;
-          w.base[off] = (uint8_t)it;
-        }
-      }
-    } else if (w.rw == RW::R70W30) {
-      for (size_t it=0; it<w.iters; ++it) {
-        for (size_t s=0; s<steps; ++s) {
-          size_t off = (xorshift64(r) % steps) * step;
-          if ((s % 10) < 7) sink += w.base[off];
-          else              w.base[off] = (uint8_t)it;
-        }
-      }
+static inline void prefetch_line(const uint8_t* p, bool write) {
+#if defined(_MSC_VER)
+  (void)write;
+  _mm_prefetch(reinterpret_cast<const char*>(p), _MM_HINT_T0);
+#else
+  if (write) __builtin_prefetch(p, 1, 3);
+  else       __builtin_prefetch(p, 0, 3);
+#endif
+}
+
+// Walks idx[0..steps) calling op(s, addr); with dist > 0 the line `dist`
+// accesses ahead is prefetched (for writing when any access may store).
+template <class Op>
+static inline void random_walk(uint8_t* base, const uint64_t* idx, size_t steps, size_t step,
+                               size_t dist, bool write, Op op) {
+  size_t s = 0;
+  if (dist > 0)
+    for (; s + dist < steps; ++s) {
+      prefetch_line(base + size_t(idx[s + dist]) * step, write);
+      op(s, base + size_t(idx[s]) * step);
+    }
+  for (; s < steps; ++s) op(s, base + size_t(idx[s]) * step);
+}
+
+// One pass of the original byte-touch walk over [base, base+bytes).
+// Random passes read their offsets from `idx` (one entry per step).
+static void touch_pass(uint8_t* base, size_t bytes, size_t step, RW rw, Pat pat,
+                       const uint64_t* idx, size_t dist, size_t it, volatile uint64_t& sink) {
+  const size_t steps = (bytes + step - 1) / step;
+
+  if (pat == Pat::RANDOM) {
+    const uint8_t v = (uint8_t)it;
+    uint64_t acc = 0;
+    if (rw == RW::R) {
+      random_walk(base, idx, steps, step, dist, false, [&](size_t, uint8_t* p) { acc += *p; });
+    } else if (rw == RW::W) {
+      random_walk(base, idx, steps, step, dist, true,  [&](size_t, uint8_t* p) { *p = v; });
+    } else if (rw == RW::R70W30) {
+      random_walk(base, idx, steps, step, dist, true,  [&](size_t s, uint8_t* p) {
+        if ((s % 10) < 7) acc += *p; else *p = v;
+      });
     } else { // 50/50
-      for (size_t it=0; it<w.iters; ++it) {
-        for (size_t s=0; s<steps; ++s) {
-          size_t off = (xorshift64(r) % steps) * step;
-          if (s & 1) sink += w.base[off];
-          else       w.base[off] = (uint8_t)it;
-        }
-      }
+      random_walk(base, idx, steps, step, dist, true,  [&](size_t s, uint8_t* p) {
+        if (s & 1) acc += *p; else *p = v;
+      });
     }
+    sink += acc;
   } else { // SEQ (stride walk)
-    if (w.rw == RW::R) {
-      for (size_t it=0; it<w.iters; ++it)
-        for (size_t i=0; i<w.bytes; i+=step) sink += w.base[i];
-    } else if (w.rw == RW::W) {
-      for (size_t it=0; it<w.iters; ++it)
-        for (size_t i=0; i<w.bytes; i+=step) w.base[i] = (uint8_t)it;
-    } else if (w.rw == RW::R70W30) {
-      for (size_t it=0; it<w.iters; ++it) {
-        size_t idx = 0;
-        for (size_t i=0; i<w.bytes; i+=step, ++idx) {
-          if ((idx % 10) < 7) sink += w.base[i];
-          else                w.base[i] = (uint8_t)it;
-        }
+    if (rw == RW::R) {
+      for (size_t i=0; i<bytes; i+=step) sink += base[i];
+    } else if (rw == RW::W) {
+      for (size_t i=0; i<bytes; i+=step) base[i] = (uint8_t)it;
+    } else if (rw == RW::R70W30) {
+      size_t idx = 0;
+      for (size_t i=0; i<bytes; i+=step, ++idx) {
+        if ((idx % 10) < 7) sink += base[i];
+        else                base[i] = (uint8_t)it;
       }
     } else { // 50/50
-      for (size_t it=0; it<w.iters; ++it) {
-        size_t idx = 0;
-        for (size_t i=0; i<w.bytes; i+=step, ++idx) {
-          if (idx & 1) sink += w.base[i];
-          else         w.base[i] = (uint8_t)it;
-        }
+      size_t idx = 0;
+      for (size_t i=0; i<bytes; i+=step, ++idx) {
+        if (idx & 1) sink += base[i];
+        else         base[i] = (uint8_t)it;
       }
     }
   }
+}
+
+// Runs one pass of w's kernel over [base, base+bytes) and returns the memory
+// traffic it generated, including the 8 B per access of a random pass's index
+// stream. Shared by the fixed-iteration and timed modes.
+static double run_pass(const Work& w, uint8_t* base, size_t bytes, size_t it,
+                       const uint64_t* idx, volatile uint64_t& sink) {
+  if (w.kernel == Kernel::TOUCH) {
+    const size_t step = (w.stride == 0 ? 64 : w.stride);
+    touch_pass(base, bytes, step, w.rw, w.pat, idx, w.prefetch, it, sink);
+    const double idx_bytes = w.pat == Pat::RANDOM ? double((bytes + step - 1) / step) * sizeof(*idx) : 0.0;
+    return double(lines_touched(bytes, step)) * effective_bytes_per_touch(w.rw) + idx_bytes;
+  }
+  // full-line kernels: one 64 B line per `stride` bytes (stride rounded up to a line)
+  const size_t step = std::max<size_t>(64, (w.stride + 63) & ~size_t(63));
+  switch (w.kernel) {
+    case Kernel::LOAD:  sink ^= load_pass(base, bytes, step); break;
+    case Kernel::STORE: store_pass(base, bytes, step, w.nt, it); break;
+    case Kernel::COPY:  copy_pass(base, bytes, w.nt); break;
+    case Kernel::TRIAD: triad_pass(base, bytes, w.nt); break;
+    case Kernel::TOUCH: break;
+  }
+  return kernel_bytes_per_pass(w.kernel, w.nt, bytes, step);
+}
+
+static inline size_t touch_step(const Work& w) { return w.stride == 0 ? 64 : w.stride; }
+
+static void worker_fn(Work& w) {
+  std::vector<uint64_t> idx;
+  if (w.kernel == Kernel::TOUCH && w.pat == Pat::RANDOM)
+    idx = make_index_stream((w.bytes + touch_step(w) - 1) / touch_step(w), w.seed);
+
+  Timer t; t.start();
+  volatile uint64_t sink = 0;
+
+  double bytes_traffic = 0.0;
+  for (size_t it=0; it<w.iters; ++it)
+    bytes_traffic += run_pass(w, w.base, w.bytes, it, idx.data(), sink);
 
   double s = t.stop_s();
-  double touches = double(w.iters) * double(steps);
-  double bytes_traffic = touches * effective_bytes_per_touch(w.rw);
   w.gbps_out = (bytes_traffic / s) / 1e9;
 
 #if !defined(_WIN32)
@@ -115,6 +310,72 @@ static void worker_fn(Work& w) {
 #endif
 }
 
+struct alignas(64) ByteCounter {
+  std::atomic<double> bytes{0.0};
+};
+
+// Timed mode: all workers leave the start barrier together and run blocks of
+// their slice until `stop`, publishing cumulative traffic after every block.
+static void timed_worker_fn(const Work& w, size_t block, SpinStart& start,
+                            const std::atomic<bool>& stop, ByteCounter& out) {
+  volatile uint64_t sink = 0;
+  block = std::max<size_t>(4096, block & ~size_t(4095));
+  // random offsets are block-local: one stream for full blocks, one for the tail
+  std::vector<uint64_t> idx_full, idx_tail;
+  if (w.kernel == Kernel::TOUCH && w.pat == Pat::RANDOM) {
+    const size_t step = touch_step(w), tail = w.bytes % block;
+    idx_full = make_index_stream((std::min(block, w.bytes) + step - 1) / step, w.seed);
+    if (tail) idx_tail = make_index_stream((tail + step - 1) / step, w.seed ^ 0x5bd1e995u);
+  }
+  double total = 0.0;
+  size_t off = 0, it = 0;
+  start.arrive_and_wait();
+  while (!stop.load(std::memory_order_relaxed)) {
+    size_t blk = std::min(block, w.bytes - off);
+    total += run_pass(w, w.base + off, blk, it, (blk == block ? idx_full : idx_tail).data(), sink);
+    out.bytes.store(total, std::memory_order_relaxed);
+    off += blk;
+    if (off >= w.bytes) { off = 0; ++it; }
+  }
+#if !defined(_WIN32)
+  asm volatile(""::"r"(sink):"memory");
+#else
+  (void)sink;
+#endif
+}
+
+const char* vector_isa() { return kIsa; }
+
+double bw_gbps(uint8_t* base, const BwPoint& p, int rep) {
+  const int threads = std::max(1, p.threads);
+  std::vector<std::thread> th;
+  std::vector<Work> works(static_cast<size_t>(threads));
+  size_t chunk = (p.bytes / size_t(threads)) & ~size_t(63);
+  for (int k=0; k<threads; ++k) {
+    th.emplace_back([&,k](){
+      pin_to_cpu(p.cpu0 < 0 ? -1 : (p.cpu0 + k));
+      works[k] = Work{
+        .base     = base + size_t(k)*chunk,
+        .bytes    = chunk,
+        .stride   = p.stride,
+        .rw       = p.rw,
+        .iters    = p.iters,
+        .pat      = (p.random && p.kernel == Kernel::TOUCH ? Pat::RANDOM : Pat::SEQ),
+        .seed     = 0x9e3779b97f4a7c15ull ^ (uint64_t)(rep*1315423911u + k*2654435761u),
+        .kernel   = p.kernel,
+        .nt       = p.nt,
+        .prefetch = p.prefetch,
+        .gbps_out = 0.0
+      };
+      worker_fn(works[k]);
+    });
+  }
+  for (auto& t : th) t.join();
+  double gbps_sum = 0.0;
+  for (auto& w : works) gbps_sum += w.gbps_out;
+  return gbps_sum;
+}
+
 void run_bandwidth_bench(int argc, char** argv) {
   size_t bytes = 1ULL<<30;      // 1 GiB total region
   int    threads = 1;
@@ -124,6 +385,15 @@ void run_bandwidth_bench(int argc, char** argv) {
   int    reps = 3;
   size_t iters = 1;
   std::string pattern = "seq"; // CSV compatibility
+  Kernel kernel = Kernel::TOUCH;
+  bool   nt = false;
+  size_t duration_ms = 0;       // >0: barrier-synchronized, time-based run instead of --iters
+  size_t sample_ms = 10;
+  size_t warm_ms = 0;           // excluded from the steady-state figure
+  size_t block_kb = 1024;
+  std::string series;           // per-interval samples CSV (timed mode)
+  std::string counters;         // perf events bracketing each repetition
+  std::string prefetch = "0";   // random touch: software prefetch distance(s), e.g. 0,4,16,64
 
   for (int i=1; i<argc; ) {
     if      (parse_szt (i,argc,argv,"--bytes",  bytes)) {}
@@ -139,54 +409,160 @@ void run_bandwidth_bench(int argc, char** argv) {
     else if (parse_flag(i,argc,argv,"--50R50W")){ rw = RW::R50W50; }
     else if (parse_flag(i,argc,argv,"--pattern=random")) { pattern = "random"; }
     else if (parse_flag(i,argc,argv,"--pattern=stride")) { pattern = "seq"; } // same loop shape
+    else if (parse_flag(i,argc,argv,"--kernel=touch")) { kernel = Kernel::TOUCH; }
+    else if (parse_flag(i,argc,argv,"--kernel=load"))  { kernel = Kernel::LOAD; }
+    else if (parse_flag(i,argc,argv,"--kernel=store")) { kernel = Kernel::STORE; }
+    else if (parse_flag(i,argc,argv,"--kernel=copy"))  { kernel = Kernel::COPY; }
+    else if (parse_flag(i,argc,argv,"--kernel=triad")) { kernel = Kernel::TRIAD; }
+    else if (parse_flag(i,argc,argv,"--nt"))           { nt = true; }
+    else if (parse_szt (i,argc,argv,"--duration_ms", duration_ms)) {}
+    else if (parse_szt (i,argc,argv,"--sample_ms",   sample_ms)) {}
+    else if (parse_szt (i,argc,argv,"--warm_ms",     warm_ms)) {}
+    else if (parse_szt (i,argc,argv,"--block_kb",    block_kb)) {}
+    else if (parse_str (i,argc,argv,"--series",      series)) {}
+    else if (parse_str (i,argc,argv,"--counters",    counters)) {}
+    else if (parse_str (i,argc,argv,"--prefetch_distance", prefetch)) {}
     else ++i;
   }
 
+  std::vector<size_t> dists;
+  for (size_t pos = 0; pos < prefetch.size(); ) {
+    size_t comma = prefetch.find(',', pos);
+    std::string tok = prefetch.substr(pos, comma == std::string::npos ? std::string::npos : comma - pos);
+    pos = (comma == std::string::npos) ? prefetch.size() : comma + 1;
+    if (!tok.empty()) dists.push_back(size_t(std::stoull(tok)));
+  }
+  if (dists.empty()) dists.push_back(0);
+
   CSV csv;
-  csv.set_header("bytes,threads,stride_B,rw,pattern,repetition,GBps,lat_est_ns");
+  PerfCounters pc;
+  if (!counters.empty()) pc.open(counters);
+  csv.set_header("bytes,threads,stride_B,rw,pattern,repetition,GBps,lat_est_ns,kernel,isa,prefetch_dist" + pc.csv_header());
 
-  std::vector<uint8_t> buf(bytes);
-  touch_memory(buf.data(), bytes);
+  // vector kernels need 64 B-aligned slices
+  std::vector<uint8_t> storage(bytes + 64);
+  uint8_t* base = reinterpret_cast<uint8_t*>((reinterpret_cast<uintptr_t>(storage.data()) + 63) & ~uintptr_t(63));
+  touch_memory(base, bytes);
+  if (kernel == Kernel::TRIAD) {
+    // keep operands normal doubles (prefault bytes would decode as denormals)
+    double* d = reinterpret_cast<double*>(base);
+    for (size_t k = 0; k < bytes / sizeof(double); ++k) d[k] = 1.0;
+  }
+  if (kernel != Kernel::TOUCH && pattern == "random") pattern = "seq"; // vector kernels stream only
+  if (pattern != "random" && (dists.size() > 1 || dists[0] != 0)) {
+    std::fprintf(stderr, "# bw: --prefetch_distance only applies to random touch; running without\n");
+    dists.assign(1, 0);
+  }
 
-  for (int R=0; R<reps; ++R) {
-    std::vector<std::thread> th;
-    std::vector<Work> works(threads);
-    size_t chunk = bytes / size_t(std::max(1,threads));
-
-    for (int k=0; k<threads; ++k) {
-      th.emplace_back([&,k](){
-        pin_to_cpu(cpu0 < 0 ? -1 : (cpu0 + k));
-        works[k] = Work{
-          .base     = buf.data() + size_t(k)*chunk,
-          .bytes    = chunk,
-          .stride   = stride,
-          .rw       = rw,
-          .iters    = iters,
-          .pat      = (pattern=="random" ? Pat::RANDOM : Pat::SEQ),
-          .seed     = 0x9e3779b97f4a7c15ull ^ (uint64_t)(R*1315423911u + k*2654435761u),
+  const char* rwstr =
+    (rw==RW::R? "100R" : rw==RW::W? "100W" : rw==RW::R70W30? "70R30W" : "50R50W");
+
+  if (duration_ms > 0) {
+    CSV ts;
+    ts.set_header("repetition,t_ms,threads,kernel,rw,bytes_cum,GBps_interval,prefetch_dist");
+    sample_ms = std::max<size_t>(1, sample_ms);
+    size_t chunk = (bytes / size_t(std::max(1,threads))) & ~size_t(63);
+
+    for (size_t D : dists)
+    for (int R=0; R<reps; ++R) {
+      SpinStart start;
+      std::atomic<bool> stop{false};
+      std::vector<ByteCounter> cnt(static_cast<size_t>(threads));
+      std::vector<std::thread> th;
+      for (int k=0; k<threads; ++k) {
+        Work w{
+          .base   = base + size_t(k)*chunk,
+          .bytes  = chunk,
+          .stride = stride,
+          .rw     = rw,
+          .iters  = 0,
+          .pat    = (pattern=="random" ? Pat::RANDOM : Pat::SEQ),
+          .seed   = 0x9e3779b97f4a7c15ull ^ (uint64_t)(R*1315423911u + k*2654435761u),
+          .kernel = kernel,
+          .nt     = nt,
+          .prefetch = D,
           .gbps_out = 0.0
         };
-        worker_fn(works[k]);
-      });
+        th.emplace_back([&,k,w](){
+          pin_to_cpu(cpu0 < 0 ? -1 : (cpu0 + k));
+          timed_worker_fn(w, block_kb*1024, start, stop, cnt[k]);
+        });
+      }
+
+      auto sum = [&](){ double b = 0.0; for (auto& c : cnt) b += c.bytes.load(std::memory_order_relaxed); return b; };
+      // counters cover the same steady-state window as GBps: from the end of
+      // warm-up (or the release of the workers) to the last sample
+      const bool warm = warm_ms > 0 && warm_ms < duration_ms;
+      start.release_when(threads);
+      const auto t0 = clk::now();
+      if (!warm) pc.start();
+      double prev_b = 0.0, prev_ms = 0.0, warm_b = 0.0, warm_t = 0.0;
+      for (size_t tick = 1; ; ++tick) {
+        std::this_thread::sleep_until(t0 + std::chrono::milliseconds(tick * sample_ms));
+        double b  = sum();
+        double ms = std::chrono::duration<double, std::milli>(clk::now() - t0).count();
+        double gb = (ms > prev_ms) ? ((b - prev_b) / ((ms - prev_ms) * 1e-3)) / 1e9 : 0.0;
+        ts.add_row(std::to_string(R)+","+std::to_string(ms)+","+std::to_string(threads)+","+
+                   kernel_name(kernel, nt)+","+rwstr+","+
+                   std::to_string(b)+","+std::to_string(gb)+","+std::to_string(D));
+        if (warm && prev_ms < double(warm_ms) && ms >= double(warm_ms)) { warm_b = b; warm_t = ms; pc.start(); }
+        prev_b = b; prev_ms = ms;
+        if (ms >= double(duration_ms)) break;
+      }
+      pc.stop();
+      stop.store(true);
+      for (auto& t : th) t.join();
+
+      // steady state: bytes moved between the end of warm-up and the last sample,
+      // all workers running concurrently for the whole window
+      double win_s = (prev_ms - warm_t) * 1e-3;
+      double gbps  = win_s > 0.0 ? ((prev_b - warm_b) / win_s) / 1e9 : 0.0;
+      double lat_ns = gbps > 0.0 ? (double)chunk / (gbps * 1e9) * 1e9 : 0.0;
+      csv.add_row(std::to_string(bytes)+","+
+                  std::to_string(threads)+","+
+                  std::to_string(stride)+","+
+                  rwstr+"," + pattern + "," +
+                  std::to_string(R)+","+
+                  std::to_string(gbps)+","+
+                  std::to_string(lat_ns)+","+
+                  kernel_name(kernel, nt)+","+
+                  (kernel==Kernel::TOUCH ? "scalar" : kIsa)+","+
+                  std::to_string(D)+
+                  pc.csv_values());
     }
-    for (auto& t : th) t.join();
+    csv.print();
+    if (!series.empty()) ts.write(series);
+    return;
+  }
 
-    double gbps_sum = 0.0;
-    for (auto& w : works) gbps_sum += w.gbps_out;
+  for (size_t D : dists)
+  for (int R=0; R<reps; ++R) {
+    BwPoint p;
+    p.bytes = bytes; p.stride = stride; p.iters = iters;
+    p.threads = threads; p.cpu0 = cpu0; p.rw = rw;
+    p.random = (pattern == "random");
+    p.kernel = kernel; p.nt = nt;
+    p.prefetch = D;
+    size_t chunk = (bytes / size_t(std::max(1,threads))) & ~size_t(63);
+
+    pc.start();
+    double gbps_sum = bw_gbps(base, p, R);
+    pc.stop();
 
     // crude Little's Law proxy: L ≈ inflight bytes / throughput; use chunk as proxy
     double lat_ns = (double)chunk / (gbps_sum * 1e9) * 1e9;
 
-    const char* rwstr =
-      (rw==RW::R? "100R" : rw==RW::W? "100W" : rw==RW::R70W30? "70R30W" : "50R50W");
-
     csv.add_row(std::to_string(bytes)+","+
                 std::to_string(threads)+","+
                 std::to_string(stride)+","+
                 rwstr+"," + pattern + "," +
                 std::to_string(R)+","+
                 std::to_string(gbps_sum)+","+
-                std::to_string(lat_ns));
+                std::to_string(lat_ns)+","+
+                kernel_name(kernel, nt)+","+
+                (kernel==Kernel::TOUCH ? "scalar" : kIsa)+","+
+                std::to_string(D)+
+                pc.csv_values());
   }
   csv.print();
 }
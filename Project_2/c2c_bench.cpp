@@ -0,0 +1,171 @@
+// src/c2c_bench.cpp
+#include "util.h"
+#include <vector>
+#include <thread>
+#include <atomic>
+#include <string>
+#include <algorithm>
+#include <cstdio>
+
+// Core-to-core latency: two threads pinned to CPUs a and b hand a counter back
+// and forth through one shared cache line. Each round trip moves ownership of
+// the line a→b→a, so the per-round time is two coherence transfers.
+//   --mode=cas  : owner waits for its turn, then a locked CAS (lock hand-off)
+//   --mode=flag : payload written on its own line, then a release store of the
+//                 flag (producer/consumer queue slot)
+
+enum class C2CMode { CAS, FLAG };
+
+struct alignas(64) SharedLine {
+  std::atomic<uint64_t> v{0};
+};
+
+struct PingPong {
+  SharedLine flag;
+  SharedLine payload;
+};
+
+// Spin on the line; hand the CPU back only if the peer is clearly not running
+// (oversubscribed or unpinned), which never triggers on a healthy pair.
+static inline void wait_for(const std::atomic<uint64_t>& a, uint64_t want) {
+  unsigned spins = 0;
+  while (a.load(std::memory_order_acquire) != want) {
+    cpu_relax();
+    if (++spins == (1u << 16)) { std::this_thread::yield(); spins = 0; }
+  }
+}
+
+// One side of the exchange: waits for `mine`, passes `mine + 1` to the peer.
+static inline void take_turn(PingPong& s, C2CMode m, uint64_t mine) {
+  wait_for(s.flag.v, mine);
+  if (m == C2CMode::CAS) {
+    uint64_t e = mine;
+    s.flag.v.compare_exchange_strong(e, mine + 1, std::memory_order_acq_rel);
+  } else {
+    uint64_t p = s.payload.v.load(std::memory_order_relaxed);
+    s.payload.v.store(p + 1, std::memory_order_relaxed);
+    s.flag.v.store(mine + 1, std::memory_order_release);
+  }
+}
+
+// Round-trip ns for `reps` timed blocks of `iters` round trips each (after
+// `warm` untimed ones); the initiator on cpu_a owns the TSC.
+static std::vector<double> ping_pong(int cpu_a, int cpu_b, C2CMode m,
+                                     size_t iters, size_t warm, int reps) {
+  PingPong s;
+  SpinStart st;
+  const uint64_t total = warm + iters * uint64_t(std::max(0, reps));
+  std::vector<double> out;
+
+  std::thread responder([&] {
+    pin_to_cpu(cpu_b);
+    st.arrive_and_wait();
+    for (uint64_t i = 0; i < total; ++i) take_turn(s, m, 2*i + 1);
+  });
+  std::thread initiator([&] {
+    pin_to_cpu(cpu_a);
+    st.arrive_and_wait();
+    uint64_t i = 0;
+    for (; i < warm; ++i) take_turn(s, m, 2*i);
+    for (int r = 0; r < reps; ++r) {
+      uint64_t t0 = rdtscp_now();
+      for (size_t k = 0; k < iters; ++k, ++i) take_turn(s, m, 2*i);
+      wait_for(s.flag.v, 2*i);          // last reply has landed
+      uint64_t t1 = rdtscp_now();
+      double cyc = double(t1 - t0 - timer_overhead_cycles()) / double(iters);
+      out.push_back(cycles_to_ns(std::max(0.0, cyc)));
+    }
+  });
+  st.release_when(2);
+  initiator.join();
+  responder.join();
+  return out;
+}
+
+static double median(std::vector<double> v) {
+  if (v.empty()) return 0.0;
+  std::sort(v.begin(), v.end());
+  size_t n = v.size();
+  return n % 2 ? v[n/2] : 0.5 * (v[n/2 - 1] + v[n/2]);
+}
+
+void run_c2c_bench(int argc, char** argv) {
+  size_t iters = 100'000;           // round trips per timed block
+  size_t warm  = 10'000;
+  int    reps  = 5;
+  C2CMode mode = C2CMode::CAS;
+  std::string cpus;                 // e.g. "0-7" or "0,4,8"; default all online
+  std::string matrix;               // optional path for the square median matrix
+
+  for (int i=1; i<argc; ) {
+    if      (parse_szt (i,argc,argv,"--iters",  iters)) {}
+    else if (parse_szt (i,argc,argv,"--warm",   warm)) {}
+    else if (parse_int (i,argc,argv,"--reps",   reps)) {}
+    else if (parse_str (i,argc,argv,"--cpus",   cpus)) {}
+    else if (parse_str (i,argc,argv,"--matrix", matrix)) {}
+    else if (parse_flag(i,argc,argv,"--mode=cas"))  mode = C2CMode::CAS;
+    else if (parse_flag(i,argc,argv,"--mode=flag")) mode = C2CMode::FLAG;
+    else ++i;
+  }
+  iters = std::max<size_t>(1, iters);
+
+  std::vector<CpuTopo> topo = cpu_topology();
+  if (!cpus.empty()) {
+    std::vector<int> want = parse_cpu_list(cpus);
+    std::vector<CpuTopo> sel;
+    for (int c : want) {
+      auto it = std::find_if(topo.begin(), topo.end(), [c](const CpuTopo& t){ return t.cpu == c; });
+      if (it != topo.end()) sel.push_back(*it);
+      else std::fprintf(stderr, "# c2c: cpu %d is not online (skipped)\n", c);
+    }
+    topo = sel;
+  }
+  if (topo.size() < 2) {
+    std::fprintf(stderr, "# c2c: need at least two CPUs (have %zu)\n", topo.size());
+    return;
+  }
+  const char* modestr = (mode == C2CMode::CAS) ? "cas" : "flag";
+  std::fprintf(stderr, "# c2c: %zu cpus, mode=%s, tsc_hz=%.0f\n", topo.size(), modestr, tsc_hz());
+
+  CSV csv;
+  csv.set_header("cpu_a,cpu_b,core_a,core_b,pkg_a,pkg_b,relation,mode,iter,repetition,roundtrip_ns,oneway_ns");
+  const size_t n = topo.size();
+  std::vector<double> med(n * n, 0.0);
+
+  for (size_t a = 0; a < n; ++a) {
+    for (size_t b = 0; b < n; ++b) {
+      if (a == b) continue;
+      std::vector<double> rtt = ping_pong(topo[a].cpu, topo[b].cpu, mode, iters, warm, reps);
+      med[a*n + b] = median(rtt);
+      for (size_t r = 0; r < rtt.size(); ++r) {
+        csv.add_row(std::to_string(topo[a].cpu) + "," +
+                    std::to_string(topo[b].cpu) + "," +
+                    std::to_string(topo[a].core) + "," +
+                    std::to_string(topo[b].core) + "," +
+                    std::to_string(topo[a].package) + "," +
+                    std::to_string(topo[b].package) + "," +
+                    cpu_relation(topo[a], topo[b]) + "," +
+                    modestr + "," +
+                    std::to_string(iters) + "," +
+                    std::to_string(r) + "," +
+                    std::to_string(rtt[r]) + "," +
+                    std::to_string(rtt[r] * 0.5));
+      }
+    }
+  }
+  csv.print();
+
+  if (!matrix.empty()) {
+    // rows = initiator, columns = responder; median round trip in ns
+    CSV m;
+    std::string h = "cpu";
+    for (auto& t : topo) h += "," + std::to_string(t.cpu);
+    m.set_header(h);
+    for (size_t a = 0; a < n; ++a) {
+      std::string row = std::to_string(topo[a].cpu);
+      for (size_t b = 0; b < n; ++b) row += "," + (a == b ? std::string() : std::to_string(med[a*n + b]));
+      m.add_row(row);
+    }
+    m.write(matrix);
+  }
+}
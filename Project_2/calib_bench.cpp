@@ -0,0 +1,217 @@
+// src/calib_bench.cpp
+#include "util.h"
+#include "vec_kernels.h"
+#include <vector>
+#include <string>
+#include <algorithm>
+#include <cstring>
+#include <thread>
+
+// Machine ceilings for Project_1/plot_roofline.py --profile: FMA-chain peak
+// GFLOP/s per dtype x vector mode (the same per-ISA builds `memlab vec`
+// times), and read bandwidth with the working set sized to half of each data
+// cache level and well past the LLC (DRAM). A level's read ceiling is the
+// fastest of the full-line LOAD path and the per-mode `dot` kernels (f32/f64).
+// A scalar-width load loop alone cannot keep up with what AVX-512 `dot` reads
+// from L1/L2, and the roofline points would then sit above their ceiling.
+// One row per ceiling:
+//
+//   machine,ceiling,level,dtype,vecmode,threads,kernel,cache_bytes,ws_bytes,best,median,unit
+//
+// `best` is the max over repetitions (a ceiling is an upper bound), `median`
+// shows how stable it was. For bw rows, kernel/dtype/vecmode name the engine
+// that set the ceiling. The file is rewritten on every run.
+
+struct Ceiling {
+  std::string ceiling, level, dtype, vecmode, kernel, unit;
+  size_t cache_bytes = 0, ws_bytes = 0;
+  double best = 0, median = 0;
+};
+
+static std::pair<double,double> best_median(std::vector<double> v) {
+  std::sort(v.begin(), v.end());
+  return {v.back(), v[v.size() / 2]};
+}
+
+// Aggregate GFLOP/s of `threads` pinned workers each running the FMA probe
+// for about `seconds`.
+template <class T>
+static double fma_gflops(double (*fma)(T*, size_t), int threads, int cpu0, double seconds) {
+  T sink = T(0);
+  size_t iters = 1 << 16;
+  for (;;) {   // size one call on the calling thread
+    Timer t; t.start();
+    fma(&sink, iters);
+    const double s = t.stop_s();
+    if (s >= seconds / 4 || iters > (size_t(1) << 40)) {
+      iters = size_t(double(iters) * seconds / std::max(s, 1e-9)) + 1;
+      break;
+    }
+    iters *= 4;
+  }
+  std::vector<double> rate(size_t(threads), 0.0);
+  std::vector<T> sinks(size_t(threads) * (64 / sizeof(T)), T(0));   // one line each
+  SpinStart start;
+  std::vector<std::thread> th;
+  for (int k = 0; k < threads; ++k)
+    th.emplace_back([&, k]() {
+      pin_to_cpu(cpu0 < 0 ? -1 : cpu0 + k);
+      start.arrive_and_wait();
+      Timer t; t.start();
+      const double flops = fma(&sinks[size_t(k) * (64 / sizeof(T))], iters);
+      rate[size_t(k)] = flops / t.stop_s() / 1e9;
+    });
+  start.release_when(threads);
+  for (auto& t : th) t.join();
+  double sum = 0.0;
+  for (double r : rate) sum += r;
+  return sum;
+}
+
+// Aggregate read GiB/s of `threads` pinned workers, each running `dot` `iters`
+// times over its own slice of `base` (x = first half of the slice, y = second).
+template <class T>
+static double dot_gibps(T (*dot)(const T*, const T*, size_t, size_t), uint8_t* base, size_t bytes,
+                        size_t iters, int threads, int cpu0) {
+  const size_t per = (bytes / size_t(threads)) & ~size_t(127);
+  const size_t n = per / (2 * sizeof(T));
+  if (n == 0) return 0.0;
+  std::vector<double> rate(size_t(threads), 0.0);
+  std::vector<T> sinks(size_t(threads) * (64 / sizeof(T)), T(0));   // one line each
+  SpinStart start;
+  std::vector<std::thread> th;
+  for (int k = 0; k < threads; ++k)
+    th.emplace_back([&, k]() {
+      pin_to_cpu(cpu0 < 0 ? -1 : cpu0 + k);
+      const T* x = reinterpret_cast<const T*>(base + size_t(k) * per);
+      const T* y = x + n;
+      start.arrive_and_wait();
+      Timer t; t.start();
+      T acc = T(0);
+      for (size_t i = 0; i < iters; ++i) acc += dot(x, y, n, 1);
+      rate[size_t(k)] = double(iters) * double(2 * n * sizeof(T)) / t.stop_s() / double(1ull << 30);
+      sinks[size_t(k) * (64 / sizeof(T))] = acc;
+    });
+  start.release_when(threads);
+  for (auto& t : th) t.join();
+  double sum = 0.0;
+  for (double r : rate) sum += r;
+  return sum;
+}
+
+void run_calib_bench(int argc, char** argv) {
+  int threads = 1, cpu0 = -1, reps = 5;
+  std::string out = memlab_cache_file("MEMLAB_PROFILE", "machine_profile.csv");
+  std::string modes = "SCALAR,AUTO,AVX2,AVX512";
+  double flop_s = 0.05;                 // seconds per FMA repetition
+  size_t traffic = size_t(1) << 30;     // bytes read per bandwidth repetition
+  size_t dram_bytes = 0;                // 0 = 8 x LLC, clamped to [256 MiB, 1 GiB]
+  bool print = false;
+
+  for (int i=1; i<argc; ) {
+    if      (parse_int (i,argc,argv,"--threads",    threads)) {}
+    else if (parse_int (i,argc,argv,"--cpu0",       cpu0)) {}
+    else if (parse_int (i,argc,argv,"--reps",       reps)) {}
+    else if (parse_str (i,argc,argv,"--out",        out)) {}
+    else if (parse_str (i,argc,argv,"--modes",      modes)) {}
+    else if (parse_dbl (i,argc,argv,"--flop_s",     flop_s)) {}
+    else if (parse_szt (i,argc,argv,"--traffic",    traffic)) {}
+    else if (parse_szt (i,argc,argv,"--dram_bytes", dram_bytes)) {}
+    else if (parse_flag(i,argc,argv,"--print"))     print = true;
+    else ++i;
+  }
+  threads = std::max(1, threads);
+  reps = std::max(1, reps);
+
+  std::vector<Ceiling> rows;
+
+  // ---- compute ceilings ----
+  for (VecMode vm : {VecMode::SCALAR, VecMode::AUTO, VecMode::AVX2, VecMode::AVX512}) {
+    const std::string name = vec_mode_name(vm);
+    if (("," + modes + ",").find("," + name + ",") == std::string::npos) continue;
+    const VecKernels* k = vec_kernels(vm);
+    if (!k) { std::fprintf(stderr, "# calib: %s not available on this CPU/build; skipped\n", name.c_str()); continue; }
+    for (bool f64 : {false, true}) {
+      std::vector<double> g;
+      for (int r = 0; r < reps; ++r)
+        g.push_back(f64 ? fma_gflops(k->f64.fma, threads, cpu0, flop_s)
+                        : fma_gflops(k->f32.fma, threads, cpu0, flop_s));
+      auto [best, med] = best_median(g);
+      rows.push_back({"flops", "", f64 ? "f64" : "f32", name, "fma", "GFLOP/s", 0, 0, best, med});
+      std::fprintf(stderr, "# calib: %-6s %s peak %.2f GFLOP/s (x%d)\n", name.c_str(), f64 ? "f64" : "f32", best, threads);
+    }
+  }
+
+  // ---- bandwidth ceilings ----
+  struct Level { std::string name; size_t cache, ws; };
+  std::vector<Level> levels;
+  size_t llc = 0;
+  for (auto& c : cache_geometry()) {
+    if (c.type == "Instruction" || c.size == 0) continue;
+    // private levels add up across workers; a shared one is counted once per instance
+    const size_t inst = size_t((threads + std::max(1, c.shared_cpus) - 1) / std::max(1, c.shared_cpus));
+    levels.push_back({"L" + std::to_string(c.level), c.size, (c.size / 2) * std::max<size_t>(1, inst)});
+    llc = std::max(llc, c.size);
+  }
+  if (levels.empty()) std::fprintf(stderr, "# calib: cache geometry unknown; DRAM ceiling only\n");
+  if (!levels.empty()) levels.back().name = "LLC";
+  levels.push_back({"DRAM", 0, dram_bytes ? dram_bytes : std::clamp<size_t>(8 * llc, size_t(256) << 20, size_t(1) << 30)});
+
+  size_t max_ws = 0;
+  for (auto& l : levels) max_ws = std::max(max_ws, l.ws);
+  Arena a = arena_alloc(max_ws + 4096);
+  if (!a.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", max_ws); return; }
+  touch_memory(a.ptr, a.bytes);
+  std::memset(a.ptr, 0, a.bytes);   // dot reads it as f32/f64: zeros, not denormal bit patterns
+  for (auto& l : levels) {
+    BwPoint p;
+    p.bytes   = std::max<size_t>(size_t(threads) * 4096, l.ws & ~size_t(4095));
+    p.stride  = 64;
+    p.iters   = std::max<size_t>(1, traffic / p.bytes);
+    p.threads = threads;
+    p.cpu0    = cpu0;
+    p.kernel  = Kernel::LOAD;
+    bw_gbps(a.ptr, p, 0);   // warm the level
+    std::vector<double> g;
+    for (int r = 0; r < reps; ++r) g.push_back(bw_gbps(a.ptr, p, r) * 1e9 / double(1ull << 30));
+    auto [best, med] = best_median(g);
+    Ceiling c{"bw", l.name, "", "", "load", "GiB/s", l.cache, p.bytes, best, med};
+    std::fprintf(stderr, "# calib: %-4s ws=%zu B load       %.2f GiB/s (x%d)\n", l.name.c_str(), p.bytes, best, threads);
+
+    // the same level read by each vector variant's dot; the fastest engine is the ceiling
+    for (VecMode vm : {VecMode::SCALAR, VecMode::AUTO, VecMode::AVX2, VecMode::AVX512}) {
+      const std::string name = vec_mode_name(vm);
+      if (("," + modes + ",").find("," + name + ",") == std::string::npos) continue;
+      const VecKernels* k = vec_kernels(vm);
+      if (!k) continue;
+      for (bool f64 : {false, true}) {
+        auto run = [&]() {
+          return f64 ? dot_gibps(k->f64.dot, a.ptr, p.bytes, p.iters, threads, cpu0)
+                     : dot_gibps(k->f32.dot, a.ptr, p.bytes, p.iters, threads, cpu0);
+        };
+        run();   // warm
+        std::vector<double> v;
+        for (int r = 0; r < reps; ++r) v.push_back(run());
+        auto [vb, vmed] = best_median(v);
+        std::fprintf(stderr, "# calib: %-4s ws=%zu B dot %-6s %s %.2f GiB/s (x%d)\n",
+                     l.name.c_str(), p.bytes, name.c_str(), f64 ? "f64" : "f32", vb, threads);
+        if (vb > c.best) c = {"bw", l.name, f64 ? "f64" : "f32", name, "dot", "GiB/s", l.cache, p.bytes, vb, vmed};
+      }
+    }
+    rows.push_back(c);
+    std::fprintf(stderr, "# calib: %-4s ceiling %.2f GiB/s (%s%s%s)\n", l.name.c_str(), c.best, c.kernel.c_str(),
+                 c.vecmode.empty() ? "" : " ", c.vecmode.c_str());
+  }
+  arena_free(a);
+
+  CSV csv;
+  csv.set_header("machine,ceiling,level,dtype,vecmode,threads,kernel,cache_bytes,ws_bytes,best,median,unit");
+  const std::string id = machine_id();
+  for (auto& r : rows)
+    csv.add_row(id + "," + r.ceiling + "," + r.level + "," + r.dtype + "," + r.vecmode + "," +
+                std::to_string(threads) + "," + r.kernel + "," + std::to_string(r.cache_bytes) + "," +
+                std::to_string(r.ws_bytes) + "," + std::to_string(r.best) + "," +
+                std::to_string(r.median) + "," + r.unit);
+  if (print) csv.print();
+  if (csv.write(out)) std::fprintf(stderr, "# calib: wrote %s\n", out.c_str());
+}
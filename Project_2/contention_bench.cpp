@@ -0,0 +1,206 @@
+// src/contention_bench.cpp
+#include "util.h"
+#include <vector>
+#include <thread>
+#include <atomic>
+#include <string>
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+
+// Noisy neighbour: a pinned victim walks a fixed working set (by default 3/4
+// of the LLC, so it fits alone) while K aggressors on other physical cores
+// stream over private footprints. Sweeping the footprint past the LLC and K
+// upward shows how much of the victim's cache share, latency and throughput
+// the co-runners take away. K=0 rows are the solo baseline.
+
+enum class VictimKind { CHASE, STREAM };
+
+struct alignas(64) AggCounter {
+  std::atomic<uint64_t> bytes{0};
+};
+
+static void aggressor_fn(uint8_t* base, size_t bytes, bool write,
+                         const std::atomic<bool>& stop, AggCounter& out) {
+  const size_t lines = bytes / 64;
+  uint64_t sink = 0, local = 0;
+  while (!stop.load(std::memory_order_relaxed)) {
+    for (size_t l = 0; l < lines; ++l) {
+      uint64_t* p = reinterpret_cast<uint64_t*>(base + l*64);
+      if (write) *p = l; else sink += *p;
+      if ((l & 63) == 63) {
+        local += 64 * 64 * (write ? 2 : 1);   // same RFO + writeback accounting as bw
+        out.bytes.store(local, std::memory_order_relaxed);
+        if (stop.load(std::memory_order_relaxed)) break;
+      }
+    }
+  }
+#if !defined(_WIN32)
+  asm volatile(""::"r"(sink):"memory");
+#else
+  volatile uint64_t keep = sink; (void)keep;
+#endif
+}
+
+struct VictimResult { double ns_per_access = 0.0, gbps = 0.0; };
+
+// One untimed lap so the victim's lines are resident (or contested) before timing.
+static VictimResult run_victim(VictimKind kind, const Arena& ws, size_t ws_bytes,
+                               size_t start, size_t iters) {
+  VictimResult v;
+  const uint64_t* idx = reinterpret_cast<const uint64_t*>(ws.ptr);
+  const size_t lines = std::max<size_t>(1, ws_bytes / 64);
+  if (kind == VictimKind::CHASE) {
+    chase_ns(idx, start, lines);
+    v.ns_per_access = chase_ns(idx, start, iters);
+    v.gbps = v.ns_per_access > 0.0 ? 64.0 / v.ns_per_access : 0.0;
+    return v;
+  }
+  uint64_t sink = 0;
+  for (size_t l = 0; l < lines; ++l) sink += idx[l*8];
+  size_t done = 0;
+  Timer t; t.start();
+  while (done < iters) {
+    for (size_t l = 0; l < lines; ++l) sink += idx[l*8];
+    done += lines;
+  }
+  double sec = t.stop_s();
+#if !defined(_WIN32)
+  asm volatile(""::"r"(sink):"memory");
+#else
+  volatile uint64_t keep = sink; (void)keep;
+#endif
+  v.ns_per_access = sec * 1e9 / double(done);
+  v.gbps = (double(done) * 64.0 / sec) / 1e9;
+  return v;
+}
+
+// One CPU per physical core other than the victim's, in topology order.
+static std::vector<int> aggressor_cpus(int victim_cpu) {
+  std::vector<CpuTopo> topo = cpu_topology();
+  CpuTopo vic;
+  vic.cpu = -1;
+  for (auto& t : topo) if (t.cpu == victim_cpu) vic = t;
+  std::vector<int> out;
+  std::vector<std::pair<int,int>> used;
+  if (vic.cpu >= 0) used.push_back({vic.package, vic.core});
+  for (auto& t : topo) {
+    std::pair<int,int> key{t.package, t.core};
+    if (std::find(used.begin(), used.end(), key) != used.end()) continue;
+    used.push_back(key);
+    out.push_back(t.cpu);
+  }
+  return out;
+}
+
+void run_contention_bench(int argc, char** argv) {
+  size_t victim_kb  = 0;            // 0 = 3/4 of the LLC (8 MiB if unknown)
+  size_t min_agg_kb = 256;
+  size_t max_agg_kb = 256 * 1024;
+  size_t iters      = 2'000'000;    // victim accesses per point
+  size_t warm_ms    = 50;
+  int    max_aggr   = -1;           // -1 = one per free physical core (max 8)
+  int    cpu        = 0;            // victim core
+  int    reps       = 3;
+  bool   agg_write  = false;
+  VictimKind kind   = VictimKind::CHASE;
+  std::string cpus;                 // explicit aggressor CPUs (overrides topology pick)
+
+  for (int i=1; i<argc; ) {
+    if      (parse_szt (i,argc,argv,"--victim_kb",  victim_kb)) {}
+    else if (parse_szt (i,argc,argv,"--min_agg_kb", min_agg_kb)) {}
+    else if (parse_szt (i,argc,argv,"--max_agg_kb", max_agg_kb)) {}
+    else if (parse_szt (i,argc,argv,"--iters",      iters)) {}
+    else if (parse_szt (i,argc,argv,"--warm_ms",    warm_ms)) {}
+    else if (parse_int (i,argc,argv,"--aggressors", max_aggr)) {}
+    else if (parse_int (i,argc,argv,"--cpu",        cpu)) {}
+    else if (parse_int (i,argc,argv,"--reps",       reps)) {}
+    else if (parse_str (i,argc,argv,"--aggr_cpus",  cpus)) {}
+    else if (parse_flag(i,argc,argv,"--victim=chase"))  kind = VictimKind::CHASE;
+    else if (parse_flag(i,argc,argv,"--victim=stream")) kind = VictimKind::STREAM;
+    else if (parse_flag(i,argc,argv,"--agg=read"))  agg_write = false;
+    else if (parse_flag(i,argc,argv,"--agg=write")) agg_write = true;
+    else ++i;
+  }
+
+  const size_t llc = llc_bytes();
+  size_t victim_B = victim_kb ? victim_kb * 1024 : (llc ? llc / 4 * 3 : (size_t(8) << 20));
+  victim_B = std::max<size_t>(64, victim_B & ~size_t(63));
+  std::vector<int> agg_cpus = cpus.empty() ? aggressor_cpus(cpu) : parse_cpu_list(cpus);
+  if (max_aggr < 0) max_aggr = int(std::min<size_t>(8, agg_cpus.size()));
+  if (size_t(max_aggr) > agg_cpus.size()) {
+    std::fprintf(stderr, "# contention: only %zu aggressor cores free of the victim's core; capping at that\n",
+                 agg_cpus.size());
+    max_aggr = int(agg_cpus.size());
+  }
+  const char* vname = kind == VictimKind::CHASE ? "chase" : "stream";
+  const char* rw    = agg_write ? "write" : "read";
+  std::fprintf(stderr, "# contention: victim %s %zu B on cpu %d, llc=%zu B, up to %d aggressors\n",
+               vname, victim_B, cpu, llc, max_aggr);
+
+  pin_to_cpu(cpu);
+  Arena ws = arena_alloc(victim_B);
+  if (!ws.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", victim_B); return; }
+  touch_memory(ws.ptr, ws.bytes);
+  size_t start = 0;
+  if (kind == VictimKind::CHASE)
+    build_ring(reinterpret_cast<uint64_t*>(ws.ptr), victim_B, 64, Pattern::RANDOM, 0, 1, &start);
+
+  CSV csv;
+  csv.set_header("victim_B,victim,aggressors,agg_footprint_B,agg_rw,repetition,"
+                 "victim_ns_per_access,victim_GBps,agg_GBps,lat_slowdown,tput_loss_pct");
+  auto add = [&](int K, size_t F, int R, const VictimResult& v, double agg_gbps, double base_ns) {
+    double slow = base_ns > 0.0 ? v.ns_per_access / base_ns : 0.0;
+    double loss = slow > 0.0 ? 100.0 * (1.0 - 1.0 / slow) : 0.0;
+    csv.add_row(std::to_string(victim_B) + "," + vname + "," +
+                std::to_string(K) + "," + std::to_string(F) + "," + rw + "," +
+                std::to_string(R) + "," +
+                std::to_string(v.ns_per_access) + "," +
+                std::to_string(v.gbps) + "," +
+                std::to_string(agg_gbps) + "," +
+                std::to_string(slow) + "," +
+                std::to_string(loss));
+  };
+
+  // solo baseline; slowdowns are relative to its median
+  std::vector<VictimResult> solo;
+  for (int R=0; R<reps; ++R) solo.push_back(run_victim(kind, ws, victim_B, start, iters));
+  std::vector<double> sns;
+  for (auto& v : solo) sns.push_back(v.ns_per_access);
+  std::sort(sns.begin(), sns.end());
+  const double base_ns = sns.empty() ? 0.0 : sns[sns.size() / 2];
+  for (int R=0; R<int(solo.size()); ++R) add(0, 0, R, solo[size_t(R)], 0.0, base_ns);
+
+  for (size_t fkb = min_agg_kb; max_aggr > 0 && fkb <= max_agg_kb; fkb <<= 1) {
+    const size_t F = fkb * 1024;
+    Arena agg = arena_alloc(F * size_t(max_aggr));
+    if (!agg.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", F * size_t(max_aggr)); break; }
+    touch_memory(agg.ptr, agg.bytes);
+    for (int K = 1; K <= max_aggr; ++K) {
+      for (int R=0; R<reps; ++R) {
+        std::atomic<bool> stop{false};
+        std::vector<AggCounter> cnt(static_cast<size_t>(K));
+        std::vector<std::thread> th;
+        for (int k=0; k<K; ++k) {
+          th.emplace_back([&,k](){
+            pin_to_cpu(agg_cpus[size_t(k)]);
+            aggressor_fn(agg.ptr + size_t(k)*F, F, agg_write, stop, cnt[size_t(k)]);
+          });
+        }
+        std::this_thread::sleep_for(std::chrono::milliseconds(warm_ms));
+        uint64_t b0 = 0, b1 = 0;
+        for (auto& c : cnt) b0 += c.bytes.load(std::memory_order_relaxed);
+        Timer t; t.start();
+        VictimResult v = run_victim(kind, ws, victim_B, start, iters);
+        double sec = t.stop_s();
+        for (auto& c : cnt) b1 += c.bytes.load(std::memory_order_relaxed);
+        stop.store(true);
+        for (auto& x : th) x.join();
+        add(K, F, R, v, sec > 0.0 ? (double(b1 - b0) / sec) / 1e9 : 0.0, base_ns);
+      }
+    }
+    arena_free(agg);
+  }
+  csv.print();
+  arena_free(ws);
+}
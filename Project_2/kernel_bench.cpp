@@ -2,6 +2,11 @@
 #include "util.h"
 #include <vector>
 #include <cstring>
+#include <cmath>
+#include <random>
+#include <numeric>
+#include <algorithm>
+#include <string>
 
 static void saxpy(float a, const float* x, float* y, size_t n, size_t stride) {
   for (size_t i = 0; i < n; i += stride) {
@@ -9,6 +14,207 @@ static void saxpy(float a, const float* x, float* y, size_t n, size_t stride) {
   }
 }
 
+double saxpy_seconds(float a, const float* x, float* y, size_t n, size_t stride, size_t iters) {
+  Timer t; t.start();
+  for (size_t it=0; it<iters; ++it) {
+    saxpy(a, x, y, n, stride);
+  }
+  return t.stop_s();
+}
+
+// ---------------- irregular kernels (--type=gather|scatter|spmv|hashprobe) ----------------
+// Element indices point at "slots" spaced `stride` floats apart, so --stride
+// and --page_span control spatial reuse the same way they do for saxpy. The
+// index streams (and the CSR matrix / hash table) are built before timing.
+
+enum class KType { SAXPY, GATHER, SCATTER, SPMV, HASHPROBE };
+enum class IDist { UNIFORM, ZIPF, CLUSTERED };
+
+static const char* ktype_name(KType k) {
+  switch (k) {
+    case KType::GATHER:    return "gather";
+    case KType::SCATTER:   return "scatter";
+    case KType::SPMV:      return "spmv";
+    case KType::HASHPROBE: return "hashprobe";
+    default:               return "saxpy";
+  }
+}
+
+static const char* idist_name(IDist d) {
+  switch (d) {
+    case IDist::ZIPF:      return "zipf";
+    case IDist::CLUSTERED: return "clustered";
+    default:               return "uniform";
+  }
+}
+
+struct IndexSpec {
+  IDist  dist = IDist::UNIFORM;
+  double zipf_s = 1.0;        // Zipf exponent
+  size_t cluster_slots = 64;  // clustered: window each burst stays inside
+  size_t burst = 16;          // clustered: accesses per burst
+};
+
+static inline uint64_t mix64(uint64_t x) {   // splitmix64 finaliser
+  x += 0x9E3779B97F4A7C15ull;
+  x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ull;
+  x = (x ^ (x >> 27)) * 0x94D049BB133111EBull;
+  return x ^ (x >> 31);
+}
+
+// Zipf rank in [0, n) by inverting the continuous approximation of the CDF.
+static inline size_t zipf_rank(double u, size_t n, double s) {
+  double x;
+  if (std::fabs(s - 1.0) < 1e-9) x = std::pow(double(n), u);
+  else x = std::pow((std::pow(double(n), 1.0 - s) - 1.0) * u + 1.0, 1.0 / (1.0 - s));
+  return std::min(n - 1, size_t(x) - 1);
+}
+
+// m draws in [0, n). Zipf ranks are scattered over the space with an affine
+// bijection so the hot items are not simply the first few lines.
+static std::vector<uint32_t> draw_slots(size_t m, size_t n, const IndexSpec& sp, uint64_t seed) {
+  std::vector<uint32_t> out(m);
+  std::mt19937_64 rng(seed);
+  std::uniform_real_distribution<double> U(0.0, 1.0);
+  uint64_t a = 2654435761ull % n;
+  while (n > 1 && std::gcd(a, uint64_t(n)) != 1) ++a;
+  const uint64_t b = rng() % n;
+  const size_t win = std::max<size_t>(1, std::min(sp.cluster_slots, n));
+  size_t base = 0;
+  for (size_t k = 0; k < m; ++k) {
+    size_t v;
+    if (sp.dist == IDist::ZIPF) {
+      v = size_t((uint64_t(zipf_rank(U(rng), n, sp.zipf_s)) * a + b) % n);
+    } else if (sp.dist == IDist::CLUSTERED) {
+      if (k % sp.burst == 0) base = rng() % (n - win + 1);
+      v = base + rng() % win;
+    } else {
+      v = rng() % n;
+    }
+    out[k] = uint32_t(v);
+  }
+  return out;
+}
+
+struct KernelResult { double sec = 0.0, bytes = 0.0, accesses = 0.0; };
+
+#if !defined(_WIN32)
+  #define KEEP(v) asm volatile(""::"r"(v):"memory")
+#else
+  #define KEEP(v) do { volatile auto keep_ = (v); (void)keep_; } while (0)
+#endif
+
+// sum += x[idx[k]]: 4 B index + 4 B element per access. Four independent
+// accumulators so the FP add latency chain doesn't cap the gather rate.
+static KernelResult gather_seconds(const float* x, const std::vector<uint32_t>& idx, size_t iters) {
+  const uint32_t* ix = idx.data();
+  const size_t m = idx.size();
+  float s0 = 0.0f, s1 = 0.0f, s2 = 0.0f, s3 = 0.0f;
+  Timer t; t.start();
+  for (size_t it=0; it<iters; ++it) {
+    size_t k = 0;
+    for (; k+4<=m; k+=4) {
+      s0 += x[ix[k]];   s1 += x[ix[k+1]];
+      s2 += x[ix[k+2]]; s3 += x[ix[k+3]];
+    }
+    for (; k<m; ++k) s0 += x[ix[k]];
+  }
+  double sec = t.stop_s();
+  float sum = (s0 + s1) + (s2 + s3);
+  KEEP(sum);
+  return {sec, double(iters) * double(m) * 8.0, double(iters) * double(m)};
+}
+
+// x[idx[k]] += 1: 4 B index + read and write of the element
+static KernelResult scatter_seconds(float* x, const std::vector<uint32_t>& idx, size_t iters) {
+  const uint32_t* ix = idx.data();
+  const size_t m = idx.size();
+  Timer t; t.start();
+  for (size_t it=0; it<iters; ++it)
+    for (size_t k=0; k<m; ++k) x[ix[k]] += 1.0f;
+  double sec = t.stop_s();
+  return {sec, double(iters) * double(m) * 12.0, double(iters) * double(m)};
+}
+
+struct Csr {
+  std::vector<uint32_t> rowptr, col;
+  std::vector<float>    val;
+  std::vector<float>    y;
+};
+
+// Rows of nnz_row columns drawn from the index distribution, sorted per row
+// like a real CSR matrix.
+static Csr build_csr(size_t nnz, size_t nnz_row, size_t slots, size_t stride,
+                     const IndexSpec& sp, uint64_t seed) {
+  Csr A;
+  const size_t rows = std::max<size_t>(1, nnz / nnz_row);
+  A.col = draw_slots(rows * nnz_row, slots, sp, seed);
+  A.val.assign(A.col.size(), 1.0f);
+  A.y.assign(rows, 0.0f);
+  A.rowptr.resize(rows + 1);
+  for (size_t r = 0; r <= rows; ++r) A.rowptr[r] = uint32_t(r * nnz_row);
+  for (size_t r = 0; r < rows; ++r) {
+    std::sort(A.col.begin() + long(r * nnz_row), A.col.begin() + long((r+1) * nnz_row));
+    for (size_t j = r * nnz_row; j < (r+1) * nnz_row; ++j) A.col[j] *= uint32_t(stride);
+  }
+  return A;
+}
+
+// y = A*x: per nonzero 4 B value + 4 B column + 4 B of x; per row rowptr + y
+static KernelResult spmv_seconds(const float* x, Csr& A, size_t iters) {
+  const size_t rows = A.y.size();
+  const uint32_t* rp = A.rowptr.data();
+  const uint32_t* ci = A.col.data();
+  const float* v = A.val.data();
+  float* y = A.y.data();
+  Timer t; t.start();
+  for (size_t it=0; it<iters; ++it) {
+    for (size_t r=0; r<rows; ++r) {
+      float acc = 0.0f;
+      for (uint32_t j=rp[r]; j<rp[r+1]; ++j) acc += v[j] * x[ci[j]];
+      y[r] = acc;
+    }
+  }
+  double sec = t.stop_s();
+  KEEP(y[0]);
+  const double nnz = double(A.col.size());
+  return {sec, double(iters) * (nnz * 12.0 + double(rows) * 8.0), double(iters) * nnz};
+}
+
+struct HashSlot { uint32_t key, val; };
+
+// Open addressing with linear probing; key 0 marks an empty slot.
+static size_t hash_insert_all(HashSlot* tab, size_t cap, size_t keys) {
+  std::memset(tab, 0, cap * sizeof(HashSlot));
+  size_t probes = 0;
+  for (size_t k = 1; k <= keys; ++k) {
+    size_t h = size_t(mix64(k)) & (cap - 1);
+    while (tab[h].key) { h = (h + 1) & (cap - 1); ++probes; }
+    tab[h] = {uint32_t(k), uint32_t(k * 7)};
+  }
+  return probes;
+}
+
+// One lookup per query key: 4 B query + 8 B per slot probed (at least one)
+static KernelResult hashprobe_seconds(const HashSlot* tab, size_t cap,
+                                      const std::vector<uint32_t>& q, size_t iters) {
+  const size_t m = q.size();
+  uint64_t sum = 0, probes = 0;
+  Timer t; t.start();
+  for (size_t it=0; it<iters; ++it) {
+    for (size_t k=0; k<m; ++k) {
+      const uint32_t key = q[k];
+      size_t h = size_t(mix64(key)) & (cap - 1);
+      while (tab[h].key != key && tab[h].key) { h = (h + 1) & (cap - 1); ++probes; }
+      sum += tab[h].val;
+    }
+  }
+  double sec = t.stop_s();
+  KEEP(sum);
+  const double lookups = double(iters) * double(m);
+  return {sec, lookups * 12.0 + double(probes) * 8.0, lookups};
+}
+
 void run_kernel_bench(int argc, char** argv) {
   size_t ws_bytes = 1ULL<<30; // 1 GiB working set
   size_t stride = 1;          // element stride (cache miss control)
@@ -17,6 +223,14 @@ void run_kernel_bench(int argc, char** argv) {
   size_t page_span = 1;       // touch every Nth page to induce DTLB misses
   bool huge = false;
   size_t iters = 5;
+  std::string counters;       // perf events bracketing each repetition
+  KType type = KType::SAXPY;
+  IndexSpec spec;
+  size_t accesses = 1ULL<<24; // index-stream length for the irregular kernels
+  size_t nnz_row = 16;        // spmv nonzeros per row
+  size_t cluster_B = 4096;    // clustered: bytes each burst stays inside
+  double load = 0.5;          // hashprobe table load factor
+  unsigned seed = 1;
 
   for (int i=1; i<argc; ) {
     if (parse_szt(i,argc,argv,"--ws_bytes", ws_bytes)) {}
@@ -26,18 +240,46 @@ void run_kernel_bench(int argc, char** argv) {
     else if (parse_szt(i,argc,argv,"--page_span", page_span)) {}
     else if (parse_flag(i,argc,argv,"--huge")) { huge = true; }
     else if (parse_szt(i,argc,argv,"--iters", iters)) {}
+    else if (parse_str(i,argc,argv,"--counters", counters)) {}
+    else if (parse_szt(i,argc,argv,"--accesses", accesses)) {}
+    else if (parse_szt(i,argc,argv,"--nnz_row", nnz_row)) {}
+    else if (parse_szt(i,argc,argv,"--cluster_B", cluster_B)) {}
+    else if (parse_szt(i,argc,argv,"--burst", spec.burst)) {}
+    else if (parse_dbl(i,argc,argv,"--zipf_s", spec.zipf_s)) {}
+    else if (parse_dbl(i,argc,argv,"--load", load)) {}
+    else if (parse_uint(i,argc,argv,"--seed", seed)) {}
+    else if (parse_flag(i,argc,argv,"--type=saxpy"))     type = KType::SAXPY;
+    else if (parse_flag(i,argc,argv,"--type=gather"))    type = KType::GATHER;
+    else if (parse_flag(i,argc,argv,"--type=scatter"))   type = KType::SCATTER;
+    else if (parse_flag(i,argc,argv,"--type=spmv"))      type = KType::SPMV;
+    else if (parse_flag(i,argc,argv,"--type=hashprobe")) type = KType::HASHPROBE;
+    else if (parse_flag(i,argc,argv,"--dist=uniform"))   spec.dist = IDist::UNIFORM;
+    else if (parse_flag(i,argc,argv,"--dist=zipf"))      spec.dist = IDist::ZIPF;
+    else if (parse_flag(i,argc,argv,"--dist=clustered")) spec.dist = IDist::CLUSTERED;
     else ++i;
   }
+  spec.burst = std::max<size_t>(1, spec.burst);
+  nnz_row = std::max<size_t>(1, nnz_row);
+  accesses = std::max<size_t>(nnz_row, accesses);
 
   pin_to_cpu(cpu);
 
   size_t n = ws_bytes / sizeof(float);
-  std::vector<float> x(n), y(n);
-  if (huge) {
-    prefer_hugepages(x.data(), n*sizeof(float));
-    prefer_hugepages(y.data(), n*sizeof(float));
+  if (type != KType::SAXPY && n > size_t(UINT32_MAX)) {
+    std::fprintf(stderr, "kernel: --type=%s uses 32-bit indices; --ws_bytes must be <= 16 GiB\n", ktype_name(type));
+    return;
   }
-  for (size_t i=0;i<n;++i){ x[i]=1.0f; y[i]=0.5f; }
+  const bool need_y = type == KType::SAXPY;
+  // untouched mappings: THP advice must land before the first fault to take effect
+  Arena xa = arena_alloc(n*sizeof(float), huge ? PageBacking::THP : PageBacking::DEFAULT);
+  Arena ya = need_y ? arena_alloc(n*sizeof(float), huge ? PageBacking::THP : PageBacking::DEFAULT) : Arena{};
+  if (!xa.ptr || (need_y && !ya.ptr)) { std::fprintf(stderr, "cannot map %zu bytes\n", n*sizeof(float)); return; }
+  float* x = reinterpret_cast<float*>(xa.ptr);
+  float* y = reinterpret_cast<float*>(ya.ptr);
+  for (size_t i=0;i<n;++i) x[i]=1.0f;
+  if (need_y) for (size_t i=0;i<n;++i) y[i]=0.5f;
+  if (huge && anon_huge_bytes(x) == 0)
+    std::fprintf(stderr, "# kernel: --huge requested but AnonHugePages=0 (THP disabled?)\n");
 
   // page-span: force accesses to every Nth page by boosting stride
   if (page_span > 1) {
@@ -45,21 +287,62 @@ void run_kernel_bench(int argc, char** argv) {
     size_t extra = (page_span-1)*page/sizeof(float);
     stride += extra;
   }
+  stride = std::max<size_t>(1, stride);
+
+  // irregular kernels: index streams / matrix / table, all built before timing
+  const size_t slots = std::max<size_t>(1, n / stride);
+  spec.cluster_slots = std::max<size_t>(1, cluster_B / (stride * sizeof(float)));
+  std::vector<uint32_t> idx;
+  Csr A;
+  HashSlot* tab = reinterpret_cast<HashSlot*>(xa.ptr);
+  size_t cap = 0;
+  if (type == KType::GATHER || type == KType::SCATTER) {
+    idx = draw_slots(accesses, slots, spec, seed);
+    for (auto& v : idx) v *= uint32_t(stride);
+  } else if (type == KType::SPMV) {
+    A = build_csr(accesses, nnz_row, slots, stride, spec, seed);
+  } else if (type == KType::HASHPROBE) {
+    if (stride > 1)
+      std::fprintf(stderr, "# kernel: hashprobe lays the table out by hash; --stride/--page_span ignored\n");
+    cap = 2;
+    while (cap * 2 * sizeof(HashSlot) <= ws_bytes) cap *= 2;
+    const size_t keys = std::max<size_t>(1, size_t(double(cap) * std::clamp(load, 0.01, 0.95)));
+    hash_insert_all(tab, cap, keys);
+    idx = draw_slots(accesses, keys, spec, seed);
+    for (auto& v : idx) v += 1;            // keys are 1..keys
+  }
+
+  PerfCounters pc;
+  if (!counters.empty()) pc.open(counters);
 
   CSV csv;
-  csv.set_header("ws_bytes,stride_elems,page_span,huge,repetition,sec,GBps_effective");
+  csv.set_header("ws_bytes,stride_elems,page_span,huge,repetition,sec,GBps_effective,"
+                 "type,dist,accesses,ns_per_access" + pc.csv_header());
   for (int R=0; R<reps; ++R) {
-    Timer t; t.start();
-    for (size_t it=0; it<iters; ++it) {
-      saxpy(2.0f, x.data(), y.data(), n, stride);
+    KernelResult kr;
+    pc.start();
+    switch (type) {
+      case KType::GATHER:    kr = gather_seconds(x, idx, iters); break;
+      case KType::SCATTER:   kr = scatter_seconds(x, idx, iters); break;
+      case KType::SPMV:      kr = spmv_seconds(x, A, iters); break;
+      case KType::HASHPROBE: kr = hashprobe_seconds(tab, cap, idx, iters); break;
+      default: {
+        kr.sec = saxpy_seconds(2.0f, x, y, n, stride, iters);
+        double elemtouched = double((n + stride - 1)/stride) * stride;
+        kr.bytes = double(iters) * elemtouched * 2 * sizeof(float); // read x + read/write y ~ rough
+        kr.accesses = double(iters) * double((n + stride - 1)/stride);
+      }
     }
-    double sec = t.stop_s();
-    double elemtouched = double((n + stride - 1)/stride) * stride;
-    double bytes_moved = double(iters) * elemtouched * 2 * sizeof(float); // read x + read/write y ~ rough
-    double gbps = (bytes_moved / sec) / 1e9;
+    pc.stop();
+    double gbps = (kr.bytes / kr.sec) / 1e9;
+    double ns = kr.accesses > 0.0 ? kr.sec * 1e9 / kr.accesses : 0.0;
     csv.add_row(std::to_string(ws_bytes)+","+std::to_string(stride)+","+
                 std::to_string(page_span)+","+(huge?"1":"0")+","+std::to_string(R)+","+
-                std::to_string(sec)+","+std::to_string(gbps));
+                std::to_string(kr.sec)+","+std::to_string(gbps)+","+
+                ktype_name(type)+","+(type==KType::SAXPY ? "seq" : idist_name(spec.dist))+","+
+                std::to_string(size_t(kr.accesses))+","+std::to_string(ns)+pc.csv_values());
   }
   csv.print();
+  arena_free(xa);
+  if (need_y) arena_free(ya);
 }
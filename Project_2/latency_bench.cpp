@@ -3,76 +3,450 @@
 #include <vector>
 #include <random>
 #include <algorithm>
-#include <numeric>
+#include <array>
+#include <utility>
 #include <cstdlib>
+#include <cstdio>
+#include <atomic>
+#include <map>
+#include <string>
+#include <cmath>
 
-enum class Pattern { SEQ, STRIDE, RANDOM };
-
-static void build_ring(uint64_t* idx, size_t N, Pattern pat, size_t stride_elems) {
-  std::vector<size_t> order(N);
-  if (pat == Pattern::RANDOM) {
-    std::iota(order.begin(), order.end(), 0);
-    std::mt19937_64 rng(42);
-    std::shuffle(order.begin(), order.end(), rng);
-  } else if (pat == Pattern::STRIDE) {
-    for (size_t i = 0, p = 0; i < N; ++i, p = (p + stride_elems) % N) order[i] = p;
-  } else {
-    std::iota(order.begin(), order.end(), 0);
+static constexpr size_t kMaxChains = 32;
+
+// Element index of node i's next-pointer. Line-granular nodes use their first
+// word; larger nodes put it in a pseudo-random line of the node so page-strided
+// nodes spread over cache sets instead of all colliding in one.
+static inline size_t node_elem(size_t i, size_t granule) {
+  size_t lines = granule / 64;
+  size_t line = lines > 1 ? size_t((uint64_t(i) * 0x9E3779B97F4A7C15ULL) >> 40) % lines : 0;
+  return (i * granule + line * 64) / sizeof(uint64_t);
+}
+
+size_t ring_nodes(size_t bytes, size_t granule) {
+  return std::max<size_t>(1, bytes / granule);
+}
+
+// In place, no side buffers: ring k owns nodes k, k+K, k+2K, ... and its slots
+// first hold local successor ids (Sattolo's shuffle yields a single cycle), then
+// get rewritten to element indices. Seq/stride walk the members column-wise
+// (0, s, 2s, ..., 1, 1+s, ...), which is also one cycle for any stride.
+void build_ring(uint64_t* idx, size_t bytes, size_t granule, Pattern pat, size_t strideB,
+                size_t chains, size_t* starts) {
+  const size_t n = ring_nodes(bytes, granule);
+  chains = std::clamp<size_t>(chains, 1, n);
+  const size_t step = (pat == Pattern::STRIDE) ? std::max<size_t>(1, strideB / granule) : 1;
+  std::mt19937_64 rng(42);
+  for (size_t k = 0; k < chains; ++k) {
+    const size_t c = (n - k + chains - 1) / chains;
+    auto elem = [&](size_t t) { return node_elem(k + t * chains, granule); };
+    if (pat == Pattern::RANDOM) {
+      for (size_t t = 0; t < c; ++t) idx[elem(t)] = t;
+      for (size_t t = c - 1; t > 0; --t) std::swap(idx[elem(t)], idx[elem(size_t(rng() % t))]);
+      for (size_t t = 0; t < c; ++t) idx[elem(t)] = elem(size_t(idx[elem(t)]));
+    } else {
+      size_t prev = c, first = 0;
+      for (size_t col = 0; col < std::min(step, c); ++col)
+        for (size_t t = col; t < c; t += step) {
+          if (prev < c) idx[elem(prev)] = elem(t); else first = t;
+          prev = t;
+        }
+      idx[elem(prev)] = elem(first);
+    }
+    starts[k] = elem(0);
+  }
+}
+
+// Compiler barrier that also pins `p` to a register at this point, so the
+// chase loads cannot be moved across the timestamp reads.
+#if !defined(_WIN32)
+#define CHASE_FENCE(p) asm volatile("" : "+r"(p) :: "memory")
+#else
+#define CHASE_FENCE(p) std::atomic_signal_fence(std::memory_order_seq_cst)
+#endif
+
+// `hops` dependent loads starting from p (unrolled so loop bookkeeping is
+// amortized); returns elapsed TSC cycles including one timer pair.
+static uint64_t chase_cycles(const uint64_t* idx, uint64_t& p, size_t hops) {
+  uint64_t q = p;
+  CHASE_FENCE(q);
+  uint64_t t0 = rdtscp_now();
+  size_t i = 0;
+  for (; i + 8 <= hops; i += 8) {
+    q = idx[q]; q = idx[q]; q = idx[q]; q = idx[q];
+    q = idx[q]; q = idx[q]; q = idx[q]; q = idx[q];
   }
-  for (size_t i = 0; i < N; ++i) {
-    size_t nxt = order[(i+1) % N];
-    idx[ order[i] ] = nxt;
+  for (; i < hops; ++i) q = idx[q];
+  CHASE_FENCE(q);
+  uint64_t t1 = rdtscp_now();
+  p = q;
+  return t1 - t0;
+}
+
+// Per-hop cost of the same unrolled loop with the load replaced by a register
+// dependency: what is left over once memory is taken out.
+static double loop_overhead_cycles() {
+  static const double oh = [] {
+    const size_t hops = 1u << 20;
+    double best = 1e30;
+    for (int t = 0; t < 5; ++t) {
+      uint64_t q = 0;
+      uint64_t t0 = rdtscp_now();
+      for (size_t i = 0; i < hops; i += 8) {
+        CHASE_FENCE(q); CHASE_FENCE(q); CHASE_FENCE(q); CHASE_FENCE(q);
+        CHASE_FENCE(q); CHASE_FENCE(q); CHASE_FENCE(q); CHASE_FENCE(q);
+      }
+      uint64_t t1 = rdtscp_now();
+      best = std::min(best, double(t1 - t0 - timer_overhead_cycles()) / double(hops));
+    }
+    return best;
+  }();
+  return oh;
+}
+
+// elapsed cycles for `hops` hops → corrected ns per hop
+static double hop_ns(uint64_t cycles, size_t hops) {
+  double c = (double(cycles) - double(timer_overhead_cycles())) / double(hops) - loop_overhead_cycles();
+  return cycles_to_ns(std::max(0.0, c));
+}
+
+double chase_ns(const uint64_t* idx, size_t start, size_t iters) {
+  uint64_t p = start;
+  uint64_t cyc = chase_cycles(idx, p, iters);
+  return hop_ns(cyc, iters);
+}
+
+// Same walk timed in blocks of `block` hops; every block contributes one
+// per-hop sample to `h`. Returns the mean ns per hop.
+static double chase_hist_ns(const uint64_t* idx, size_t start, size_t iters, size_t block, LogHist& h) {
+  block = std::max<size_t>(1, block);
+  uint64_t p = start;
+  double sum = 0.0;
+  size_t nblk = std::max<size_t>(1, iters / block);
+  for (size_t b = 0; b < nblk; ++b) {
+    double ns = hop_ns(chase_cycles(idx, p, block), block);
+    h.add(ns);
+    sum += ns;
   }
+  return sum / double(nblk);
 }
 
-static double chase_ns(uint64_t* idx, size_t N, size_t iters) {
-  volatile uint64_t p = 0;
-  uint64_t t0 = rdtsc_now();
-  for (size_t i = 0; i < iters; ++i) p = idx[p];
+// K independent dependent chains advanced in lock-step; the cursors stay in
+// registers (K is a compile-time constant) so the only serialization is per chain.
+template <size_t K>
+static uint64_t chase_multi_cycles(const uint64_t* idx, const size_t* starts, size_t hops) {
+  uint64_t p[K];
+  for (size_t k = 0; k < K; ++k) p[k] = starts[k];
+  // same fence + rdtscp bracket as chase_cycles, so K=1 matches the single-chain walk
+  for (size_t k = 0; k < K; ++k) CHASE_FENCE(p[k]);
+  uint64_t t0 = rdtscp_now();
+  for (size_t i = 0; i < hops; ++i)
+    for (size_t k = 0; k < K; ++k) p[k] = idx[p[k]];
+  for (size_t k = 0; k < K; ++k) CHASE_FENCE(p[k]);
   uint64_t t1 = rdtscp_now();
-  double cycles = double(t1 - t0) / double(iters);
-  // If you want exact Hz, pass CPU_HZ env (e.g., setx CPU_HZ 4200000000)
-  const char* f = std::getenv("CPU_HZ");
-  double hz = f ? std::atof(f) : 3.5e9; // fallback estimate
-  return (cycles / hz) * 1e9;
+  uint64_t sink = 0;
+  for (size_t k = 0; k < K; ++k) sink ^= p[k];
+#if !defined(_WIN32)
+  asm volatile(""::"r"(sink):"memory");
+#else
+  volatile uint64_t keep = sink; (void)keep;
+#endif
+  return t1 - t0;
+}
+
+using ChaseMultiFn = uint64_t (*)(const uint64_t*, const size_t*, size_t);
+
+template <size_t... Ks>
+static constexpr std::array<ChaseMultiFn, sizeof...(Ks)> make_chase_table(std::index_sequence<Ks...>) {
+  return { &chase_multi_cycles<Ks+1>... };
+}
+static constexpr auto kChaseTable = make_chase_table(std::make_index_sequence<kMaxChains>{});
+
+static const char* pattern_name(Pattern pat) {
+  return pat==Pattern::RANDOM?"random":pat==Pattern::STRIDE?"stride":"seq";
 }
 
+// One arena sized for the largest point, prefaulted once; every working set in
+// the sweep is rebuilt in place over its prefix.
+struct SweepArena {
+  Arena a;
+  SweepArena(size_t max_bytes, bool huge) {
+    a = arena_alloc(max_bytes, huge ? PageBacking::THP : PageBacking::DEFAULT);
+    if (!a.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", max_bytes); std::exit(1); }
+    touch_memory(a.ptr, a.bytes);
+  }
+  ~SweepArena() { arena_free(a); }
+  uint64_t* idx() const { return reinterpret_cast<uint64_t*>(a.ptr); }
+};
+
+// Mean latency per working set; with `block` > 0 the walk is also timed in
+// blocks and the per-block histogram adds p50/p90/p99/p99.9 columns.
 static void do_latency_size_sweep(size_t min_kb, size_t max_mb, Pattern pat, size_t strideB,
-                                  size_t iters, int cpu, int reps) {
+                                  size_t iters, int cpu, int reps, size_t block,
+                                  size_t granule, bool huge, PerfCounters& pc) {
   pin_to_cpu(cpu);
+  std::fprintf(stderr, "# tsc_hz=%.0f timer_overhead_cyc=%llu loop_overhead_cyc=%.3f granule_B=%zu\n",
+               tsc_hz(), (unsigned long long)timer_overhead_cycles(), loop_overhead_cycles(), granule);
   CSV csv;
-  csv.set_header("bytes,pattern,stride_B,iter,repetition,lat_ns_est");
+  csv.set_header(std::string(block ? "bytes,pattern,stride_B,iter,repetition,lat_ns_est,p50_ns,p90_ns,p99_ns,p999_ns"
+                                   : "bytes,pattern,stride_B,iter,repetition,lat_ns_est") + pc.csv_header());
+  SweepArena arena(max_mb*1024ULL*1024ULL, huge);
+  uint64_t* buf = arena.idx();
   for (size_t sz = min_kb*1024ULL; sz <= max_mb*1024ULL*1024ULL; sz <<= 1) {
-    size_t N = std::max<size_t>(4, sz / sizeof(uint64_t));
-    std::vector<uint64_t> buf(N);
-    size_t stride_elems = std::max<size_t>(1, strideB / sizeof(uint64_t));
-    build_ring(buf.data(), N, pat, stride_elems);
-    touch_memory(buf.data(), sz); // prefault
+    size_t start;
+    build_ring(buf, sz, granule, pat, strideB, 1, &start);
     for (int r=0; r<reps; ++r) {
-      double ns = chase_ns(buf.data(), N, iters);
+      if (block) {
+        LogHist h;
+        pc.start();
+        double ns = chase_hist_ns(buf, start, iters, block, h);
+        pc.stop();
+        csv.add_row(std::to_string(sz) + "," +
+                    pattern_name(pat) + "," +
+                    std::to_string(strideB) + "," +
+                    std::to_string(iters) + "," +
+                    std::to_string(r) + "," +
+                    std::to_string(ns) + "," +
+                    std::to_string(h.quantile(0.50)) + "," +
+                    std::to_string(h.quantile(0.90)) + "," +
+                    std::to_string(h.quantile(0.99)) + "," +
+                    std::to_string(h.quantile(0.999)) + pc.csv_values());
+        continue;
+      }
+      pc.start();
+      double ns = chase_ns(buf, start, iters);
+      pc.stop();
       csv.add_row(std::to_string(sz) + "," +
-                  (pat==Pattern::RANDOM?"random":pat==Pattern::STRIDE?"stride":"seq") + "," +
+                  pattern_name(pat) + "," +
                   std::to_string(strideB) + "," +
                   std::to_string(iters) + "," +
                   std::to_string(r) + "," +
-                  std::to_string(ns));
+                  std::to_string(ns) + pc.csv_values());
+    }
+  }
+  csv.print();
+}
+
+// Memory-level parallelism sweep: for every working set, walk K=1..max_chains
+// interleaved rings. `iters` is the total hop budget, split evenly over chains.
+// lat_ns_est is the per-hop latency seen by one chain, ns_per_access the
+// aggregate service time, and mlp_eff = lat(K=1) / ns_per_access(K), i.e. the
+// number of misses effectively overlapped (Little's law).
+static void do_latency_mlp_sweep(size_t min_kb, size_t max_mb, Pattern pat, size_t strideB,
+                                 size_t iters, int cpu, int reps, size_t max_chains,
+                                 size_t granule, bool huge, PerfCounters& pc) {
+  pin_to_cpu(cpu);
+  max_chains = std::clamp<size_t>(max_chains, 1, kMaxChains);
+  CSV csv;
+  csv.set_header("bytes,pattern,stride_B,chains,iter,repetition,lat_ns_est,ns_per_access,mlp_eff" + pc.csv_header());
+  SweepArena arena(max_mb*1024ULL*1024ULL, huge);
+  uint64_t* buf = arena.idx();
+  for (size_t sz = min_kb*1024ULL; sz <= max_mb*1024ULL*1024ULL; sz <<= 1) {
+    const size_t nodes = ring_nodes(sz, granule);
+    std::vector<double> lat1(size_t(std::max(0, reps)), 0.0);
+    size_t starts[kMaxChains];
+    for (size_t K = 1; K <= max_chains && K <= nodes; ++K) {
+      build_ring(buf, sz, granule, pat, strideB, K, starts);
+      size_t hops = std::max<size_t>(1, iters / K);
+      for (int r=0; r<reps; ++r) {
+        pc.start();
+        uint64_t cyc = kChaseTable[K-1](buf, starts, hops);
+        pc.stop();
+        double lat_ns = hop_ns(cyc, hops);
+        double acc_ns = lat_ns / double(K);
+        if (K == 1) lat1[r] = lat_ns;
+        double mlp = acc_ns > 0.0 ? lat1[r] / acc_ns : 0.0;
+        csv.add_row(std::to_string(sz) + "," +
+                    pattern_name(pat) + "," +
+                    std::to_string(strideB) + "," +
+                    std::to_string(K) + "," +
+                    std::to_string(hops * K) + "," +
+                    std::to_string(r) + "," +
+                    std::to_string(lat_ns) + "," +
+                    std::to_string(acc_ns) + "," +
+                    std::to_string(mlp) + pc.csv_values());
+      }
+    }
+  }
+  csv.print();
+}
+
+// ---------- adaptive working-set sweep ----------
+// Coarse pass on the doubling grid plus every data/unified cache size from
+// cache_geometry(); then any neighbouring pair whose median latencies differ by
+// more than `tol` is split at its geometric midpoint until the pair is closer
+// than `resolution` (ratio) or `max_points` sizes have been measured. Plateaus
+// cost a handful of points; knees end up resolved to a few percent.
+
+struct WsTransition {
+  size_t from_B, to_B, mid_B;     // last point of the lower plateau, first of the upper, midpoint crossing
+  double lat_lo, lat_hi;
+};
+
+// Plateau/ramp segmentation of a sorted (size, median ns) curve. A ramp starts
+// when latency leaves the current plateau floor by more than `tol`; it ends at
+// the first point that everything up to twice its size stays within `tol` of
+// (a window in size, so refined regions do not split one ramp in two). The
+// transition size is where the curve crosses the geometric mean of the levels.
+static std::vector<WsTransition> find_transitions(const std::vector<std::pair<size_t,double>>& c, double tol) {
+  auto flat_from = [&](size_t k) {
+    for (size_t j = k + 1; j < c.size() && c[j].first <= 2 * c[k].first; ++j)
+      if (c[j].second > c[k].second * (1.0 + tol)) return false;
+    return true;
+  };
+  std::vector<WsTransition> out;
+  size_t i = 0;
+  while (i + 1 < c.size()) {
+    double level = c[i].second;
+    size_t e = i;
+    while (e + 1 < c.size() && c[e+1].second <= level * (1.0 + tol)) level = std::min(level, c[++e].second);
+    if (e + 1 >= c.size()) break;
+    size_t k = e + 1;
+    while (k + 1 < c.size() && !flat_from(k)) ++k;
+    WsTransition t{c[e].first, c[k].first, c[k].first, c[e].second, c[k].second};
+    const double target = std::sqrt(t.lat_lo * t.lat_hi);
+    for (size_t j = e; j < k; ++j) {
+      if (c[j].second <= target && c[j+1].second >= target) {
+        double f = (target - c[j].second) / std::max(1e-9, c[j+1].second - c[j].second);
+        double lx = std::log(double(c[j].first)) + f * (std::log(double(c[j+1].first)) - std::log(double(c[j].first)));
+        t.mid_B = size_t(std::exp(lx));
+        break;
+      }
+    }
+    out.push_back(t);
+    i = k;
+  }
+  return out;
+}
+
+static void do_latency_adaptive_sweep(size_t min_kb, size_t max_mb, Pattern pat, size_t strideB,
+                                      size_t iters, int cpu, int reps, size_t granule, bool huge,
+                                      double tol, double resolution, size_t max_points,
+                                      const std::string& transitions_path, PerfCounters& pc) {
+  pin_to_cpu(cpu);
+  const size_t lo = std::max(min_kb*1024ULL, 2ULL*granule), hi = max_mb*1024ULL*1024ULL;
+  std::vector<CacheLevel> caches;
+  for (auto& c : cache_geometry()) if (c.type != "Instruction" && c.size) caches.push_back(c);
+  for (auto& c : caches)
+    std::fprintf(stderr, "# cache L%d %s %zu B, %zu-way, line %zu, shared by %d cpus\n",
+                 c.level, c.type.c_str(), c.size, c.ways, c.line, c.shared_cpus);
+
+  CSV csv;
+  csv.set_header("bytes,pattern,stride_B,iter,repetition,lat_ns_est" + pc.csv_header());
+  SweepArena arena(hi, huge);
+  uint64_t* buf = arena.idx();
+  std::map<size_t, double> med;                       // size -> median ns
+  std::map<size_t, std::vector<std::string>> rows;    // emitted in size order
+
+  auto measure = [&](size_t sz) {
+    sz = std::max(lo, std::min(hi, sz / granule * granule));
+    if (med.count(sz)) return;
+    size_t start;
+    build_ring(buf, sz, granule, pat, strideB, 1, &start);
+    std::vector<double> v;
+    for (int r=0; r<reps; ++r) {
+      pc.start();
+      double ns = chase_ns(buf, start, iters);
+      pc.stop();
+      v.push_back(ns);
+      rows[sz].push_back(std::to_string(sz) + "," +
+                         pattern_name(pat) + "," +
+                         std::to_string(strideB) + "," +
+                         std::to_string(iters) + "," +
+                         std::to_string(r) + "," +
+                         std::to_string(ns) + pc.csv_values());
+    }
+    std::sort(v.begin(), v.end());
+    med[sz] = v.empty() ? 0.0 : v[v.size()/2];
+  };
+
+  for (size_t sz = lo; sz <= hi; sz <<= 1) measure(sz);
+  for (auto& c : caches) if (c.size >= lo && c.size <= hi) measure(c.size);
+  const size_t coarse = med.size();
+
+  while (med.size() < max_points) {
+    std::vector<size_t> split;
+    for (auto it = med.begin(), nx = std::next(it); nx != med.end(); ++it, ++nx) {
+      double a = it->second, b = nx->second;
+      bool steep = std::max(a, b) > std::min(a, b) * (1.0 + tol);
+      if (steep && double(nx->first) > double(it->first) * resolution)
+        split.push_back(size_t(std::sqrt(double(it->first) * double(nx->first))));
     }
+    size_t before = med.size();
+    for (size_t sz : split) {
+      if (med.size() >= max_points) break;
+      measure(sz);
+    }
+    if (med.size() == before) break;   // nothing left to refine at this granularity
   }
+  std::fprintf(stderr, "# adaptive: %zu coarse + %zu refined points (tol=%.3f, resolution=%.4f)\n",
+               coarse, med.size() - coarse, tol, resolution);
+
+  for (auto& kv : rows) for (auto& r : kv.second) csv.add_row(r);
   csv.print();
+
+  std::vector<std::pair<size_t,double>> curve(med.begin(), med.end());
+  CSV tr;
+  tr.set_header("level,cache_B,from_B,to_B,transition_B,lat_lo_ns,lat_hi_ns");
+  std::vector<bool> used(caches.size(), false);
+  for (auto& t : find_transitions(curve, tol)) {
+    // nearest unclaimed cache size within a factor of 3 names the level
+    int best = -1;
+    double bestd = std::log(3.0);
+    for (size_t k = 0; k < caches.size(); ++k) {
+      double d = std::fabs(std::log(double(t.mid_B) / double(caches[k].size)));
+      if (!used[k] && d < bestd) { bestd = d; best = int(k); }
+    }
+    std::string level = "?";
+    size_t cache_B = 0;
+    if (best >= 0) {
+      used[size_t(best)] = true;
+      level = "L" + std::to_string(caches[size_t(best)].level);
+      cache_B = caches[size_t(best)].size;
+    }
+    std::fprintf(stderr, "# transition %s: %zu B (%zu..%zu B, %.2f -> %.2f ns; sysfs %zu B)\n",
+                 level.c_str(), t.mid_B, t.from_B, t.to_B, t.lat_lo, t.lat_hi, cache_B);
+    tr.add_row(level + "," + std::to_string(cache_B) + "," +
+               std::to_string(t.from_B) + "," + std::to_string(t.to_B) + "," +
+               std::to_string(t.mid_B) + "," +
+               std::to_string(t.lat_lo) + "," + std::to_string(t.lat_hi));
+  }
+  if (!transitions_path.empty()) tr.write(transitions_path);
 }
 
 void run_latency_bench(int argc, char** argv) {
   size_t min_kb = 8, max_mb = 1024; // 8KB→1GB
   size_t strideB = 64;
   size_t iters = 10'000'000;
+  size_t chains = 0;                // 0 = classic single-chain sweep
+  size_t block = 0;                 // >0: per-block samples → latency percentiles
+  size_t granule = 64;              // bytes per ring node: 64 = line, 4096 = page
+  bool huge = false;                // back the arena with transparent huge pages
+  bool adaptive = false;            // coarse pass + bisection around latency steps
+  double tol = 0.15;                // relative latency change that counts as a step
+  double resolution = 1.05;         // stop splitting once neighbours are this close (ratio)
+  size_t max_points = 64;
+  std::string transitions;          // adaptive: detected transitions CSV
   int cpu = -1, reps = 3;
   Pattern pat = Pattern::RANDOM;
+  std::string counters;             // e.g. cycles,instructions,cache-misses
 
   for (int i=1; i<argc; ) {
     if (parse_szt(i,argc,argv,"--min_kb", min_kb)) {}
     else if (parse_szt(i,argc,argv,"--max_mb", max_mb)) {}
     else if (parse_szt(i,argc,argv,"--stride", strideB)) {}
     else if (parse_szt(i,argc,argv,"--iters", iters)) {}
+    else if (parse_szt(i,argc,argv,"--chains", chains)) {}
+    else if (parse_szt(i,argc,argv,"--hist_block", block)) {}
+    else if (parse_szt(i,argc,argv,"--granule", granule)) {}
+    else if (parse_str(i,argc,argv,"--counters", counters)) {}
+    else if (parse_flag(i,argc,argv,"--huge")) huge = true;
+    else if (parse_flag(i,argc,argv,"--adaptive")) adaptive = true;
+    else if (parse_dbl(i,argc,argv,"--tol", tol)) {}
+    else if (parse_dbl(i,argc,argv,"--resolution", resolution)) {}
+    else if (parse_szt(i,argc,argv,"--max_points", max_points)) {}
+    else if (parse_str(i,argc,argv,"--transitions", transitions)) {}
+    else if (parse_flag(i,argc,argv,"--hist")) { if (!block) block = 32; }
     else if (parse_int(i,argc,argv,"--cpu", cpu)) {}
     else if (parse_int(i,argc,argv,"--reps", reps)) {}
     else if (parse_flag(i,argc,argv,"--pattern=seq")) pat = Pattern::SEQ;
@@ -81,5 +455,19 @@ void run_latency_bench(int argc, char** argv) {
     else ++i;
   }
 
-  do_latency_size_sweep(min_kb, max_mb, pat, strideB, iters, cpu, reps);
+  if (granule < 64 || (granule & (granule - 1))) {
+    std::fprintf(stderr, "--granule must be a power of two >= 64 (got %zu)\n", granule);
+    std::exit(1);
+  }
+
+  PerfCounters pc;
+  if (!counters.empty()) pc.open(counters);
+
+  if (adaptive) {
+    do_latency_adaptive_sweep(min_kb, max_mb, pat, strideB, iters, cpu, reps, granule, huge,
+                              tol, std::max(1.001, resolution), max_points, transitions, pc);
+    return;
+  }
+  if (chains > 0) do_latency_mlp_sweep(min_kb, max_mb, pat, strideB, iters, cpu, reps, chains, granule, huge, pc);
+  else            do_latency_size_sweep(min_kb, max_mb, pat, strideB, iters, cpu, reps, block, granule, huge, pc);
 }
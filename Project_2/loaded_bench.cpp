@@ -0,0 +1,165 @@
+// src/loaded_bench.cpp
+#include "util.h"
+#include <vector>
+#include <thread>
+#include <atomic>
+#include <string>
+#include <cstdint>
+#include <algorithm>
+
+// Loaded latency (MLC-style): one pinned thread walks a DRAM-sized pointer ring
+// while N traffic threads stream over their own slices with a tunable delay
+// injected after every cache line. Sweeping the delay from large to zero walks
+// the bandwidth/latency curve from idle to saturation.
+
+enum class Mix { R, W, R70W30, R50W50 };
+
+struct alignas(64) TrafficCounter {
+  std::atomic<uint64_t> bytes{0};
+};
+
+// Same traffic model as bw: a read moves one line, a write RFO + writeback.
+static inline uint64_t line_bytes(bool write) { return write ? 128 : 64; }
+
+static inline bool is_write(Mix m, size_t line) {
+  switch (m) {
+    case Mix::R:      return false;
+    case Mix::W:      return true;
+    case Mix::R70W30: return (line % 10) >= 7;
+    case Mix::R50W50: return (line & 1) == 0;
+  }
+  return false;
+}
+
+static inline void spin_delay(unsigned n) {
+  for (unsigned d = 0; d < n; ++d) {
+#if !defined(_WIN32)
+    asm volatile("");
+#else
+    std::atomic_signal_fence(std::memory_order_seq_cst);
+#endif
+  }
+}
+
+static void traffic_fn(uint8_t* base, size_t bytes, Mix mix, unsigned delay,
+                       const std::atomic<bool>& stop, TrafficCounter& out) {
+  const size_t lines = bytes / 64;
+  uint64_t sink = 0, local = 0;
+  while (!stop.load(std::memory_order_relaxed)) {
+    for (size_t l = 0; l < lines; ++l) {
+      uint64_t* p = reinterpret_cast<uint64_t*>(base + l*64);
+      bool w = is_write(mix, l);
+      if (w) *p = l; else sink += *p;
+      local += line_bytes(w);
+      spin_delay(delay);
+      if ((l & 63) == 63) {
+        out.bytes.store(local, std::memory_order_relaxed);
+        if (stop.load(std::memory_order_relaxed)) break;
+      }
+    }
+  }
+  out.bytes.store(local, std::memory_order_relaxed);
+#if !defined(_WIN32)
+  asm volatile(""::"r"(sink):"memory");
+#else
+  volatile uint64_t keep = sink; (void)keep;
+#endif
+}
+
+static uint64_t total_bytes(const std::vector<TrafficCounter>& c) {
+  uint64_t s = 0;
+  for (auto& x : c) s += x.bytes.load(std::memory_order_relaxed);
+  return s;
+}
+
+void run_loaded_bench(int argc, char** argv) {
+  size_t bytes    = 1ULL<<30;   // traffic region, split across traffic threads
+  size_t probe_mb = 256;        // probe ring; keep well above LLC
+  size_t iters    = 2'000'000;  // probe hops per point
+  size_t warm_ms  = 50;
+  int    threads  = int(std::max(1u, std::thread::hardware_concurrency()) - 1);
+  int    cpu      = 0;          // probe core
+  int    cpu0     = -1;         // first traffic core (-1 = cpu+1)
+  int    reps     = 3;
+  unsigned max_delay = 4096;    // spin iterations per line at the idle end
+  Mix    mix = Mix::R;
+
+  for (int i=1; i<argc; ) {
+    if      (parse_szt (i,argc,argv,"--bytes",    bytes)) {}
+    else if (parse_szt (i,argc,argv,"--probe_mb", probe_mb)) {}
+    else if (parse_szt (i,argc,argv,"--iters",    iters)) {}
+    else if (parse_szt (i,argc,argv,"--warm_ms",  warm_ms)) {}
+    else if (parse_int (i,argc,argv,"--threads",  threads)) {}
+    else if (parse_int (i,argc,argv,"--cpu",      cpu)) {}
+    else if (parse_int (i,argc,argv,"--cpu0",     cpu0)) {}
+    else if (parse_int (i,argc,argv,"--reps",     reps)) {}
+    else if (parse_uint(i,argc,argv,"--max_delay",max_delay)) {}
+    else if (parse_flag(i,argc,argv,"--100R"))  { mix = Mix::R; }
+    else if (parse_flag(i,argc,argv,"--100W"))  { mix = Mix::W; }
+    else if (parse_flag(i,argc,argv,"--70R30W")){ mix = Mix::R70W30; }
+    else if (parse_flag(i,argc,argv,"--50R50W")){ mix = Mix::R50W50; }
+    else ++i;
+  }
+  threads = std::max(0, threads);
+  if (cpu0 < 0) cpu0 = (cpu < 0 ? -1 : cpu + 1);
+  const char* mixstr =
+    (mix==Mix::R? "100R" : mix==Mix::W? "100W" : mix==Mix::R70W30? "70R30W" : "50R50W");
+
+  pin_to_cpu(cpu);
+
+  size_t probe_bytes = probe_mb*1024ULL*1024ULL;
+  Arena ring = arena_alloc(probe_bytes);
+  if (!ring.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", probe_bytes); return; }
+  touch_memory(ring.ptr, ring.bytes);
+  uint64_t* idx = reinterpret_cast<uint64_t*>(ring.ptr);
+  size_t start;
+  build_ring(idx, probe_bytes, 64, Pattern::RANDOM, 0, 1, &start);
+
+  std::vector<uint8_t> buf(bytes);
+  touch_memory(buf.data(), bytes);
+  size_t chunk = threads > 0 ? (bytes / size_t(threads)) & ~size_t(63) : 0;
+
+  // idle point first (no traffic threads), then delays max_delay, /2, ..., 1, 0
+  std::vector<long> delays{-1};
+  for (unsigned d = max_delay; d > 0; d >>= 1) delays.push_back(long(d));
+  delays.push_back(0);
+
+  CSV csv;
+  csv.set_header("threads,inject_delay,rw,repetition,throughput_GBs,loaded_latency_ns,run_id");
+
+  for (long delay : delays) {
+    int T = (delay < 0) ? 0 : threads;
+    for (int R=0; R<reps; ++R) {
+      std::atomic<bool> stop{false};
+      std::vector<TrafficCounter> cnt(size_t(std::max(1, T)));
+      std::vector<std::thread> th;
+      for (int k=0; k<T; ++k) {
+        th.emplace_back([&,k](){
+          pin_to_cpu(cpu0 < 0 ? -1 : (cpu0 + k));
+          traffic_fn(buf.data() + size_t(k)*chunk, chunk, mix, unsigned(delay), stop, cnt[k]);
+        });
+      }
+      if (T > 0) std::this_thread::sleep_for(std::chrono::milliseconds(warm_ms));
+
+      uint64_t b0 = total_bytes(cnt);
+      Timer t; t.start();
+      double lat_ns = chase_ns(idx, start, iters);
+      double sec = t.stop_s();
+      uint64_t b1 = total_bytes(cnt);
+
+      stop.store(true);
+      for (auto& x : th) x.join();
+
+      double gbps = sec > 0.0 ? (double(b1 - b0) / sec) / 1e9 : 0.0;
+      csv.add_row(std::to_string(T)+","+
+                  std::to_string(std::max(0L, delay))+","+
+                  mixstr+","+
+                  std::to_string(R)+","+
+                  std::to_string(gbps)+","+
+                  std::to_string(lat_ns)+","+
+                  std::to_string(R+1));
+    }
+  }
+  csv.print();
+  arena_free(ring);
+}
@@ -7,14 +7,26 @@
 void run_latency_bench(int argc, char** argv);
 void run_bandwidth_bench(int argc, char** argv);
 void run_kernel_bench(int argc, char** argv);
+void run_loaded_bench(int argc, char** argv);
+void run_tlb_bench(int argc, char** argv);
+void run_c2c_bench(int argc, char** argv);
+void run_contention_bench(int argc, char** argv);
+void run_vec_bench(int argc, char** argv);
+void run_calib_bench(int argc, char** argv);
 
 static void usage() {
     puts(
       "memlab — Memory hierarchy experiments\n"
       "Usage:\n"
-      "  memlab latency   [options]   # zero-queue, working-set\n"
-      "  memlab bw        [options]   # pattern×stride×RW, intensity\n"
-      "  memlab kernel    [options]   # cache/TLB impact using SAXPY\n"
+      "  memlab latency   [options]   # zero-queue, working-set; --hist for p50..p99.9; --chains=K for MLP; --granule 64|4096; --adaptive\n"
+      "  memlab bw        [options]   # pattern×stride×RW, intensity; --kernel=load|store|copy|triad [--nt] [--prefetch_distance 0,8,..]\n"
+      "  memlab kernel    [options]   # cache/TLB impact: SAXPY, --type=gather|scatter|spmv|hashprobe --dist=uniform|zipf|clustered\n"
+      "  memlab loaded    [options]   # loaded latency vs injected traffic (MLC-style)\n"
+      "  memlab tlb       [options]   # TLB reach: pages touched x 4k|thp|2m|1g backing → tlb_kernel_perf.csv\n"
+      "  memlab c2c       [options]   # core-to-core cache-line ping-pong matrix; --mode=cas|flag --cpus=0-7\n"
+      "  memlab contention [options]  # victim chase/stream vs K aggressors on other cores, by footprint\n"
+      "  memlab vec       [options]   # Project 1 kernels x SCALAR|AUTO|AVX2|AVX512; --sweep=locality,..,scaling,blocked|all; --tuned stencil\n"
+      "  memlab calib     [options]   # machine profile: FMA peak per dtype x mode, L1/L2/LLC/DRAM read ceilings\n"
       "\nCommon tips: pin with --cpu=N; repeat with --reps=K; CSV to stdout.\n"
     );
 }
@@ -24,6 +36,12 @@ int main(int argc, char** argv) {
     if      (!strcmp(argv[1], "latency"))  run_latency_bench(argc-1, argv+1);
     else if (!strcmp(argv[1], "bw"))       run_bandwidth_bench(argc-1, argv+1);
     else if (!strcmp(argv[1], "kernel"))   run_kernel_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "loaded"))   run_loaded_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "tlb"))      run_tlb_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "c2c"))      run_c2c_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "contention")) run_contention_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "vec"))      run_vec_bench(argc-1, argv+1);
+    else if (!strcmp(argv[1], "calib"))    run_calib_bench(argc-1, argv+1);
     else usage();
     return 0;
 }
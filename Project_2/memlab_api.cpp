@@ -0,0 +1,106 @@
+// src/memlab_api.cpp
+#include "memlab_api.h"
+#include "util.h"
+#include <algorithm>
+
+// What the arena currently holds, so repeated calls with the same
+// configuration skip re-initialisation (ring rebuild, triad/saxpy fill).
+enum class Contents { RAW, RING, TRIAD, SAXPY };
+
+struct memlab_arena {
+  Arena    mem;
+  int      cpu = -1;
+  Contents contents = Contents::RAW;
+  size_t   ring_ws = 0, ring_stride = 0, ring_granule = 0, ring_start = 0;
+  int      ring_pattern = -1;
+  size_t   saxpy_ws = 0;
+};
+
+extern "C" {
+
+memlab_arena* memlab_arena_create(size_t bytes, int backing, int cpu) {
+  if (backing < 0 || backing > int(PageBacking::HUGE_1G)) return nullptr;
+  pin_to_cpu(cpu);
+  Arena m = arena_alloc(bytes, static_cast<PageBacking>(backing));
+  if (!m.ptr) return nullptr;
+  touch_memory(m.ptr, m.bytes);
+  auto* a = new memlab_arena;
+  a->mem = m;
+  a->cpu = cpu;
+  return a;
+}
+
+void memlab_arena_destroy(memlab_arena* a) {
+  if (!a) return;
+  arena_free(a->mem);
+  delete a;
+}
+
+size_t memlab_arena_bytes(const memlab_arena* a) { return a ? a->mem.bytes : 0; }
+
+size_t memlab_arena_anon_huge_bytes(const memlab_arena* a) { return a ? anon_huge_bytes(a->mem.ptr) : 0; }
+
+double memlab_tsc_hz(void) { return tsc_hz(); }
+
+const char* memlab_isa(void) { return vector_isa(); }
+
+double memlab_latency_ns(memlab_arena* a, size_t ws_bytes, int pattern,
+                         size_t stride_B, size_t granule, size_t iters) {
+  if (!a || ws_bytes == 0 || ws_bytes > a->mem.bytes || pattern < 0 || pattern > 2) return -1.0;
+  if (granule < 64 || (granule & (granule - 1))) return -1.0;
+  const bool same = a->contents == Contents::RING && a->ring_ws == ws_bytes &&
+                    a->ring_pattern == pattern && a->ring_stride == stride_B && a->ring_granule == granule;
+  uint64_t* idx = reinterpret_cast<uint64_t*>(a->mem.ptr);
+  if (!same) {
+    build_ring(idx, ws_bytes, granule, static_cast<Pattern>(pattern), stride_B, 1, &a->ring_start);
+    a->contents = Contents::RING;
+    a->ring_ws = ws_bytes; a->ring_pattern = pattern;
+    a->ring_stride = stride_B; a->ring_granule = granule;
+  }
+  return chase_ns(idx, a->ring_start, iters);
+}
+
+double memlab_bw_gbps(memlab_arena* a, size_t bytes, int threads, int cpu0,
+                      size_t stride, int rw, int random, int kernel, int nt,
+                      size_t iters, int rep) {
+  if (!a || bytes == 0 || bytes > a->mem.bytes || threads < 1) return -1.0;
+  if (rw < 0 || rw > int(RW::R50W50) || kernel < 0 || kernel > int(Kernel::TRIAD)) return -1.0;
+  BwPoint p;
+  p.bytes = bytes; p.stride = stride; p.iters = iters;
+  p.threads = threads; p.cpu0 = cpu0;
+  p.rw = static_cast<RW>(rw);
+  p.random = random != 0;
+  p.kernel = static_cast<Kernel>(kernel);
+  p.nt = nt != 0;
+  if (p.kernel == Kernel::TRIAD && a->contents != Contents::TRIAD) {
+    // keep operands normal doubles (leftover ring indices would decode as denormals)
+    double* d = reinterpret_cast<double*>(a->mem.ptr);
+    for (size_t k = 0; k < a->mem.bytes / sizeof(double); ++k) d[k] = 1.0;
+    a->contents = Contents::TRIAD;
+  } else if (p.kernel != Kernel::TRIAD && p.kernel != Kernel::LOAD && !(p.kernel == Kernel::TOUCH && p.rw == RW::R)) {
+    a->contents = Contents::RAW;   // writes clobber whatever was there
+  }
+  return bw_gbps(a->mem.ptr, p, rep);
+}
+
+int memlab_saxpy(memlab_arena* a, size_t ws_bytes, size_t stride, size_t iters,
+                 double* sec, double* gbps) {
+  if (!a || ws_bytes == 0 || 2 * ws_bytes > a->mem.bytes) return -1;
+  const size_t n = ws_bytes / sizeof(float);
+  float* x = reinterpret_cast<float*>(a->mem.ptr);
+  float* y = reinterpret_cast<float*>(a->mem.ptr + ws_bytes);
+  if (a->contents != Contents::SAXPY || a->saxpy_ws != ws_bytes) {
+    for (size_t i=0;i<n;++i){ x[i]=1.0f; y[i]=0.5f; }
+    a->contents = Contents::SAXPY;
+    a->saxpy_ws = ws_bytes;
+  }
+  stride = std::max<size_t>(1, stride);
+  double s = saxpy_seconds(2.0f, x, y, n, stride, iters);
+  double elemtouched = double((n + stride - 1)/stride) * stride;
+  double bytes_moved = double(iters) * elemtouched * 2 * sizeof(float);
+  if (sec)  *sec  = s;
+  if (gbps) *gbps = s > 0.0 ? (bytes_moved / s) / 1e9 : 0.0;
+  return 0;
+}
+
+} // extern "C"
@@ -0,0 +1,53 @@
+// src/memlab_api.h
+// C entry points for libmemlab (shared library build of the memlab engines).
+// One arena is mapped, pinned and prefaulted once; every call then measures a
+// single point inside it, so a whole sweep runs in one process without
+// re-faulting memory between points. See scripts/memlab.py for the binding.
+#pragma once
+#include <stddef.h>
+
+#if defined(_WIN32)
+  #define MEMLAB_API __declspec(dllexport)
+#else
+  #define MEMLAB_API __attribute__((visibility("default")))
+#endif
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+typedef struct memlab_arena memlab_arena;
+
+// backing: 0 default, 1 4k, 2 thp, 3 2m (hugetlb), 4 1g (hugetlb).
+// cpu >= 0 pins the calling thread before prefaulting (first touch on that node).
+// Returns NULL if the mapping fails.
+MEMLAB_API memlab_arena* memlab_arena_create(size_t bytes, int backing, int cpu);
+MEMLAB_API void          memlab_arena_destroy(memlab_arena* a);
+MEMLAB_API size_t        memlab_arena_bytes(const memlab_arena* a);
+MEMLAB_API size_t        memlab_arena_anon_huge_bytes(const memlab_arena* a);
+
+MEMLAB_API double        memlab_tsc_hz(void);
+MEMLAB_API const char*   memlab_isa(void);   // widest vector ISA the library was built for
+
+// Pointer chase over the first ws_bytes: pattern 0 seq, 1 stride, 2 random.
+// The ring is only rebuilt when the configuration (or arena contents) changed.
+// Returns mean ns per dependent hop; <0 on bad arguments.
+MEMLAB_API double memlab_latency_ns(memlab_arena* a, size_t ws_bytes, int pattern,
+                                    size_t stride_B, size_t granule, size_t iters);
+
+// One fixed-iteration bw repetition over the first `bytes`, same semantics as
+// `memlab bw`: rw 0 100R, 1 100W, 2 70R30W, 3 50R50W; kernel 0 touch, 1 load,
+// 2 store, 3 copy, 4 triad. Returns aggregate GB/s; <0 on bad arguments.
+MEMLAB_API double memlab_bw_gbps(memlab_arena* a, size_t bytes, int threads, int cpu0,
+                                 size_t stride, int rw, int random, int kernel, int nt,
+                                 size_t iters, int rep);
+
+// SAXPY over two ws_bytes halves of the arena (x then y). Writes elapsed
+// seconds and effective GB/s (the `memlab kernel` formula). Returns 0 on
+// success, -1 if 2*ws_bytes does not fit.
+MEMLAB_API int memlab_saxpy(memlab_arena* a, size_t ws_bytes, size_t stride, size_t iters,
+                            double* sec, double* gbps);
+
+#ifdef __cplusplus
+}
+#endif
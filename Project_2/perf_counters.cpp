@@ -0,0 +1,164 @@
+// src/perf_counters.cpp
+#include "util.h"
+#include <cstring>
+#include <cstdio>
+#include <cerrno>
+
+#ifdef __linux__
+  #include <linux/perf_event.h>
+  #include <sys/ioctl.h>
+  #include <sys/syscall.h>
+  #include <unistd.h>
+#endif
+
+namespace {
+
+struct EventSpec { const char* name; uint32_t type; uint64_t config; };
+
+#ifdef __linux__
+constexpr uint64_t hw_cache(uint64_t id, uint64_t op, uint64_t res) { return id | (op << 8) | (res << 16); }
+
+const EventSpec kEvents[] = {
+  {"cycles",                  PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES},
+  {"cpu-cycles",              PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES},
+  {"instructions",            PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS},
+  {"cache-references",        PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_REFERENCES},
+  {"cache-misses",            PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES},
+  {"branches",                PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_INSTRUCTIONS},
+  {"branch-misses",           PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_MISSES},
+  {"ref-cycles",              PERF_TYPE_HARDWARE, PERF_COUNT_HW_REF_CPU_CYCLES},
+  {"stalled-cycles-frontend", PERF_TYPE_HARDWARE, PERF_COUNT_HW_STALLED_CYCLES_FRONTEND},
+  {"stalled-cycles-backend",  PERF_TYPE_HARDWARE, PERF_COUNT_HW_STALLED_CYCLES_BACKEND},
+  {"L1-dcache-loads",         PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_L1D,  PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_ACCESS)},
+  {"L1-dcache-load-misses",   PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_L1D,  PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"LLC-loads",               PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_LL,   PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_ACCESS)},
+  {"LLC-load-misses",         PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_LL,   PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"LLC-stores",              PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_LL,   PERF_COUNT_HW_CACHE_OP_WRITE, PERF_COUNT_HW_CACHE_RESULT_ACCESS)},
+  {"LLC-store-misses",        PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_LL,   PERF_COUNT_HW_CACHE_OP_WRITE, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"dTLB-loads",              PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_DTLB, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_ACCESS)},
+  {"dTLB-load-misses",        PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_DTLB, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"dTLB-store-misses",       PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_DTLB, PERF_COUNT_HW_CACHE_OP_WRITE, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"iTLB-load-misses",        PERF_TYPE_HW_CACHE, hw_cache(PERF_COUNT_HW_CACHE_ITLB, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS)},
+  {"task-clock",              PERF_TYPE_SOFTWARE, PERF_COUNT_SW_TASK_CLOCK},
+  {"page-faults",             PERF_TYPE_SOFTWARE, PERF_COUNT_SW_PAGE_FAULTS},
+  {"context-switches",        PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CONTEXT_SWITCHES},
+  {"cpu-migrations",          PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CPU_MIGRATIONS},
+};
+
+bool lookup(const std::string& name, EventSpec& out) {
+  for (const auto& e : kEvents)
+    if (name == e.name) { out = e; return true; }
+  // raw PMU encoding, e.g. r01d1 (MEM_LOAD_RETIRED.L1_HIT on Intel)
+  if (name.size() > 1 && name[0] == 'r') {
+    char* end = nullptr;
+    uint64_t cfg = std::strtoull(name.c_str() + 1, &end, 16);
+    if (end && *end == '\0') { out = {"raw", PERF_TYPE_RAW, cfg}; return true; }
+  }
+  return false;
+}
+
+int open_event(const EventSpec& e) {
+  perf_event_attr attr;
+  std::memset(&attr, 0, sizeof(attr));
+  attr.size = sizeof(attr);
+  attr.type = e.type;
+  attr.config = e.config;
+  attr.disabled = 1;
+  attr.inherit = 1;            // follow worker threads spawned after open
+  attr.exclude_kernel = 1;
+  attr.exclude_hv = 1;
+  attr.read_format = PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING;
+  return int(syscall(SYS_perf_event_open, &attr, 0 /*this process*/, -1 /*any cpu*/, -1, 0));
+}
+#endif
+
+// CSV-safe column name: dTLB-load-misses -> dTLB_load_misses
+std::string column(const std::string& ev) {
+  std::string c = ev;
+  for (char& ch : c) if (ch == '-' || ch == '.' || ch == ':') ch = '_';
+  return c;
+}
+
+} // namespace
+
+bool PerfCounters::open(const std::string& list) {
+  size_t pos = 0;
+  while (pos <= list.size()) {
+    size_t comma = list.find(',', pos);
+    std::string ev = list.substr(pos, comma == std::string::npos ? std::string::npos : comma - pos);
+    pos = (comma == std::string::npos) ? list.size() + 1 : comma + 1;
+    if (ev.empty()) continue;
+#ifdef __linux__
+    EventSpec spec{};
+    if (!lookup(ev, spec)) { std::fprintf(stderr, "# counters: unknown event '%s' (skipped)\n", ev.c_str()); continue; }
+    int fd = open_event(spec);
+    if (fd < 0) {
+      std::fprintf(stderr, "# counters: cannot open '%s': %s (check perf_event_paranoid / PMU access)\n",
+                   ev.c_str(), std::strerror(errno));
+      continue;
+    }
+    names.push_back(ev);
+    fds.push_back(fd);
+#else
+    std::fprintf(stderr, "# counters: perf_event_open is Linux-only; '%s' ignored\n", ev.c_str());
+#endif
+  }
+  last.assign(names.size(), Reading{});
+  return !fds.empty();
+}
+
+void PerfCounters::start() {
+#ifdef __linux__
+  for (int fd : fds) ioctl(fd, PERF_EVENT_IOC_RESET, 0);
+  for (int fd : fds) ioctl(fd, PERF_EVENT_IOC_ENABLE, 0);
+#endif
+}
+
+void PerfCounters::stop() {
+#ifdef __linux__
+  for (int fd : fds) ioctl(fd, PERF_EVENT_IOC_DISABLE, 0);
+  for (size_t k = 0; k < fds.size(); ++k) {
+    uint64_t v[3] = {0, 0, 0};  // value, time_enabled, time_running
+    Reading r{};
+    if (read(fds[k], v, sizeof(v)) == ssize_t(sizeof(v)) && v[2] > 0) {
+      r.ratio  = double(v[2]) / double(v[1]);
+      r.scaled = double(v[0]) / r.ratio;   // extrapolate multiplexed counts
+      r.valid  = true;
+    }
+    last[k] = r;
+  }
+#endif
+}
+
+std::string PerfCounters::csv_header() const {
+  std::string h;
+  for (auto& n : names) h += "," + column(n) + "," + column(n) + "_mux";
+  return h;
+}
+
+std::string PerfCounters::csv_values() const {
+  std::string s;
+  char buf[64];
+  for (auto& r : last) {
+    if (!r.valid) { s += ",,"; continue; }
+    std::snprintf(buf, sizeof(buf), ",%.0f,%.4f", r.scaled, r.ratio);
+    s += buf;
+  }
+  return s;
+}
+
+std::string PerfCounters::value(const std::string& name) const {
+  for (size_t k = 0; k < names.size(); ++k) {
+    if (names[k] != name || !last[k].valid) continue;
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "%.0f", last[k].scaled);
+    return buf;
+  }
+  return "";
+}
+
+PerfCounters::~PerfCounters() {
+#ifdef __linux__
+  for (int fd : fds) close(fd);
+#endif
+}
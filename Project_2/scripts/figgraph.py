@@ -0,0 +1,112 @@
+"""Incremental figure builds for make_all_plots.py / plot_all.py.
+
+Each Figure names its input CSVs (paths or glob patterns), the parameters it
+reads and the files it writes. A figure is re-rendered only when its key --
+content hashes of its inputs, the parameters and the renderer's source --
+differs from the last successful build, or one of its outputs went missing.
+Stale figures render in a process pool; the keys live in <state> (JSON).
+
+Input hashes are cached by (size, mtime), so an unchanged multi-GB sweep
+archive is not re-read on every run.
+"""
+import glob, hashlib, inspect, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+@dataclass
+class Figure:
+    name: str
+    render: callable                 # render(inp, params, outputs); module-level so it pickles
+    inputs: dict                     # role -> path or glob; all required
+    outputs: list
+    params: dict = field(default_factory=dict)
+    optional: dict = field(default_factory=dict)   # role -> path or glob; used if present
+
+def _resolve(spec):
+    if any(ch in spec for ch in "*?["):
+        return sorted(glob.glob(spec))
+    return spec if os.path.exists(spec) else None
+
+def _file_hash(path, cache):
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    sig = [st.st_size, st.st_mtime_ns]
+    hit = cache.get(path)
+    if hit and hit[0] == sig:
+        return hit[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    cache[path] = [sig, h.hexdigest()]
+    return cache[path][1]
+
+def _key(fig, inp, cache):
+    h = hashlib.sha256()
+    h.update(inspect.getsource(fig.render).encode())
+    h.update(json.dumps(fig.params, sort_keys=True, default=str).encode())
+    for role in sorted(inp):
+        paths = inp[role] if isinstance(inp[role], list) else [inp[role]]
+        for p in paths:
+            h.update(f"{role}\0{os.path.basename(p)}\0{_file_hash(p, cache)}\0".encode())
+    return h.hexdigest()
+
+def _run(fig, inp):
+    t = time.perf_counter()
+    try:
+        fig.render(inp, fig.params, fig.outputs)
+    finally:   # pool workers are reused: do not let pyplot figures pile up
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close("all")
+    return time.perf_counter() - t
+
+def build(figs, state_path, jobs=None, force=False, only=None):
+    """Render stale figures; returns {name: 'built' | 'fresh' | 'no-input' | 'failed: ...'}."""
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+    cache = state.setdefault("_hashes", {})
+    todo, status = [], {}
+    for fig in figs:
+        if only and fig.name not in only:
+            continue
+        inp = {r: _resolve(s) for r, s in fig.inputs.items()}
+        if any(not v for v in inp.values()):
+            status[fig.name] = "no-input"
+            continue
+        inp.update({r: v for r, v in ((r, _resolve(s)) for r, s in fig.optional.items()) if v})
+        key = _key(fig, inp, cache)
+        prev = state.get(fig.name, {})
+        if not force and prev.get("key") == key and all(os.path.exists(o) for o in prev.get("outputs", [])):
+            status[fig.name] = "fresh"
+            continue
+        todo.append((fig, inp, key))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs or os.cpu_count() or 1, len(todo)))) as pool:
+            futs = {pool.submit(_run, fig, inp): (fig, key) for fig, inp, key in todo}
+            for fut in as_completed(futs):
+                fig, key = futs[fut]
+                try:
+                    secs = fut.result()
+                except Exception as e:   # one bad CSV should not cost the other figures
+                    status[fig.name] = f"failed: {e!r}"
+                    state.pop(fig.name, None)
+                    continue
+                # a renderer may legitimately write nothing (e.g. empty data); remember what it did write
+                state[fig.name] = {"key": key, "outputs": [o for o in fig.outputs if os.path.exists(o)]}
+                status[fig.name] = f"built ({secs:.2f}s)"
+
+    os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+    with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(state_path + ".tmp", state_path)
+    return status
+
+def report(status):
+    for name, s in sorted(status.items()):
+        print(f"  {name:28s} {s}")
+    built = sum(s.startswith("built") for s in status.values())
+    fresh = sum(s == "fresh" for s in status.values())
+    print(f"# {built} rendered, {fresh} up to date, {len(status) - built - fresh} skipped/failed")
@@ -0,0 +1,308 @@
+"""Incremental harvester: raw sweep CSVs/TSVs and perf logs -> canonical results/csv tables.
+
+Replaces the full-tree rescans of super_harvest.py, discover_and_map.py and
+harvest_existing_csvs.py (which now just call main() here). A manifest in the
+output directory (.harvest_manifest.json) records, per input file, its size,
+mtime, content hash, header row and the table it feeds:
+
+  * unchanged (size, mtime)  -> skipped without opening the file
+  * same content hash        -> only the stat is refreshed
+  * new / changed            -> the header row alone decides the target table;
+                                only files that map to a table are parsed
+
+Each canonical table is a concatenation of per-source segments (listed in the
+manifest), so new sources are appended and a changed or deleted source has
+just its own rows replaced. A table that existed before the harvester owned it
+is kept as <table>.bak and rebuilt from its sources, as the old scripts did.
+"""
+import argparse, csv, hashlib, json, os, re, shutil
+import pandas as pd
+import perfstat
+
+MANIFEST = ".harvest_manifest.json"
+SKIP_DIRS = re.compile(r"^(build|cmake-build-.*|\.venv|venv|\.git|__pycache__|node_modules)$")
+# derived from the canonical tables by make_all_plots.py; never harvested
+DERIVED = {"zeroq_latencies_cycles.csv"}
+
+TABLES = {
+    "zeroq":          "zeroq_latencies.csv",
+    "pattern_stride": "pattern_stride_all.csv",
+    "rw_mix":         "rw_mix_all.csv",
+    "intensity":      "intensity_loaded_latency.csv",
+    "wss":            "latency_vs_wss.csv",
+    "cache_perf":     "cache_kernel_perf.csv",
+    "tlb_perf":       "tlb_kernel_perf.csv",
+}
+
+# ---------- header-only classification ----------
+# Each rule takes {lowercased column: column} and returns a mapper
+# (DataFrame -> canonical DataFrame) or None. First matching rule wins.
+
+def _pick(L, *names):
+    return next((L[n] for n in names if n in L), None)
+
+def _with_run_id(out, df, L):
+    out["run_id"] = df[L["run_id"]].values if "run_id" in L else 1
+    return out
+
+def rule_zeroq(L):
+    lvl = _pick(L, "level", "cache_level", "tier")
+    rns = _pick(L, "read_ns", "read (ns)", "latency_ns", "lat_ns")
+    wns = _pick(L, "write_ns", "write (ns)")
+    if not (lvl and rns): return None
+    def m(df):
+        out = pd.DataFrame({"level": df[lvl], "read_ns": df[rns]})
+        if wns: out["write_ns"] = df[wns]
+        return out
+    return m
+
+def rule_pattern_stride(L):
+    if {"pattern", "stride_b", "metric", "value"} <= set(L):
+        return lambda df: _with_run_id(pd.DataFrame({
+            "pattern": df[L["pattern"]], "stride_B": df[L["stride_b"]],
+            "metric": df[L["metric"]], "value": df[L["value"]]}), df, L)
+    bwcols = [k for k in L if re.search(r"(seq|sequential).*gbs|rand.*gbs|random.*gbs", k)]
+    if "stride_b" in L and bwcols:
+        def m(df):
+            parts = [pd.DataFrame({"pattern": "seq" if "seq" in k else "random",
+                                   "stride_B": df[L["stride_b"]].astype(int), "metric": "bandwidth_GBs",
+                                   "value": df[L[k]].astype(float), "run_id": 1}) for k in bwcols]
+            return pd.concat(parts, ignore_index=True)
+        return m
+    return None
+
+def rule_rw_mix(L):
+    mix = _pick(L, "rw_mix", "mix")
+    bwc = _pick(L, "bandwidth_gbs", "gbs", "bw_gbs", "throughput_gbs")
+    if mix and bwc:
+        return lambda df: _with_run_id(pd.DataFrame({"rw_mix": df[mix], "bandwidth_GBs": df[bwc]}), df, L)
+    if {"read_pct", "write_pct", "bandwidth_gbs"} <= set(L):
+        return lambda df: _with_run_id(pd.DataFrame({
+            "rw_mix": df[L["read_pct"]].astype(int).astype(str) + "R" + df[L["write_pct"]].astype(int).astype(str) + "W",
+            "bandwidth_GBs": df[L["bandwidth_gbs"]].astype(float)}), df, L)
+    return None
+
+def rule_intensity(L):
+    latc = _pick(L, "loaded_latency_ns", "latency_ns", "loaded_ns", "lat_ns")
+    thc  = _pick(L, "throughput_gbs", "tput_gbs", "bw_gbs", "bandwidth_gbs")
+    if not ("threads" in L and latc and thc): return None
+    def m(df):
+        out = pd.DataFrame({"threads": df[L["threads"]]})
+        if "inject_delay" in L: out["inject_delay"] = df[L["inject_delay"]]   # memlab loaded
+        out["loaded_latency_ns"], out["throughput_GBs"] = df[latc], df[thc]
+        return _with_run_id(out, df, L)
+    return m
+
+def rule_wss(L):
+    w = _pick(L, "working_set_b", "wss_b", "footprint_b", "size_b", "bytes")
+    l = _pick(L, "latency_ns", "lat_ns", "read_lat_ns")
+    if not (w and l): return None
+    return lambda df: _with_run_id(pd.DataFrame({"working_set_B": df[w], "latency_ns": df[l]}), df, L)
+
+def rule_cache_perf(L):
+    S, ST = _pick(L, "size_b", "size", "working_set_b"), _pick(L, "stride_b", "stride")
+    LM = _pick(L, "llc-load-misses", "llc_misses")
+    if not ({"cycles", "instructions"} <= set(L) and S and ST and LM): return None
+    def m(df):
+        out = pd.DataFrame({"size_B": df[S], "stride_B": df[ST]})
+        out = _with_run_id(out, df, L)
+        out["cycles"], out["instr"], out["llc_misses"] = df[L["cycles"]], df[L["instructions"]], df[LM]
+        return out
+    return m
+
+def rule_tlb_perf(L):
+    S, HP = _pick(L, "size_b", "size"), _pick(L, "hugepages", "thp", "hp")
+    DM = _pick(L, "dtlb-load-misses", "dtlb_misses")
+    if not ({"cycles", "instructions"} <= set(L) and S and HP and DM): return None
+    def m(df):
+        out = pd.DataFrame({"size_B": df[S], "hugepages": df[HP]})
+        out = _with_run_id(out, df, L)
+        out["cycles"], out["instr"], out["dtlb_load_misses"] = df[L["cycles"]], df[L["instructions"]], df[DM]
+        return out
+    return m
+
+RULES = [("zeroq", rule_zeroq), ("pattern_stride", rule_pattern_stride), ("rw_mix", rule_rw_mix),
+         ("intensity", rule_intensity), ("wss", rule_wss), ("cache_perf", rule_cache_perf),
+         ("tlb_perf", rule_tlb_perf)]
+
+def classify(header):
+    L = {c.strip().lower(): c for c in header}
+    for table, rule in RULES:
+        mapper = rule(L)
+        if mapper: return table, mapper
+    return None, None
+
+# ---------- perf stat logs (one row per file, keyed by file name) ----------
+# Changed logs are parsed together by perfstat.read (event aliases, <not counted>,
+# multiplexing); `mux` is the smallest running fraction among the counts used.
+PERF_DIR = "results/raw/perf"   # relative to the scan root; perf_old/ etc. are not harvested
+PERF_LOGS = [
+    ("cache_perf", re.compile(r"s(\d+)_st(\d+)_r(\d+)\.perf$"), ("size_B", "stride_B", "run_id"),
+     {"cycles": "cycles", "instructions": "instr", "llc_misses": "llc_misses", "mux": "mux"}),
+    ("tlb_perf", re.compile(r"s(\d+)_hp(on|off)_r(\d+)\.perf$"), ("size_B", "hugepages", "run_id"),
+     {"cycles": "cycles", "instructions": "instr", "dtlb_load_misses": "dtlb_load_misses", "mux": "mux"}),
+]
+
+def perf_logs(paths):
+    """{path: (table, one-row frame)} for a batch of perf stat logs."""
+    t = perfstat.read(paths).set_index("file")
+    got = {}
+    for path in paths:
+        for table, pat, keys, counts in PERF_LOGS:
+            m = pat.search(os.path.basename(path))
+            if not m: continue
+            row = {k: (v if k == "hugepages" else int(v)) for k, v in zip(keys, m.groups())}
+            row.update({dst: t.at[path, src] if path in t.index else None for src, dst in counts.items()})
+            df = pd.DataFrame([row])
+            got[path] = (table, df.astype({c: "Int64" for c in counts.values() if c != "mux"}))
+            break
+    return got
+
+# ---------- scanning ----------
+def sniff_header(path):
+    """First non-empty, non-comment row only; the rest of the file is not read."""
+    sep = "\t" if path.lower().endswith(".tsv") else ","
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            s = line.strip().lstrip("\ufeff")
+            if s and not s.startswith("#"):
+                return next(csv.reader([s], delimiter=sep))
+    return []
+
+def content_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def candidates(root, out):
+    skip = {os.path.join(out, n) for n in list(TABLES.values()) + list(DERIVED)}
+    perf_dir = os.path.join(root, *PERF_DIR.split("/"))
+    for d, dirs, files in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if not SKIP_DIRS.match(x))
+        for n in sorted(files):
+            p = os.path.join(d, n)
+            low = n.lower()
+            if p in skip: continue
+            if low.endswith((".csv", ".tsv")) or (d == perf_dir and any(pl[1].search(n) for pl in PERF_LOGS)):
+                yield p
+
+def ingest(path):
+    """(table, canonical rows, header) for a new or changed CSV; table is None if it maps nowhere."""
+    header = sniff_header(path)
+    table, mapper = classify(header)
+    if not table: return None, None, header
+    try:
+        df = pd.read_csv(path, sep="\t" if path.lower().endswith(".tsv") else ",", comment="#")
+        return table, mapper(df), header
+    except Exception as e:
+        print("  ! read error:", e, "->", path)
+        return None, None, header
+
+# ---------- table maintenance ----------
+def update_table(path, segments, dirty, new, fresh):
+    """Rewrite (or append to) one table. segments: [[source, nrows], ...] as written;
+    dirty: sources whose old rows must go; new: {source: rows}. Returns the new segments."""
+    keep = [s for s in segments if s[0] not in dirty]
+    frames = [(src, df) for src, df in sorted(new.items()) if df is not None and not df.empty]
+    if not fresh and keep == segments and os.path.exists(path):
+        head = sniff_header(path)
+        if all(list(df.columns) == head for _, df in frames):   # pure append
+            for _, df in frames:
+                df.to_csv(path, mode="a", header=False, index=False)
+            return segments + [[src, len(df)] for src, df in frames]
+    old = pd.read_csv(path) if (os.path.exists(path) and not fresh and keep) else pd.DataFrame()
+    parts, pos, out_segs = [], 0, []
+    starts = {}
+    for src, n in segments:
+        starts[src] = (pos, n); pos += n
+    for src, n in keep:
+        a, _ = starts[src]
+        parts.append(old.iloc[a:a + n]); out_segs.append([src, n])
+    for src, df in frames:
+        parts.append(df); out_segs.append([src, len(df)])
+    if parts:
+        pd.concat(parts, ignore_index=True).to_csv(path, index=False)
+    elif os.path.exists(path):
+        os.remove(path)   # every source of this table is gone
+    return out_segs
+
+def harvest(root=".", out=None, full=False, verbose=False):
+    root = os.path.abspath(root)
+    out = os.path.abspath(out or os.path.join(root, "results", "csv"))
+    os.makedirs(out, exist_ok=True)
+    mpath = os.path.join(out, MANIFEST)
+    man = {"version": 1, "files": {}, "tables": {}}
+    if os.path.exists(mpath):
+        with open(mpath, encoding="utf-8") as f:
+            man = json.load(f)
+    owned = set(man["tables"])   # written by an earlier harvest, so no .bak needed
+    if full:
+        man = {"version": 1, "files": {}, "tables": {}}
+    files, tables = man["files"], man["tables"]
+    for name in [n for n in tables if not os.path.exists(os.path.join(out, n))]:
+        for src, _ in tables.pop(name):   # table deleted by hand: re-ingest its sources
+            files.pop(src, None)
+
+    seen, dirty, new, logs = set(), set(), {}, {}
+    stats = dict(scanned=0, unchanged=0, ingested=0)
+    def add(rel, table, df):
+        files[rel]["table"] = table
+        if not table: return
+        new.setdefault(table, {})[rel] = df
+        stats["ingested"] += 1
+        if verbose: print(f"  + {rel} -> {TABLES[table]} ({0 if df is None else len(df)} rows)")
+    for p in candidates(root, out):
+        rel = os.path.relpath(p, root).replace(os.sep, "/")
+        seen.add(rel); stats["scanned"] += 1
+        st = os.stat(p)
+        rec = files.get(rel)
+        if rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns:
+            stats["unchanged"] += 1; continue
+        sha = content_hash(p)
+        if rec and rec["sha256"] == sha:
+            rec["size"], rec["mtime_ns"] = st.st_size, st.st_mtime_ns
+            stats["unchanged"] += 1; continue
+        if rec: dirty.add(rel)
+        files[rel] = dict(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=sha, header=[], table=None)
+        if p.endswith(".perf"):
+            logs[p] = rel; continue
+        table, df, files[rel]["header"] = ingest(p)
+        add(rel, table, df)
+    for p, (table, df) in (perf_logs(list(logs)) if logs else {}).items():
+        add(logs[p], table, df)
+    for rel in [r for r in files if r not in seen]:   # deleted inputs
+        dirty.add(rel); del files[rel]
+
+    touched = {t for t in TABLES if t in new or any(s[0] in dirty for s in tables.get(TABLES[t], []))}
+    for t in sorted(touched):
+        name = TABLES[t]
+        path = os.path.join(out, name)
+        fresh = name not in tables
+        if fresh and name not in owned and os.path.exists(path):   # not written by the harvester: keep a copy, then rebuild
+            shutil.copy2(path, path + ".bak")
+            print(f"  {name}: existing table kept as {name}.bak")
+        tables[name] = update_table(path, tables.get(name, []), dirty, new.get(t, {}), fresh)
+        if not tables[name]: del tables[name]
+        print(f"  wrote {name} ({sum(n for _, n in tables.get(name, []))} rows, {len(tables.get(name, []))} sources)")
+
+    tmp = mpath + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(man, f, indent=1)
+    os.replace(tmp, mpath)
+    print(f"harvest: {stats['scanned']} files, {stats['unchanged']} unchanged, {stats['ingested']} ingested, "
+          f"{len(touched)} tables updated -> {out}")
+    return touched
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--root", default=".", help="tree to scan (default: cwd)")
+    ap.add_argument("--out", default=None, help="canonical CSV dir (default: <root>/results/csv)")
+    ap.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every table")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    A = ap.parse_args(argv)
+    harvest(A.root, A.out, A.full, A.verbose)
+
+if __name__ == "__main__":
+    main()
@@ -15,44 +15,34 @@ def _zero_err(x):
         return 0.0
 # --- end helper ---
 
-import argparse, os
+
+import argparse, os, sys
 import pandas as pd, numpy as np
+import matplotlib
+matplotlib.use('Agg')   # renderers run in worker processes
 import matplotlib.pyplot as plt
 
-ap = argparse.ArgumentParser()
-ap.add_argument('--csvdir', required=True)
-ap.add_argument('--figdir', required=True)
-ap.add_argument('--base-ghz', type=float, required=True)
-ap.add_argument('--mem-mts', type=int, required=True)
-ap.add_argument('--bus-bits', type=int, required=True)
-ap.add_argument('--channels', type=int, required=True)
-ap.add_argument('--l1d', type=int, required=True)
-ap.add_argument('--l2', type=int, required=True)
-ap.add_argument('--llc', type=int, required=True)
-A = ap.parse_args()
-
-os.makedirs(A.figdir, exist_ok=True)
-os.makedirs(A.csvdir, exist_ok=True)
-
-def maybe_read(name):
-    p = os.path.join(A.csvdir, name)
-    return pd.read_csv(p) if os.path.exists(p) else None
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from figgraph import Figure, build, report
+import perfmodel
+import saturation
+
+# Each renderer gets inp (role -> CSV path), P (its parameters) and out (paths to write).
 
 # 1) zero-queue table → add cycles
-z = maybe_read('zeroq_latencies.csv')
-if z is not None:
-    zz = z.copy()
+def zeroq_cycles(inp, P, out):
+    zz = pd.read_csv(inp['z'])
     for col in [c for c in zz.columns if c.endswith('_ns')]:
-        zz[col.replace('_ns','_cycles')] = (zz[col].astype(float) * A.base_ghz).round(2)
-    zz.to_csv(os.path.join(A.csvdir,'zeroq_latencies_cycles.csv'), index=False)
+        zz[col.replace('_ns','_cycles')] = (zz[col].astype(float) * P['base_ghz']).round(2)
+    zz.to_csv(out[0], index=False)
 
 # 2) pattern×stride latency + bandwidth with error bars
-ps = maybe_read('pattern_stride_all.csv')  # pattern,stride_B,metric,value,run_id
-if ps is not None:
-    for metric, ylabel, outname in [
-        ('bandwidth_GBs','Throughput (GB/s)','fig_pattern_bandwidth.png'),
-        ('latency_ns','Latency (ns)','fig_pattern_latency.png')
-    ]:
+def pattern_stride(inp, P, out):
+    ps = pd.read_csv(inp['ps'])  # pattern,stride_B,metric,value,run_id
+    for (metric, ylabel), outname in zip([
+        ('bandwidth_GBs','Throughput (GB/s)'),
+        ('latency_ns','Latency (ns)')
+    ], out):
         g=(ps[ps['metric']==metric]
            .groupby(['pattern','stride_B'],as_index=False)['value']
            .agg(mean='mean', std='std'))
@@ -66,67 +56,83 @@ if ps is not None:
         plt.ylabel(ylabel); plt.title(f'{ylabel} vs stride (seq vs random, mean±stdev)')
         plt.grid(True, which='both', linestyle=':')
         plt.legend(); plt.tight_layout()
-        plt.savefig(os.path.join(A.figdir,outname), dpi=180)
+        plt.savefig(outname, dpi=180)
 
 # 3) R/W mix bars with error bars
-rw = maybe_read('rw_mix_all.csv')  # rw_mix,bandwidth_GBs,run_id
-if rw is not None:
+def rw_mix(inp, P, out):
+    rw = pd.read_csv(inp['rw'])  # rw_mix,bandwidth_GBs,run_id
     g = rw.groupby('rw_mix', as_index=False)['bandwidth_GBs'].agg(mean='mean', std='std')
     plt.figure()
     plt.bar(g['rw_mix'], g['mean'], yerr=_zero_err(g)['std'].fillna(0), capsize=3)
     plt.ylabel('Throughput (GB/s)'); plt.xlabel('Read/Write mix')
     plt.title('Bandwidth vs R/W mix — mean±stdev (n≥3)')
-    plt.tight_layout(); plt.savefig(os.path.join(A.figdir,'fig_rw_mix.png'), dpi=180)
+    plt.tight_layout(); plt.savefig(out[0], dpi=180)
 
 # 4) intensity curve with %peak + knee
-ic = maybe_read('intensity_loaded_latency.csv')  # threads,loaded_latency_ns,throughput_GBs,run_id
-if ic is not None:
-    g=(ic.groupby('threads',as_index=False)
+def intensity_curve(inp, P, out):
+    ic = pd.read_csv(inp['ic'])  # threads,[inject_delay,]loaded_latency_ns,throughput_GBs,run_id
+    # memlab loaded sweeps injection delay at fixed threads; MLC/bw sweep threads
+    keys = ['threads','inject_delay'] if 'inject_delay' in ic.columns else ['threads']
+    g=(ic.groupby(keys,as_index=False)
        .agg(latency_ns=('loaded_latency_ns','mean'),
             lat_err=('loaded_latency_ns','std'),
             thpt=('throughput_GBs','mean'),
             thpt_err=('throughput_GBs','std')))
-    peak = A.mem_mts*1e6 * (A.bus_bits/8) * A.channels * 2 / 1e9
+    if 'inject_delay' in g.columns:
+        g = g.sort_values('thpt', ignore_index=True)  # idle → saturation
+    peak = P['mem_mts']*1e6 * (P['bus_bits']/8) * P['channels'] * 2 / 1e9
     pct = 100.0*g.thpt.max()/peak if peak>0 else float('nan')
-    # knee: first idx where (Δlat/lat)/(Δthpt/thpt) > 2
-    knee_idx=None
-    for i in range(1,len(g)):
-        dlat=g.latency_ns.iloc[i]-g.latency_ns.iloc[i-1]
-        dth =g.thpt.iloc[i]-g.thpt.iloc[i-1]
-        if g.latency_ns.iloc[i-1]>0 and g.thpt.iloc[i-1]>0 and dth>0:
-            slope=(dlat/g.latency_ns.iloc[i-1])/(dth/g.thpt.iloc[i-1])
-            if slope>2 and knee_idx is None: knee_idx=i
+    # knee of the Little's-law bound X(N) = Xmax*min(N/N*,1) with a bootstrap CI over run_id.
+    # Concurrency is the thread count, or for delay-injection sweeps the lines in flight X*R/64.
+    if 'inject_delay' in g.columns:
+        ic = ic.assign(mlp=ic.throughput_GBs*ic.loaded_latency_ns/64.0)
+        k = saturation.knee_frame(ic, 'mlp', 'throughput_GBs', level_col=keys)
+        n_at = (g.thpt*g.latency_ns/64.0).to_numpy()
+        unit, fmt = 'lines in flight ', '{:.0f}'
+    else:
+        k = saturation.knee_frame(ic, 'threads', 'throughput_GBs')
+        n_at, unit, fmt = g.threads.to_numpy(float), 'T', '{:.1f}'
+    knee_idx = saturation.nearest(n_at, k)
     plt.figure()
     plt.errorbar(g.latency_ns, g.thpt, xerr=_zero_err(g.lat_err), yerr=_zero_err(g.thpt_err),
                  marker='o', capsize=3)
-    if knee_idx is not None:
+    plt.axhline(k.x_max, ls=':', color='gray', lw=1)
+    lab = k.label(unit, fmt)
+    if k.found:
         plt.scatter([g.latency_ns.iloc[knee_idx]],[g.thpt.iloc[knee_idx]], s=80)
-        plt.annotate(f'knee @ T={g.threads.iloc[knee_idx]}',
-                     (g.latency_ns.iloc[knee_idx], g.thpt.iloc[knee_idx]),
-                     xytext=(10,10), textcoords='offset points')
+        if 'inject_delay' in g.columns: lab += f' (delay={g.inject_delay.iloc[knee_idx]})'
+    plt.annotate(lab, (g.latency_ns.iloc[knee_idx], g.thpt.iloc[knee_idx]),
+                 xytext=(10,-15), textcoords='offset points')
     plt.xlabel('Loaded latency (ns)'); plt.ylabel('Throughput (GB/s)')
     plt.title(f'Throughput vs loaded latency — max {pct:.1f}% of theoretical peak')
     plt.grid(True, linestyle=':'); plt.tight_layout()
-    plt.savefig(os.path.join(A.figdir,'fig_intensity_curve.png'), dpi=180)
+    plt.savefig(out[0], dpi=180)
 
 # 5) working-set transitions with vlines
-wss = maybe_read('latency_vs_wss.csv')  # working_set_B,latency_ns,run_id
-if wss is not None:
+def wss_transitions(inp, P, out):
+    wss = pd.read_csv(inp['wss'])  # working_set_B,latency_ns,run_id
     gg = wss.groupby('working_set_B',as_index=False)['latency_ns'].agg(mean='mean', std='std')
     plt.figure()
     plt.errorbar(gg.working_set_B, gg['mean'], yerr=_zero_err(gg)['std'].fillna(0),
                  marker='o', capsize=3)
-    for x,label in [(A.l1d,'L1'),(A.l2,'L2'),(A.llc,'L3')]:
+    marks=[(P['l1d'],'L1'),(P['l2'],'L2'),(P['llc'],'L3')]
+    if 'tr' in inp:  # level,cache_B,from_B,to_B,transition_B,... (memlab latency --adaptive)
+        tr = pd.read_csv(inp['tr'])
+        tr = tr[tr['level'].astype(str).str.match(r'L\d')]
+        if not tr.empty:
+            marks=[(int(r.transition_B), f'{r.level} (measured)') for r in tr.itertuples()]
+    for x,label in marks:
         plt.axvline(x, color='tab:blue', linestyle='--', alpha=0.5)
         plt.text(x*1.05, gg['mean'].max()*0.85, label)
     plt.xscale('log'); plt.xlabel('Working set (bytes)'); plt.ylabel('Latency (ns)')
     plt.title('Zero-queue latency vs working set — L1/L2/L3/DRAM (mean±stdev)')
     plt.grid(True, which='both', linestyle=':'); plt.tight_layout()
-    plt.savefig(os.path.join(A.figdir,'fig_wss_transitions.png'), dpi=180)
+    plt.savefig(out[0], dpi=180)
 
 # 6) cache kernel IPC vs LLC MPKI
-ck = maybe_read('cache_kernel_perf.csv')  # size_B,stride_B,run_id,cycles,instr,llc_misses
-if ck is not None and not ck.empty:
+def cache_ipc(inp, P, out):
+    ck = pd.read_csv(inp['ck'])  # size_B,stride_B,run_id,cycles,instr,llc_misses
+    if ck.empty: return
     df=ck.dropna()
     df['IPC']=df['instr']/df['cycles']
     df['LLC_MPKI']=(df['llc_misses']/(df['instr']/1000.0)).replace([np.inf,np.nan],0)
@@ -139,42 +145,170 @@ if ck is not None and not ck.empty:
     plt.xlabel('LLC MPKI'); plt.ylabel('IPC')
     plt.title('Kernel IPC vs LLC MPKI (mean±stdev)')
     plt.grid(True, linestyle=':'); plt.tight_layout()
-    plt.savefig(os.path.join(A.figdir,'fig_cache_ipc_vs_llc_mpki.png'), dpi=180)
-
-# 7) AMAT trend (if zero-queue + cache CSV present)
-if z is not None and ck is not None and not ck.empty:
-    zz=z.set_index('level')
-    def T(l):
-        try: return float(zz.loc[l,'read_ns'])
-        except: return np.nan
-    T1,T2,T3,TM = map(T, ['L1','L2','L3','DRAM'])
-    df=ck.dropna().copy()
-    df['LLC_MPKI']=df['llc_misses']/(df['instr']/1000.0)
-    x=df['LLC_MPKI'].clip(0,50)
-    mLLC=(x/50.0).clip(0,1); mL2=(x/30.0).clip(0,1); mL1=(x/10.0).clip(0,1)
-    AMAT = T1 + mL1*(T2 + mL2*(T3 + mLLC*TM))
-    df['AMAT_ns']=AMAT; df['IPC']=df['instr']/df['cycles']
-    plt.figure()
-    plt.scatter(df['AMAT_ns'], df['IPC'], alpha=0.6)
-    plt.gca().invert_xaxis()
-    plt.xlabel('Predicted AMAT (ns)  \u2190 lower is better'); plt.ylabel('IPC')
-    plt.title('AMAT trend vs IPC (qualitative match)')
-    plt.grid(True, linestyle=':'); plt.tight_layout()
-    plt.savefig(os.path.join(A.figdir,'fig_amat_vs_ipc.png'), dpi=180)
+    plt.savefig(out[0], dpi=180)
+
+# 7) AMAT / CPI model (scripts/perfmodel.py) fitted to zero-queue latencies + cache counters
+def amat_vs_ipc(inp, P, out):
+    z, ck = pd.read_csv(inp['z']), pd.read_csv(inp['ck'])
+    if ck.empty: return
+    m = perfmodel.fit(z, ck, P['base_ghz'], P['l1d'], P['l2'], P['llc'])
+    q = perfmodel.report(m, ck).set_index('target')
+    g = perfmodel.points(ck)
+    pred = m.predict(g['size_B'], g['stride_B'])
+    ipc = 1.0/g['cpi']
+    fig, (ax, axp) = plt.subplots(1, 2, figsize=(11, 4.2))
+    ax.scatter(pred['amat_ns'], ipc, alpha=0.7, label='measured')
+    o = np.argsort(pred['amat_ns'].to_numpy())
+    ax.plot(pred['amat_ns'].to_numpy()[o], pred['ipc'].to_numpy()[o], 'k--', label='model')
+    ax.invert_xaxis()
+    ax.set_xlabel('Model AMAT (ns)  ← lower is better'); ax.set_ylabel('IPC')
+    ax.set_title(f"CPI_core={m.cpi_core:.2f}, MLP={m.mlp:.1f}" if np.isfinite(m.mlp) else
+                 f"CPI_core={m.cpi_core:.2f} (no memory-stall signal)", fontsize=10)
+    ax.legend(); ax.grid(True, linestyle=':')
+    axp.scatter(ipc, pred['ipc'], alpha=0.7)
+    lim = [min(ipc.min(), pred['ipc'].min())*0.95, max(ipc.max(), pred['ipc'].max())*1.05]
+    axp.plot(lim, lim, 'k:', lw=1)
+    axp.set_xlabel('Measured IPC'); axp.set_ylabel('Predicted IPC')
+    axp.set_title(f"R²={q.loc['ipc','r2']:.2f}, leave-one-out error {q.loc['ipc','loo_mape_%']:.1f}%", fontsize=10)
+    axp.grid(True, linestyle=':')
+    fig.suptitle('AMAT / CPI model vs measured IPC'); fig.tight_layout()
+    fig.savefig(out[0], dpi=180)
 
 # 8) TLB impact (if CSV present)
-tlb = maybe_read('tlb_kernel_perf.csv')  # size_B,hugepages,run_id,cycles,instr,dtlb_load_misses
-if tlb is not None and not tlb.empty:
-    d=tlb.dropna().copy()
-    d['IPC']=d['instr']/d['cycles']
-    d['dTLB_MPKI']=d['dtlb_load_misses']/(d['instr']/1000.0)
+def tlb_impact(inp, P, out):
+    tlb = pd.read_csv(inp['tlb'])  # size_B,hugepages,run_id,cycles,instr,dtlb_load_misses[,pages_touched,ns_per_access,...]
+    if tlb.empty: return
+    d=tlb.dropna(subset=['cycles','instr','dtlb_load_misses']).copy()
+    if not d.empty:
+        d['IPC']=d['instr']/d['cycles']
+        d['dTLB_MPKI']=d['dtlb_load_misses']/(d['instr']/1000.0)
+        plt.figure()
+        for hp in sorted(d.hugepages.astype(str).unique()):
+            sub=d[d.hugepages.astype(str)==hp]
+            plt.scatter(sub['dTLB_MPKI'], sub['IPC'], label=f'pages {hp}', alpha=0.7)
+        plt.xlabel('dTLB MPKI'); plt.ylabel('IPC'); plt.legend()
+        plt.title('TLB impact: IPC vs dTLB MPKI (4K vs huge pages)')
+        plt.grid(True, linestyle=':'); plt.tight_layout()
+        plt.savefig(out[0], dpi=180)
+    # memlab tlb: latency per hop vs pages touched, one line per page backing
+    if {'pages_touched','ns_per_access'}.issubset(tlb.columns):
+        g=tlb.groupby(['hugepages','pages_touched'])['ns_per_access'].median().reset_index()
+        plt.figure()
+        for hp,sub in g.groupby('hugepages'):
+            sub=sub.sort_values('pages_touched')
+            plt.plot(sub['pages_touched'], sub['ns_per_access'], marker='o', label=f'{hp} pages')
+        plt.xscale('log', base=2)
+        plt.xlabel('4 KiB pages touched (1 line each)'); plt.ylabel('ns per access')
+        plt.title('TLB reach: latency vs pages touched by page size')
+        plt.legend(); plt.grid(True, which='both', linestyle=':'); plt.tight_layout()
+        plt.savefig(out[1], dpi=180)
+
+# 9) Core-to-core ping-pong (memlab c2c --matrix)
+def c2c_matrix(inp, P, out):
+    c2c = pd.read_csv(inp['c2c'])  # cpu,<cpu0>,<cpu1>,... median round trip ns
+    if c2c.empty: return
+    m=c2c.set_index('cpu')
+    plt.figure(figsize=(6,5))
+    plt.imshow(m.values.astype(float), cmap='viridis', origin='upper')
+    plt.colorbar(label='round trip (ns)')
+    plt.xticks(range(len(m.columns)), m.columns, fontsize=7)
+    plt.yticks(range(len(m.index)), m.index, fontsize=7)
+    plt.xlabel('responder CPU'); plt.ylabel('initiator CPU')
+    plt.title('Core-to-core cache-line round trip')
+    plt.tight_layout()
+    plt.savefig(out[0], dpi=180)
+
+def c2c_by_relation(inp, P, out):
+    c2l = pd.read_csv(inp['c2l'])  # cpu_a,cpu_b,...,relation,mode,...,roundtrip_ns
+    if c2l.empty: return
+    g=c2l.groupby('relation')['roundtrip_ns']
     plt.figure()
-    for hp in sorted(d.hugepages.unique()):
-        sub=d[d.hugepages==hp]
-        plt.scatter(sub['dTLB_MPKI'], sub['IPC'], label=f'THP {hp}', alpha=0.7)
-    plt.xlabel('dTLB MPKI'); plt.ylabel('IPC'); plt.legend()
-    plt.title('TLB impact: IPC vs dTLB MPKI (4K vs huge pages)')
-    plt.grid(True, linestyle=':'); plt.tight_layout()
-    plt.savefig(os.path.join(A.figdir,'fig_tlb_ipc_vs_mpki.png'), dpi=180)
+    plt.bar(list(g.groups.keys()), g.median().values, yerr=g.std().fillna(0).values, capsize=4)
+    plt.ylabel('round trip (ns), median over pairs'); plt.title('Coherence latency by CPU relation')
+    plt.grid(True, axis='y', linestyle=':'); plt.tight_layout()
+    plt.savefig(out[0], dpi=180)
+
+# 10) Noisy-neighbour contention (memlab contention)
+def contention(inp, P, out):
+    ct = pd.read_csv(inp['ct'])  # victim_B,victim,aggressors,agg_footprint_B,...,lat_slowdown,tput_loss_pct
+    if ct.empty: return
+    d=ct[ct.aggressors>0].groupby(['aggressors','agg_footprint_B'],as_index=False)['lat_slowdown'].median()
+    plt.figure()
+    for k,sub in d.groupby('aggressors'):
+        sub=sub.sort_values('agg_footprint_B')
+        plt.plot(sub['agg_footprint_B'], sub['lat_slowdown'], marker='o', label=f'{k} aggressor(s)')
+    plt.axvline(P['llc'], color='tab:gray', linestyle='--', alpha=0.6); plt.text(P['llc']*1.05, 1.0, 'LLC')
+    plt.axhline(1.0, color='k', linewidth=0.8)
+    plt.xscale('log', base=2)
+    plt.xlabel('Aggressor footprint per thread (bytes)'); plt.ylabel('Victim slowdown (x solo)')
+    plt.title(f'LLC contention: victim {ct.victim.iloc[0]} @ {int(ct.victim_B.iloc[0])} B')
+    plt.legend(); plt.grid(True, which='both', linestyle=':'); plt.tight_layout()
+    plt.savefig(out[0], dpi=180)
+
+# 11) Random gathers vs software-prefetch distance (memlab bw --pattern=random --prefetch_distance ...)
+def prefetch_distance(inp, P, out):
+    pf = pd.read_csv(inp['pf'])  # ...,GBps,...,prefetch_dist
+    if pf.empty or 'prefetch_dist' not in pf.columns: return
+    g=pf.groupby('prefetch_dist')['GBps'].agg(['median','std']).reset_index().sort_values('prefetch_dist')
+    best=g['median'].max()
+    sat=g[g['median']>=0.95*best].prefetch_dist.iloc[0]   # smallest distance within 5% of the best
+    x=g['prefetch_dist'].replace(0, 0.5)                   # show D=0 on the log axis
+    plt.figure()
+    plt.errorbar(x, g['median'], yerr=g['std'].fillna(0), marker='o', capsize=3)
+    plt.axvline(sat if sat>0 else 0.5, color='tab:red', linestyle='--', alpha=0.6)
+    plt.text((sat if sat>0 else 0.5)*1.1, best*0.9, f'saturates @ D={int(sat)}')
+    plt.xscale('log', base=2)
+    plt.xlabel('Prefetch distance (accesses ahead; 0 plotted at 0.5)'); plt.ylabel('GB/s')
+    plt.title('Random 64 B gathers vs software prefetch distance')
+    plt.grid(True, which='both', linestyle=':'); plt.tight_layout()
+    plt.savefig(out[0], dpi=180)
+
+def figures(A):
+    c = lambda name: os.path.join(A.csvdir, name)
+    f = lambda name: os.path.join(A.figdir, name)
+    return [
+        Figure('zeroq_cycles', zeroq_cycles, {'z': c('zeroq_latencies.csv')},
+               [c('zeroq_latencies_cycles.csv')], {'base_ghz': A.base_ghz}),
+        Figure('pattern_stride', pattern_stride, {'ps': c('pattern_stride_all.csv')},
+               [f('fig_pattern_bandwidth.png'), f('fig_pattern_latency.png')]),
+        Figure('rw_mix', rw_mix, {'rw': c('rw_mix_all.csv')}, [f('fig_rw_mix.png')]),
+        Figure('intensity_curve', intensity_curve, {'ic': c('intensity_loaded_latency.csv')},
+               [f('fig_intensity_curve.png')],
+               {'mem_mts': A.mem_mts, 'bus_bits': A.bus_bits, 'channels': A.channels}),
+        Figure('wss_transitions', wss_transitions, {'wss': c('latency_vs_wss.csv')},
+               [f('fig_wss_transitions.png')], {'l1d': A.l1d, 'l2': A.l2, 'llc': A.llc},
+               optional={'tr': c('ws_transitions.csv')}),
+        Figure('cache_ipc', cache_ipc, {'ck': c('cache_kernel_perf.csv')}, [f('fig_cache_ipc_vs_llc_mpki.png')]),
+        Figure('amat_vs_ipc', amat_vs_ipc, {'z': c('zeroq_latencies.csv'), 'ck': c('cache_kernel_perf.csv')},
+               [f('fig_amat_vs_ipc.png')], {'base_ghz': A.base_ghz, 'l1d': A.l1d, 'l2': A.l2, 'llc': A.llc}),
+        Figure('tlb_impact', tlb_impact, {'tlb': c('tlb_kernel_perf.csv')},
+               [f('fig_tlb_ipc_vs_mpki.png'), f('fig_tlb_reach.png')]),
+        Figure('c2c_matrix', c2c_matrix, {'c2c': c('c2c_matrix.csv')}, [f('fig_c2c_matrix.png')]),
+        Figure('c2c_by_relation', c2c_by_relation, {'c2l': c('c2c_latency.csv')}, [f('fig_c2c_by_relation.png')]),
+        Figure('contention', contention, {'ct': c('contention.csv')}, [f('fig_contention_slowdown.png')],
+               {'llc': A.llc}),
+        Figure('prefetch_distance', prefetch_distance, {'pf': c('bw_prefetch_sweep.csv')},
+               [f('fig_prefetch_distance.png')]),
+    ]
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--csvdir', required=True)
+    ap.add_argument('--figdir', required=True)
+    ap.add_argument('--base-ghz', type=float, required=True)
+    ap.add_argument('--mem-mts', type=int, required=True)
+    ap.add_argument('--bus-bits', type=int, required=True)
+    ap.add_argument('--channels', type=int, required=True)
+    ap.add_argument('--l1d', type=int, required=True)
+    ap.add_argument('--l2', type=int, required=True)
+    ap.add_argument('--llc', type=int, required=True)
+    ap.add_argument('--jobs', type=int, default=None, help='render processes (default: CPU count)')
+    ap.add_argument('--force', action='store_true', help='re-render even if inputs are unchanged')
+    ap.add_argument('--only', default=None, help='comma list of figure names')
+    A = ap.parse_args()
 
-print("Done.")
+    os.makedirs(A.figdir, exist_ok=True)
+    os.makedirs(A.csvdir, exist_ok=True)
+    report(build(figures(A), os.path.join(A.figdir, '.figstate.json'), A.jobs, A.force,
+                 set(A.only.split(',')) if A.only else None))
+    print("Done.")
@@ -11,7 +11,7 @@ assert need.issubset(df.columns), f"{latp} missing columns {need - set(df.column
 # Aggregate by working-set size
 g = df.groupby('bytes')['lat_ns_est'].agg(['mean','std','count']).reset_index().sort_values('bytes')
 
-# Your machine's cache sizes (bytes)
+# Your machine's cache sizes (bytes); fallback when no measured transitions exist
 L1_BYTES = 48 * 1024
 L2_BYTES = 1250 * 1024     # 1.25 MiB
 L3_BYTES = 8 * 1024 * 1024
@@ -22,10 +22,22 @@ levels = [
     ('L3',  L3_BYTES),
 ]
 
+probe = {}
+# Measured capacities from `memlab latency --adaptive --transitions ...`
+trp = "results/csv/ws_transitions.csv"
+if os.path.exists(trp):
+    tr = pd.read_csv(trp)
+    tr = tr[tr['level'].astype(str).str.match(r'L\d')]
+    if not tr.empty:
+        levels = [(r.level, int(r.transition_B)) for r in tr.itertuples()]
+        probe = {r.level: int(r.from_B) for r in tr.itertuples()}  # last size still on the plateau
+        L3_BYTES = max(x for _, x in levels)
+        print(f"using measured transitions from {trp}: " + ", ".join(f"{n}={x}" for n, x in levels))
+
 # Find the closest measured point to each level size
 rows = []
 for name, target in levels:
-    i = int((g['bytes'] - target).abs().idxmin())
+    i = int((g['bytes'] - probe.get(name, target)).abs().idxmin())
     bi = int(g.loc[i,'bytes'])
     mean_ns = float(g.loc[i,'mean'])
     std_ns  = float(g.loc[i,'std'])
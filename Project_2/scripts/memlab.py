@@ -0,0 +1,117 @@
+"""ctypes binding for libmemlab (see memlab_api.h).
+
+    with memlab.Arena(1 << 30, backing='thp', cpu=0) as a:
+        a.latency_ns(64 << 20, pattern='random')
+        a.bw_gbps(512 << 20, stride=64, rw='100R')
+
+The library is looked up in $MEMLAB_LIB, then the usual build directories.
+"""
+import ctypes, os, pathlib, sys
+
+HERE = pathlib.Path(__file__).resolve().parent
+BACKING = {'default':0, '4k':1, 'thp':2, '2m':3, '1g':4}
+PATTERN = {'seq':0, 'stride':1, 'random':2}
+RW      = {'100R':0, '100W':1, '70R30W':2, '50R50W':3}
+KERNEL  = {'touch':0, 'load':1, 'store':2, 'copy':3, 'triad':4}
+
+_lib = None
+
+def _libname():
+    if sys.platform.startswith('win'): return 'memlab.dll'
+    if sys.platform == 'darwin':       return 'libmemlab.dylib'
+    return 'libmemlab.so'
+
+def _candidates():
+    if os.environ.get('MEMLAB_LIB'):
+        yield pathlib.Path(os.environ['MEMLAB_LIB'])
+    name = _libname()
+    for d in (HERE.parent/'build', pathlib.Path.home()/'memlab-build',
+              HERE.parent/'cmake-build-release', HERE.parent/'cmake-build-debug'):
+        yield d/name
+        yield d/'Release'/name
+
+def load(path=None):
+    global _lib
+    if _lib is not None and path is None:
+        return _lib
+    tried = [pathlib.Path(path)] if path else list(_candidates())
+    for p in tried:
+        if p.exists():
+            lib = ctypes.CDLL(str(p))
+            break
+    else:
+        raise OSError("libmemlab not found (build the memlab_shared target or set MEMLAB_LIB); tried: "
+                      + ", ".join(map(str, tried)))
+    sz, c_int, c_dbl, vp = ctypes.c_size_t, ctypes.c_int, ctypes.c_double, ctypes.c_void_p
+    lib.memlab_arena_create.argtypes  = [sz, c_int, c_int];  lib.memlab_arena_create.restype = vp
+    lib.memlab_arena_destroy.argtypes = [vp];                lib.memlab_arena_destroy.restype = None
+    lib.memlab_arena_bytes.argtypes   = [vp];                lib.memlab_arena_bytes.restype = sz
+    lib.memlab_arena_anon_huge_bytes.argtypes = [vp];        lib.memlab_arena_anon_huge_bytes.restype = sz
+    lib.memlab_tsc_hz.argtypes = [];                         lib.memlab_tsc_hz.restype = c_dbl
+    lib.memlab_isa.argtypes = [];                            lib.memlab_isa.restype = ctypes.c_char_p
+    lib.memlab_latency_ns.argtypes = [vp, sz, c_int, sz, sz, sz]
+    lib.memlab_latency_ns.restype  = c_dbl
+    lib.memlab_bw_gbps.argtypes = [vp, sz, c_int, c_int, sz, c_int, c_int, c_int, c_int, sz, c_int]
+    lib.memlab_bw_gbps.restype  = c_dbl
+    lib.memlab_saxpy.argtypes = [vp, sz, sz, sz, ctypes.POINTER(c_dbl), ctypes.POINTER(c_dbl)]
+    lib.memlab_saxpy.restype  = c_int
+    if path is None:
+        _lib = lib
+    return lib
+
+def tsc_hz():
+    return load().memlab_tsc_hz()
+
+def isa():
+    return load().memlab_isa().decode()
+
+class Arena:
+    """Pinned, prefaulted mapping that every measurement runs inside."""
+
+    def __init__(self, nbytes, backing='default', cpu=-1, lib=None):
+        self.lib = lib or load()
+        self.h = self.lib.memlab_arena_create(int(nbytes), BACKING[backing], int(cpu))
+        if not self.h:
+            raise MemoryError(f"cannot map {nbytes} bytes with {backing} pages")
+        self.backing = backing
+
+    @property
+    def nbytes(self):
+        return self.lib.memlab_arena_bytes(self.h)
+
+    @property
+    def anon_huge_bytes(self):
+        return self.lib.memlab_arena_anon_huge_bytes(self.h)
+
+    def latency_ns(self, ws_bytes, pattern='random', stride_B=64, granule=64, iters=5_000_000):
+        v = self.lib.memlab_latency_ns(self.h, int(ws_bytes), PATTERN[pattern], int(stride_B), int(granule), int(iters))
+        if v < 0: raise ValueError(f"bad latency point ws={ws_bytes} granule={granule}")
+        return v
+
+    def bw_gbps(self, nbytes, threads=1, cpu0=-1, stride=64, rw='100R', random=False,
+                kernel='touch', nt=False, iters=1, rep=0):
+        v = self.lib.memlab_bw_gbps(self.h, int(nbytes), int(threads), int(cpu0), int(stride), RW[rw],
+                                    int(bool(random)), KERNEL[kernel], int(bool(nt)), int(iters), int(rep))
+        if v < 0: raise ValueError(f"bad bw point bytes={nbytes} threads={threads}")
+        return v
+
+    def saxpy(self, ws_bytes, stride=1, iters=5):
+        sec, gbps = ctypes.c_double(), ctypes.c_double()
+        if self.lib.memlab_saxpy(self.h, int(ws_bytes), int(stride), int(iters), ctypes.byref(sec), ctypes.byref(gbps)):
+            raise ValueError(f"saxpy needs 2*{ws_bytes} bytes, arena has {self.nbytes}")
+        return sec.value, gbps.value
+
+    def close(self):
+        if self.h:
+            self.lib.memlab_arena_destroy(self.h)
+            self.h = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try: self.close()
+        except Exception: pass
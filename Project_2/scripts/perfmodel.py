@@ -0,0 +1,174 @@
+"""Fitted AMAT / Little's-law CPI model from the canonical latency and counter tables.
+
+Inputs are results/csv/zeroq_latencies.csv (level,read_ns) and
+cache_kernel_perf.csv (size_B,stride_B,run_id,cycles,instr,llc_misses).
+
+Misses per kilo-instruction that go past cache level L (L1, L2, LLC) are
+
+    r_L(S, st) = apki * f_L(S, st) + r0,   f_L = min(1, st/64) * max(0, 1 - C_L/S)
+
+f_L is the fraction of accesses whose line cannot stay in a cache of C_L
+bytes while a footprint of S bytes is streamed with stride st. apki and
+r0 are fitted (non-negative) to the measured LLC MPKI. r0 holds the misses
+the footprint does not explain, and those misses pass every level. The
+stall cost of a miss past L is the zero-queue latency step to the next
+level, and overlapping misses divide it (Little's law):
+
+    CPI = CPI_core + sum_L r_L/1000 * (T_{L+1} - T_L) * GHz / MLP
+
+CPI_core and 1/MLP are a non-negative least-squares fit to the measured
+CPI. Instructions per run follow a fitted power law k * S^p * st^q, so
+runtime = instr * CPI / GHz. report() gives the training fit and a
+leave-one-point-out error, where each (size, stride) point is held out
+in turn. The leave-one-out error is the number to trust for unseen points.
+"""
+import argparse, itertools, os, sys
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+LINE = 64
+LEVELS = ("L1", "L2", "L3", "DRAM")   # zeroq_latencies.csv rows, nearest first
+
+def _nnls(X, y):
+    """Least squares with x >= 0 for a handful of columns (tries every active set)."""
+    best, best_sse = np.zeros(X.shape[1]), np.inf
+    for k in range(1, X.shape[1] + 1):
+        for cols in itertools.combinations(range(X.shape[1]), k):
+            x, *_ = np.linalg.lstsq(X[:, cols], y, rcond=None)
+            if (x < 0).any(): continue
+            sse = float(((X[:, cols] @ x - y) ** 2).sum())
+            if sse < best_sse:
+                best_sse, best = sse, np.zeros(X.shape[1])
+                best[list(cols)] = x
+    return best
+
+@dataclass
+class Model:
+    ghz: float
+    caps: tuple            # bytes of L1, L2, LLC
+    lat_ns: tuple          # zero-queue load latency of L1, L2, L3, DRAM
+    apki: float = 0.0      # footprint-driven accesses per kilo-instruction
+    r0: float = 0.0        # misses per kilo-instruction the footprint does not explain
+    cpi_core: float = 0.0
+    inv_mlp: float = 0.0
+    instr_k: float = 0.0
+    instr_p: float = 0.0
+    instr_q: float = 0.0
+
+    @property
+    def mlp(self):
+        return 1.0 / self.inv_mlp if self.inv_mlp > 0 else np.inf
+
+    def miss_fractions(self, size_B, stride_B):
+        """f_L per level (columns L1, L2, LLC) for arrays of sizes and strides."""
+        S = np.asarray(size_B, float); st = np.asarray(stride_B, float)
+        lpa = np.minimum(1.0, st / LINE)
+        return np.stack([lpa * np.clip(1.0 - c / S, 0.0, None) for c in self.caps], axis=-1)
+
+    def _stall(self, f):
+        """misses past each level (per kilo-instr) and stall cycles per instruction"""
+        r = self.apki * f + self.r0
+        step = np.diff(np.asarray(self.lat_ns, float)) * self.ghz   # L1->L2, L2->L3, L3->DRAM
+        return r, (r / 1e3 * step).sum(axis=-1)
+
+    def predict(self, size_B, stride_B):
+        """DataFrame of predicted llc_mpki, amat_ns, cpi, ipc, instr and runtime_s."""
+        S = np.asarray(size_B, float); st = np.asarray(stride_B, float)
+        r, stall = self._stall(self.miss_fractions(S, st))
+        acc = max(self.apki + self.r0, 1e-12)
+        amat = self.lat_ns[0] + (r / acc * np.diff(np.asarray(self.lat_ns, float))).sum(axis=-1)
+        cpi = self.cpi_core + stall * self.inv_mlp
+        instr = self.instr_k * S ** self.instr_p * st ** self.instr_q
+        return pd.DataFrame({"size_B": S.astype(np.int64), "stride_B": st.astype(np.int64),
+                             "llc_mpki": r[..., -1], "amat_ns": amat, "cpi": cpi, "ipc": 1.0 / cpi,
+                             "instr": instr, "runtime_s": instr * cpi / (self.ghz * 1e9)})
+
+def latencies(zeroq):
+    """(L1, L2, L3, DRAM) read latencies in ns from zeroq_latencies.csv"""
+    z = zeroq.assign(level=zeroq["level"].astype(str).str.upper()).set_index("level")["read_ns"].astype(float)
+    z = z.rename({"LLC": "L3", "MEM": "DRAM"})
+    missing = [l for l in LEVELS if l not in z.index]
+    if missing:
+        raise ValueError(f"zeroq latencies lack levels {missing} (have {list(z.index)})")
+    return tuple(float(z[l]) for l in LEVELS)
+
+def points(counters):
+    """Per-(size, stride) means of the counter table plus measured cpi / llc_mpki / runtime."""
+    ck = counters.dropna(subset=["cycles", "instr", "llc_misses"])
+    ck = ck[(ck["cycles"] > 0) & (ck["instr"] > 0)]
+    g = ck.groupby(["size_B", "stride_B"], as_index=False)[["cycles", "instr", "llc_misses"]].mean()
+    g["cpi"] = g["cycles"] / g["instr"]
+    g["llc_mpki"] = g["llc_misses"] / g["instr"] * 1e3
+    return g
+
+def fit(zeroq, counters, ghz, l1d, l2, llc):
+    """Model fitted to the zeroq table and the counter table (both DataFrames)."""
+    m = Model(ghz=float(ghz), caps=(float(l1d), float(l2), float(llc)), lat_ns=latencies(zeroq))
+    return _fit_points(m, points(counters))
+
+def _fit_points(m, g):
+    if len(g) < 2:
+        raise ValueError(f"need at least 2 (size, stride) points to fit, have {len(g)}")
+    f = m.miss_fractions(g["size_B"], g["stride_B"])
+    m.apki, m.r0 = _nnls(np.column_stack([f[:, -1], np.ones(len(g))]), g["llc_mpki"].to_numpy())
+    _, stall = m._stall(f)
+    m.cpi_core, m.inv_mlp = _nnls(np.column_stack([np.ones(len(g)), stall]), g["cpi"].to_numpy())
+    A = np.column_stack([np.ones(len(g)), np.log(g["size_B"]), np.log(g["stride_B"])])
+    (lk, m.instr_p, m.instr_q), *_ = np.linalg.lstsq(A, np.log(g["instr"]), rcond=None)
+    m.instr_k = float(np.exp(lk))
+    return m
+
+def _scores(meas, pred):
+    meas, pred = np.asarray(meas, float), np.asarray(pred, float)
+    ss = ((meas - meas.mean()) ** 2).sum()
+    return {"r2": 1.0 - ((meas - pred) ** 2).sum() / ss if ss > 0 else np.nan,
+            "rmse": float(np.sqrt(((meas - pred) ** 2).mean())),
+            "mape_%": float((np.abs(pred - meas) / np.abs(meas)).mean() * 100.0)}
+
+def report(model, counters):
+    """Fit quality per target (ipc, llc_mpki, runtime_s): training r2/rmse/mape and
+    leave-one-point-out mape (`loo_mape_%`)."""
+    g = points(counters)
+    g["ipc"], g["runtime_s"] = 1.0 / g["cpi"], g["cycles"] / (model.ghz * 1e9)
+    fitted = model.predict(g["size_B"], g["stride_B"])
+    loo = []
+    for i in range(len(g)):
+        if len(g) < 3: break
+        mi = _fit_points(Model(model.ghz, model.caps, model.lat_ns), g.drop(index=g.index[i]))
+        loo.append(mi.predict(g["size_B"].iloc[[i]], g["stride_B"].iloc[[i]]))
+    loo = pd.concat(loo, ignore_index=True) if loo else None
+    rows = []
+    for t in ("ipc", "llc_mpki", "runtime_s"):
+        s = _scores(g[t], fitted[t])
+        s["loo_mape_%"] = _scores(g[t], loo[t])["mape_%"] if loo is not None else np.nan
+        rows.append({"target": t, **s})
+    return pd.DataFrame(rows)
+
+def describe(model):
+    return (f"CPI_core={model.cpi_core:.3f}  MLP={model.mlp:.2f}  apki={model.apki:.1f}  r0={model.r0:.1f} MPKI  "
+            f"instr ~ {model.instr_k:.3g}*S^{model.instr_p:.2f}*st^{model.instr_q:.2f}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--csvdir", default="results/csv")
+    ap.add_argument("--base-ghz", type=float, default=float(os.environ.get("BASE_GHZ", 2.4)))
+    ap.add_argument("--l1d", type=int, default=int(os.environ.get("L1D_B", 49152)))
+    ap.add_argument("--l2",  type=int, default=int(os.environ.get("L2_B", 1310720)))
+    ap.add_argument("--llc", type=int, default=int(os.environ.get("LLC_B", 8192000)))
+    ap.add_argument("--predict", nargs="*", default=[], metavar="SIZE:STRIDE",
+                    help="points to predict, e.g. 16777216:64 (bytes:bytes)")
+    ap.add_argument("--out", default=None, help="write the predictions CSV here")
+    A = ap.parse_args()
+    z = pd.read_csv(os.path.join(A.csvdir, "zeroq_latencies.csv"))
+    ck = pd.read_csv(os.path.join(A.csvdir, "cache_kernel_perf.csv"))
+    m = fit(z, ck, A.base_ghz, A.l1d, A.l2, A.llc)
+    print("#", describe(m))
+    print(report(m, ck).to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    if A.predict:
+        S, st = zip(*(map(int, p.split(":")) for p in A.predict))
+        pred = m.predict(S, st)
+        print(pred.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+        if A.out: pred.to_csv(A.out, index=False)
+    elif A.out:
+        print("--out needs --predict points", file=sys.stderr)
@@ -0,0 +1,135 @@
+"""perf stat -x, logs -> typed counter table with derived metrics.
+
+One parser for the perf-stat CSV logs in the project (results/raw/perf/*.perf
+from the README collector, and older *.perf.csv logs). run_perf.sh no longer
+writes these: memlab --counters puts per-repetition counts in its own CSV.
+Lines are `value,unit,event[,stddev%],run_ns,pct_running,metric,metric_unit`.
+
+Multiplexing: when the PMU has more events than counters, perf time-slices
+them and pct_running drops below 100. By default perf stat extrapolates the
+printed value to the full run (value = raw * enabled/running), which is what
+scaling="perf" assumes. Logs recorded with `perf stat --no-scale` carry raw
+counts; scaling="apply" extrapolates them here. Either way each row keeps
+`mux`, the smallest running fraction among the events it uses, so estimated
+counts are never mistaken for exact ones; min_running drops counts measured
+for less than that fraction of the run.
+
+`<not counted>` / `<not supported>` become NaN (not 0), and the alias table
+below is the only place that maps perf event names to columns.
+"""
+import argparse, csv, glob, io, os, re, sys
+import numpy as np
+import pandas as pd
+
+# column -> perf event names, most specific first; the first one a log has wins
+ALIASES = {
+    "task_clock_ms":    ("task-clock", "cpu-clock"),
+    "cycles":           ("cycles", "cpu-cycles"),
+    "instructions":     ("instructions",),
+    "cache_refs":       ("cache-references",),
+    "cache_misses":     ("cache-misses",),
+    "llc_loads":        ("LLC-loads",),
+    "llc_misses":       ("LLC-load-misses", "LLC-loads-misses", "LLC-misses", "cache-misses"),
+    "l1d_loads":        ("L1-dcache-loads",),
+    "l1d_load_misses":  ("L1-dcache-load-misses",),
+    "dtlb_loads":       ("dTLB-loads",),
+    "dtlb_load_misses": ("dTLB-load-misses",),
+}
+def _event_name(ev):
+    """cpu_core/cycles/u -> cycles, instructions:u -> instructions"""
+    ev = ev.strip()
+    m = re.match(r"^[\w.-]+/([^/]+)/\w*$", ev)
+    if m: ev = m.group(1)
+    return re.sub(r":[ukhHGpP]+$", "", ev)
+
+def _num(s):
+    try: return float(s.replace(",", "").rstrip("%"))
+    except ValueError: return np.nan
+
+def parse_text(txt):
+    """Rows (event, value, unit, run_ns, pct_running) of one perf stat -x, log."""
+    rows = []
+    for f in csv.reader(io.StringIO(txt)):
+        if len(f) < 3 or not f[0].strip() or f[0].lstrip().startswith("#"):
+            continue
+        value, unit, event, rest = f[0].strip(), f[1].strip(), f[2], f[3:]
+        if rest and rest[0].strip().endswith("%"):   # -r N adds a stddev column
+            rest = rest[1:]
+        run_ns = _num(rest[0]) if len(rest) > 0 else np.nan
+        pct    = _num(rest[1]) if len(rest) > 1 and rest[1].strip() else 100.0
+        rows.append((_event_name(event), np.nan if value.startswith("<") else _num(value), unit, run_ns, pct))
+    return rows
+
+def read_long(paths):
+    """All logs in `paths` (files, directories or globs) as one long frame:
+    file, event, value, unit, run_ns, pct_running."""
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(glob.glob(os.path.join(p, "*.perf")) + glob.glob(os.path.join(p, "*.perf.csv")))
+        elif any(ch in p for ch in "*?["):
+            files += sorted(glob.glob(p))
+        else:
+            files.append(p)
+    cols = {k: [] for k in ("file", "event", "value", "unit", "run_ns", "pct_running")}
+    for path in files:
+        with open(path, errors="ignore") as fh:
+            rows = parse_text(fh.read())
+        cols["file"] += [path] * len(rows)
+        for k, v in zip(("event", "value", "unit", "run_ns", "pct_running"), zip(*rows) if rows else ((),) * 5):
+            cols[k] += list(v)
+    df = pd.DataFrame(cols)
+    return df.astype({"value": "float64", "run_ns": "float64", "pct_running": "float64"})
+
+def table(long, scaling="perf", min_running=0.0):
+    """One row per file: counts per ALIASES column (float64, NaN if absent or
+    not counted), `mux`, and derived IPC / MPKI / miss ratios."""
+    if scaling not in ("perf", "apply"):
+        raise ValueError(f"scaling must be 'perf' or 'apply', not {scaling!r}")
+    d = long.copy()
+    frac = (d["pct_running"] / 100.0).clip(upper=1.0)
+    if scaling == "apply":
+        d["value"] = d["value"] / frac.where(frac > 0)
+    d.loc[frac < min_running, "value"] = np.nan
+    d["frac"] = frac.where(d["value"].notna())   # mux only over counts actually used
+    g = d.groupby(["file", "event"], sort=False)   # hybrid PMUs print an event once per core type
+    val, frac = g["value"].sum(min_count=1).unstack(), g["frac"].min().unstack()
+    files = pd.Index(d["file"].unique(), name="file")
+    out = pd.DataFrame(index=files)
+    used = pd.DataFrame(index=files)
+    for col, names in ALIASES.items():
+        v = pd.Series(np.nan, index=files); f = pd.Series(np.nan, index=files)
+        for ev in names:   # first alias with a value wins, per file
+            if ev in val.columns:
+                take = v.isna() & val[ev].reindex(files).notna()
+                v[take] = val[ev].reindex(files)[take]; f[take] = frac[ev].reindex(files)[take]
+        out[col], used[col] = v.astype("float64"), f
+    out["mux"] = used.min(axis=1)
+    div = lambda a, b: (a / b.where(b > 0)).astype("float64")
+    out["ipc"]              = div(out["instructions"], out["cycles"])
+    kinst                   = out["instructions"] / 1e3
+    out["llc_mpki"]         = div(out["llc_misses"], kinst)
+    out["l1d_mpki"]         = div(out["l1d_load_misses"], kinst)
+    out["dtlb_mpki"]        = div(out["dtlb_load_misses"], kinst)
+    out["cache_miss_ratio"] = div(out["cache_misses"], out["cache_refs"])
+    out["llc_miss_ratio"]   = div(out["llc_misses"], out["llc_loads"])
+    out["dtlb_miss_ratio"]  = div(out["dtlb_load_misses"], out["dtlb_loads"])
+    return out.reset_index()
+
+def read(paths, scaling="perf", min_running=0.0):
+    """read_long + table"""
+    return table(read_long(paths), scaling, min_running)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("paths", nargs="+", help="perf logs, directories of them, or globs")
+    ap.add_argument("--scaling", choices=("perf", "apply"), default="perf",
+                    help="'apply' for logs recorded with perf stat --no-scale")
+    ap.add_argument("--min-running", type=float, default=0.0,
+                    help="drop counts that ran for less than this fraction of the run")
+    ap.add_argument("--out", default=None, help="CSV to write (default: stdout)")
+    A = ap.parse_args()
+    t = read(A.paths, A.scaling, A.min_running)
+    if (t["mux"] < 1.0).any():
+        print(f"# {int((t['mux'] < 1.0).sum())} of {len(t)} logs were multiplexed (see mux)", file=sys.stderr)
+    t.to_csv(A.out or sys.stdout, index=False)
@@ -1,9 +1,16 @@
-import os, glob
+import argparse, os, re, sys
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')   # renderers run in worker processes
 import matplotlib.pyplot as plt
 
-os.makedirs("plots", exist_ok=True)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from figgraph import Figure, build, report
+import saturation
+
+# Paths are relative to Project_2/ (run as `python3 scripts/plot_all.py` from there).
+# Each renderer gets inp (role -> path, or list of paths for globs), P and out.
 
 def read_csv_safe(p):
     return pd.read_csv(p) if os.path.exists(p) else pd.DataFrame()
@@ -13,8 +20,9 @@ def mean_std(df, key, val):
     return g
 
 # -------- 1) Zero-queue latency vs working set --------
-lat = read_csv_safe("results/lat/latency_ws.csv")
-if not lat.empty and {'bytes','lat_ns_est'}.issubset(lat.columns):
+def latency_vs_ws(inp, P, out):
+    lat = read_csv_safe(inp['lat'])
+    if lat.empty or not {'bytes','lat_ns_est'}.issubset(lat.columns): return
     g = mean_std(lat, 'bytes', 'lat_ns_est')
     plt.figure()
     plt.errorbar(g['bytes'], g['mean'], yerr=g['std'], marker='o')
@@ -23,19 +31,19 @@ if not lat.empty and {'bytes','lat_ns_est'}.issubset(lat.columns):
     # optional cache-size guides; tweak for your CPU if you want
     for cap in [32*1024, 256*1024, 20*1024*1024]:
         plt.axvline(cap, ls='--', alpha=0.4)
-    plt.tight_layout(); plt.savefig('plots/latency_vs_ws.png', dpi=180)
+    plt.tight_layout(); plt.savefig(out[0], dpi=180)
 
 # -------- 2) Pattern × stride (seq/random × 64/256/1024B; 100%R) --------
-frames=[]
-for S in [64,256,1024]:
-    for pat in ['seq','random']:
-        f=f"results/bw/bw_{pat}_{S}_100R.csv"
-        d=read_csv_safe(f)
+def bw_stride_matrix(inp, P, out):
+    frames=[]
+    for f in inp['bw']:   # bw_<pattern>_<stride>_100R.csv
+        m = re.match(r'bw_(seq|random)_(\d+)_100R\.csv$', os.path.basename(f))
+        d = read_csv_safe(f) if m else pd.DataFrame()
         if not d.empty:
-            d['label']=f"{pat}-{S}B"
+            d['label']=f"{m.group(1)}-{m.group(2)}B"
             frames.append(d)
-bw = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-if not bw.empty:
+    bw = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if bw.empty: return
     xcol = 'stride_B' if 'stride_B' in bw.columns else 'stride'
     if {'GBps', xcol}.issubset(bw.columns):
         plt.figure()
@@ -45,82 +53,62 @@ if not bw.empty:
         plt.xscale('log'); plt.xlabel('Stride (bytes)'); plt.ylabel('Throughput (GB/s)')
         plt.title('Bandwidth vs stride (seq vs random, 100% reads)')
         plt.legend(); plt.grid(True, which='both'); plt.tight_layout()
-        plt.savefig('plots/bw_stride_matrix.png', dpi=180)
+        plt.savefig(out[0], dpi=180)
 
 # -------- 3) Read/Write mix @64B stride --------
-mix_frames=[]
-for mix in ['100R','100W','70R30W','50R50W']:
-    d=read_csv_safe(f"results/bw/mix_{mix}.csv")
-    if not d.empty:
-        d['mix']=mix
-        mix_frames.append(d)
-mixdf = pd.concat(mix_frames, ignore_index=True) if mix_frames else pd.DataFrame()
-if not mixdf.empty and 'GBps' in mixdf.columns:
+def bw_rw_mix(inp, P, out):
+    mix_frames=[]
+    for f in inp['mix']:   # mix_<mix>.csv
+        mix = os.path.basename(f)[len('mix_'):-len('.csv')]
+        d=read_csv_safe(f)
+        if not d.empty:
+            d['mix']=mix
+            mix_frames.append(d)
+    mixdf = pd.concat(mix_frames, ignore_index=True) if mix_frames else pd.DataFrame()
+    if mixdf.empty or 'GBps' not in mixdf.columns: return
     plt.figure()
     order=['100R','100W','70R30W','50R50W']
     means=[mixdf[mixdf['mix']==m]['GBps'].mean() if (mixdf['mix']==m).any() else np.nan for m in order]
     plt.bar(order, means)
     plt.xlabel('Read/Write mix'); plt.ylabel('Throughput (GB/s)')
     plt.title('Bandwidth vs R/W mix (stride 64B, 1 thread)')
-    plt.grid(axis='y'); plt.tight_layout(); plt.savefig('plots/bw_rw_mix.png', dpi=180)
+    plt.grid(axis='y'); plt.tight_layout(); plt.savefig(out[0], dpi=180)
 
 # -------- 4) Intensity sweep: throughput vs threads --------
-ints=[]
-for f in sorted(glob.glob("results/bw/intensity_T*.csv")):
-    d=read_csv_safe(f)
-    if not d.empty: ints.append(d)
-ints = pd.concat(ints, ignore_index=True) if ints else pd.DataFrame()
-if not ints.empty and {'threads','GBps'}.issubset(ints.columns):
+def intensity_threads(inp, P, out):
+    ints=[]
+    for f in inp['ints']:
+        d=read_csv_safe(f)
+        if not d.empty: ints.append(d)
+    ints = pd.concat(ints, ignore_index=True) if ints else pd.DataFrame()
+    if ints.empty or not {'threads','GBps'}.issubset(ints.columns): return
     g = mean_std(ints, 'threads', 'GBps')
     plt.figure()
     plt.plot(g['threads'], g['mean'], marker='o')
     plt.xlabel('Threads'); plt.ylabel('Throughput (GB/s)')
     plt.title('Intensity sweep (throughput vs threads)')
-    plt.grid(True); plt.tight_layout(); plt.savefig('plots/intensity_threads.png', dpi=180)
+    plt.grid(True); plt.tight_layout(); plt.savefig(out[0], dpi=180)
 
 # -------- 5) perf (WSL-friendly): cache miss % and dTLB MPKI --------
-def parse_perf_csv(path):
-    if not os.path.exists(path): return None
-    rows=[]
-    with open(path) as f:
-        for line in f:
-            parts=line.strip().split(',')
-            if len(parts) < 4: 
-                continue
-            # format: value,unit,?,event
-            try:
-                val=float(parts[0]); event=parts[3]
-                rows.append((event,val))
-            except:
-                pass
-    return dict(rows)
-
-cases = {
-    'local': 'results/perf/saxpy_local.perf.csv',
-    'random': 'results/perf/saxpy_random.perf.csv',
-    'tlb_span16': 'results/perf/saxpy_tlb_span16.perf.csv',
-    'tlb_span16_huge': 'results/perf/saxpy_tlb_span16_huge.perf.csv',
-}
-perf_data = {k: parse_perf_csv(v) for k,v in cases.items() if os.path.exists(v)}
-if perf_data:
-    def ratio(d, num, den):
-        if not d: return np.nan
-        n = d.get(num, np.nan); de = d.get(den, np.nan)
-        return (n/de*100.0) if np.isfinite(n) and np.isfinite(de) and de>0 else np.nan
-    def mpki(d, num):
-        if not d: return np.nan
-        n = d.get(num, np.nan); inst = d.get('instructions', np.nan)
-        return (n/(inst/1e3)) if np.isfinite(n) and np.isfinite(inst) and inst>0 else np.nan
-
-    rows=[]
-    for name,d in perf_data.items():
-        rows.append({
-            'case': name,
-            'cache_miss_%': ratio(d,'cache-misses','cache-references'),
-            'dtlb_mpki':    mpki(d,'dTLB-load-misses'),
-        })
+PERF_CASES = ['local', 'random', 'tlb_span16', 'tlb_span16_huge']
+
+def perf_cache_tlb(inp, P, out):
+    # run_perf.sh: memlab kernel --counters rows, one per repetition, each event with its <event>_mux
+    rows = []
+    for case in PERF_CASES:
+        if case not in inp: continue
+        d = pd.read_csv(inp[case])
+        need = ['cache_references', 'cache_misses', 'dTLB_load_misses', 'instructions']
+        if d.empty or not set(need).issubset(d.columns): continue
+        m = d[need].mean()
+        rows.append({'case': case,
+                     'cache_miss_%': m['cache_misses'] / m['cache_references'] * 100.0 if m['cache_references'] > 0 else np.nan,
+                     'dtlb_mpki': m['dTLB_load_misses'] / m['instructions'] * 1e3 if m['instructions'] > 0 else np.nan,
+                     # mux < 1: the kernel scaled a multiplexed count up to the full repetition
+                     'mux': d[[c + '_mux' for c in need if c + '_mux' in d.columns]].min().min()})
+    if not rows: return
     perfd = pd.DataFrame(rows).fillna(0)
-    perfd.to_csv('results/perf/summary_wsl.csv', index=False)
+    perfd.to_csv(out[1], index=False)
 
     fig, ax1 = plt.subplots()
     idx = np.arange(len(perfd))
@@ -133,47 +121,35 @@ if perf_data:
     ax1.set_title('perf: cache miss % (bars) and dTLB MPKI (line)')
     h1,l1=ax1.get_legend_handles_labels(); h2,l2=ax2.get_legend_handles_labels()
     ax1.legend(h1+h2, l1+l2, loc='best')
-    fig.tight_layout(); fig.savefig('plots/perf_cache_tlb_wsl.png', dpi=180)
-
-    # ---- Intensity: throughput vs latency (knee) ----
-ints = pd.concat([pd.read_csv(p) for p in sorted(glob.glob("results/bw/intensity_T*.csv"))], ignore_index=True) \
-        if glob.glob("results/bw/intensity_T*.csv") else pd.DataFrame()
-if not ints.empty and {'GBps','lat_est_ns','threads'}.issubset(ints.columns):
-    g = ints.groupby('threads')[['GBps','lat_est_ns']].mean().reset_index()
-    # single curve: x = latency, y = throughput
-    plt.figure()
-    plt.plot(g['lat_est_ns'], g['GBps'], marker='o')
-    # mark knee: simple heuristic = point with max curvature in (lat, gbps)
-    if len(g) >= 3:
-      x, y = g['lat_est_ns'].to_numpy(), g['GBps'].to_numpy()
-      # discrete curvature proxy
-      kappa = []
-      for i in range(1,len(x)-1):
-          dx1, dy1 = x[i]-x[i-1], y[i]-y[i-1]
-          dx2, dy2 = x[i+1]-x[i], y[i+1]-y[i]
-          cross = abs(dx1*dy2 - dy1*dx2)
-          norm  = (dx1*dx1+dy1*dy1)**0.5 * (dx2*dx2+dy2*dy2)**0.5
-          kappa.append(cross/(norm+1e-12))
-      knee_i = 1 + int(np.argmax(kappa))
-      plt.scatter([x[knee_i]],[y[knee_i]], s=80)
-      plt.annotate(f'knee @ T={int(g.loc[knee_i,"threads"])}',
-                   (x[knee_i],y[knee_i]), xytext=(10,10), textcoords='offset points')
-    plt.xlabel('Loaded latency (ns)'); plt.ylabel('Throughput (GB/s)')
-    plt.title('Throughput vs latency (intensity sweep)')
-    plt.grid(True); plt.tight_layout(); plt.savefig('plots/intensity_knee.png', dpi=180)
-
+    fig.tight_layout(); fig.savefig(out[0], dpi=180)
+
+# ---- Intensity: throughput vs latency (knee) ----
+def intensity_knee(inp, P, out):
+    ints = pd.concat([pd.read_csv(p) for p in inp['ints']], ignore_index=True)
+    if not ints.empty and {'GBps','lat_est_ns','threads'}.issubset(ints.columns):
+        g = ints.groupby('threads')[['GBps','lat_est_ns']].mean().reset_index()
+        # single curve: x = latency, y = throughput
+        plt.figure()
+        plt.plot(g['lat_est_ns'], g['GBps'], marker='o')
+        # knee of the Little's-law bound, bootstrapped over the repetitions (scripts/saturation.py)
+        if len(g) >= 2:
+          k = saturation.knee_frame(ints, 'threads', 'GBps')
+          knee_i = saturation.nearest(g['threads'], k)
+          x, y = g['lat_est_ns'].to_numpy(), g['GBps'].to_numpy()
+          plt.axhline(k.x_max, ls=':', color='gray', lw=1)
+          if k.found: plt.scatter([x[knee_i]],[y[knee_i]], s=80)
+          plt.annotate(k.label('T'), (x[knee_i],y[knee_i]), xytext=(10,-15), textcoords='offset points')
+        plt.xlabel('Loaded latency (ns)'); plt.ylabel('Throughput (GB/s)')
+        plt.title('Throughput vs latency (intensity sweep)')
+        plt.grid(True); plt.tight_layout(); plt.savefig(out[0], dpi=180)
 
 # -------- 6) Runtime-only view for cache/TLB impact (always works) --------
-def runt_plot():
-    cases = [
-        ("local",  "results/kernel/saxpy_local.csv"),
-        ("random", "results/kernel/saxpy_random.csv"),
-        ("tlb_span16", "results/kernel/saxpy_tlb_span16.csv"),
-        ("tlb_span16_huge", "results/kernel/saxpy_tlb_span16_huge.csv"),
-    ]
+def kernel_runtime(inp, P, out):
+    found = {os.path.basename(p)[len('saxpy_'):-len('.csv')]: p for p in inp['saxpy']}
     rows=[]
-    for name, p in cases:
-        df = read_csv_safe(p)
+    for name in ['local', 'random', 'tlb_span16', 'tlb_span16_huge']:
+        if name not in found: continue
+        df = read_csv_safe(found[name])
         if not df.empty and 'sec' in df.columns:
             rows.append((name, df['sec'].mean()))
     if rows:
@@ -181,18 +157,59 @@ def runt_plot():
         plt.figure()
         plt.bar(df['case'], df['sec'])
         plt.ylabel('Runtime (s)'); plt.title('SAXPY runtime by case (cache/TLB impact)')
-        plt.grid(axis='y'); plt.tight_layout(); plt.savefig('plots/kernel_runtime.png', dpi=180)
-# ---- Latency table with cycles (export CSV) ----
-lat = read_csv_safe("results/lat/latency_ws.csv")
-if not lat.empty and {'bytes','lat_ns_est'}.issubset(lat.columns):
-    g = mean_std(lat, 'bytes', 'lat_ns_est')
-    # allow CPU_HZ env to convert to cycles; else assume 3.5 GHz
-    HZ = float(os.environ.get('CPU_HZ', '3.5e9'))
-    g['cycles_mean'] = g['mean'] * 1e-9 * HZ
-    g['cycles_std']  = g['std']  * 1e-9 * HZ
-    g.rename(columns={'bytes':'working_set_bytes','mean':'latency_ns_mean','std':'latency_ns_std'}, inplace=True)
-    g.to_csv('results/lat/latency_table.csv', index=False)
+        plt.grid(axis='y'); plt.tight_layout(); plt.savefig(out[0], dpi=180)
+
+# -------- 7) Irregular kernels: ns/access vs working set, one panel per kernel --------
+def kernel_irregular(inp, P, out):
+    files = inp['irr']
+    df = pd.concat([read_csv_safe(p) for p in files], ignore_index=True) if files else pd.DataFrame()
+    if df.empty or not {'type','dist','ws_bytes','ns_per_access'}.issubset(df.columns):
+        return
+    types = [t for t in ('gather','scatter','spmv','hashprobe') if t in set(df['type'])]
+    fig, axes = plt.subplots(1, len(types), figsize=(4*len(types), 3.5), sharey=True, squeeze=False)
+    for ax, t in zip(axes[0], types):
+        for d, g in df[df['type'] == t].groupby('dist'):
+            m = g.groupby('ws_bytes')['ns_per_access'].median()
+            ax.plot(m.index, m.values, marker='o', label=d)
+        ax.set_xscale('log', base=2); ax.set_yscale('log')
+        ax.set_title(t); ax.set_xlabel('Working set (bytes)'); ax.grid(True, which='both', linestyle=':')
+    axes[0][0].set_ylabel('ns per access'); axes[0][0].legend()
+    fig.suptitle('Irregular kernels vs working set and index distribution')
+    fig.tight_layout(); fig.savefig(out[0], dpi=180)
 
+# ---- Latency table with cycles (export CSV) ----
+def latency_table(inp, P, out):
+    lat = read_csv_safe(inp['lat'])
+    if not lat.empty and {'bytes','lat_ns_est'}.issubset(lat.columns):
+        g = mean_std(lat, 'bytes', 'lat_ns_est')
+        # allow CPU_HZ env to convert to cycles; else assume 3.5 GHz
+        HZ = float(P['cpu_hz'])
+        g['cycles_mean'] = g['mean'] * 1e-9 * HZ
+        g['cycles_std']  = g['std']  * 1e-9 * HZ
+        g.rename(columns={'bytes':'working_set_bytes','mean':'latency_ns_mean','std':'latency_ns_std'}, inplace=True)
+        g.to_csv(out[0], index=False)
+
+def figures():
+    return [
+        Figure('latency_vs_ws', latency_vs_ws, {'lat': 'results/lat/latency_ws.csv'}, ['plots/latency_vs_ws.png']),
+        Figure('bw_stride_matrix', bw_stride_matrix, {'bw': 'results/bw/bw_*_100R.csv'}, ['plots/bw_stride_matrix.png']),
+        Figure('bw_rw_mix', bw_rw_mix, {'mix': 'results/bw/mix_*.csv'}, ['plots/bw_rw_mix.png']),
+        Figure('intensity_threads', intensity_threads, {'ints': 'results/bw/intensity_T*.csv'}, ['plots/intensity_threads.png']),
+        Figure('perf_cache_tlb', perf_cache_tlb, {}, ['plots/perf_cache_tlb_wsl.png', 'results/perf/summary_wsl.csv'],
+               optional={c: f'results/perf/saxpy_{c}.csv' for c in PERF_CASES}),
+        Figure('intensity_knee', intensity_knee, {'ints': 'results/bw/intensity_T*.csv'}, ['plots/intensity_knee.png']),
+        Figure('kernel_runtime', kernel_runtime, {'saxpy': 'results/kernel/saxpy_*.csv'}, ['plots/kernel_runtime.png']),
+        Figure('kernel_irregular', kernel_irregular, {'irr': 'results/kernel/irregular_*.csv'}, ['plots/kernel_irregular.png']),
+        Figure('latency_table', latency_table, {'lat': 'results/lat/latency_ws.csv'}, ['results/lat/latency_table.csv'],
+               {'cpu_hz': os.environ.get('CPU_HZ', '3.5e9')}),
+    ]
 
-runt_plot()
-print("Saved plots to plots/.")
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--jobs', type=int, default=None, help='render processes (default: CPU count)')
+    ap.add_argument('--force', action='store_true', help='re-render even if inputs are unchanged')
+    ap.add_argument('--only', default=None, help='comma list of figure names')
+    A = ap.parse_args()
+    os.makedirs("plots", exist_ok=True)
+    report(build(figures(), 'plots/.figstate.json', A.jobs, A.force, set(A.only.split(',')) if A.only else None))
+    print("Saved plots to plots/.")
@@ -18,7 +18,11 @@ mkdir -p "$CSV" "$FIG" "$ROOT/results/raw/perf" "$ROOT/results/logs"
 
 # Use current venv if active; else try system python3
 PY="$(command -v python || command -v python3)"
-"$PY" scripts/make_all_plots.py \
+# Figures whose input CSVs are unchanged are skipped; JOBS=n caps the render
+# processes, FORCE=1 re-renders everything.
+BUILD=(${JOBS:+--jobs "$JOBS"})
+[ "${FORCE:-0}" = 1 ] && BUILD+=(--force)
+"$PY" scripts/make_all_plots.py ${BUILD[@]+"${BUILD[@]}"} \
   --csvdir "$CSV" \
   --figdir "$FIG" \
   --base-ghz "$BASE_GHZ" \
@@ -26,5 +30,6 @@ PY="$(command -v python || command -v python3)"
   --bus-bits "$BUS_WIDTH_BITS" \
   --channels "$CHANNELS" \
   --l1d "$L1D_B" --l2 "$L2_B" --llc "$LLC_B"
+"$PY" scripts/plot_all.py ${BUILD[@]+"${BUILD[@]}"}
 
 echo "All figures written to $FIG/"
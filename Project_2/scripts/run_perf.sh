@@ -5,18 +5,21 @@ BIN="$HOME/memlab-build/memlab"
 CPU="0"
 mkdir -p "$SRC/results/perf"
 
+# Counters are opened in-process and enabled only around each timed repetition,
+# so allocation/prefault/init are excluded and every CSV row carries its own counts
+# (plus <event>_mux = time_running/time_enabled when the PMU multiplexes).
 EVENTS="task-clock,cycles,instructions,cache-references,cache-misses,dTLB-load-misses"
 
-sudo perf stat -x, -o "$SRC/results/perf/saxpy_local.perf.csv" \
-  -e $EVENTS -- taskset -c $CPU "$BIN" kernel --n 67108864 --reps 5 >/dev/null || true
+taskset -c $CPU "$BIN" kernel --n 67108864 --reps 5 --counters=$EVENTS \
+  > "$SRC/results/perf/saxpy_local.csv" || true
 
-sudo perf stat -x, -o "$SRC/results/perf/saxpy_random.perf.csv" \
-  -e $EVENTS -- taskset -c $CPU "$BIN" kernel --n 268435456 --random --reps 5 >/dev/null || true
+taskset -c $CPU "$BIN" kernel --n 268435456 --random --reps 5 --counters=$EVENTS \
+  > "$SRC/results/perf/saxpy_random.csv" || true
 
-sudo perf stat -x, -o "$SRC/results/perf/saxpy_tlb_span16.perf.csv" \
-  -e $EVENTS -- taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --reps 5 >/dev/null || true
+taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --reps 5 --counters=$EVENTS \
+  > "$SRC/results/perf/saxpy_tlb_span16.csv" || true
 
-sudo perf stat -x, -o "$SRC/results/perf/saxpy_tlb_span16_huge.perf.csv" \
-  -e $EVENTS -- taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --huge --reps 5 >/dev/null || true
+taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --huge --reps 5 --counters=$EVENTS \
+  > "$SRC/results/perf/saxpy_tlb_span16_huge.csv" || true
 
-echo "perf CSVs saved under results/perf/."
+echo "per-rep counter CSVs saved under results/perf/."
@@ -6,18 +6,36 @@ BIN="$HOME/memlab-build/memlab"      # built on ext4
 CPU="0"                              # single-thread pin
 THREADSET="0-7"                      # adjust to your cores
 
-mkdir -p "$SRC/results"/{lat,bw,kernel,perf,mlc}
+mkdir -p "$SRC/results"/{lat,bw,kernel,perf,mlc,csv}
 
 echo "[build]"
 cmake -S "$SRC" -B "$HOME/memlab-build" -G Ninja -DCMAKE_BUILD_TYPE=Release >/dev/null
 cmake --build "$HOME/memlab-build" -j >/dev/null
 
+# Steps 1, 2, 3, 6 and 7 can also run in one process over a single prefaulted
+# arena (same CSVs, no per-point start-up/page faults):
+#   MEMLAB_LIB="$HOME/memlab-build/libmemlab.so" python3 scripts/sweep_inproc.py --out "$SRC/results" --cpu $CPU
+
 # 1) Zero-queue latency vs working set
 echo "[1/7] latency sweep (8KB→512MB)"
 taskset -c $CPU "$BIN" latency \
-  --min_kb 8 --max_mb 512 --stride 64 --iters 5000000 --reps 5 \
+  --min_kb 8 --max_mb 512 --stride 64 --iters 5000000 --reps 5 --hist \
   > "$SRC/results/lat/latency_ws.csv"
 
+# 1b) Memory-level parallelism: K=1..16 interleaved chains per working set
+echo "[1b/7] MLP sweep (chains 1..16)"
+taskset -c $CPU "$BIN" latency \
+  --min_kb 8 --max_mb 512 --stride 64 --iters 5000000 --reps 3 --chains=16 \
+  > "$SRC/results/lat/latency_mlp.csv"
+
+# 1c) Adaptive working-set sweep: coarse pass + bisection around latency steps;
+#     detected capacities label the plots instead of hard-coded cache sizes
+echo "[1c/7] adaptive working-set sweep"
+taskset -c $CPU "$BIN" latency --adaptive \
+  --min_kb 8 --max_mb 512 --stride 64 --iters 5000000 --reps 5 \
+  --transitions "$SRC/results/csv/ws_transitions.csv" \
+  > "$SRC/results/lat/latency_ws_adaptive.csv"
+
 # 2) Pattern × stride (seq/random × 64/256/1024B) 100% reads
 echo "[2/7] pattern × stride"
 for S in 64 256 1024; do
@@ -28,6 +46,12 @@ for S in 64 256 1024; do
   done
 done
 
+# 2b) Random gathers vs software-prefetch distance (offsets precomputed outside the timed loop)
+echo "[2b/7] random prefetch-distance sweep"
+taskset -c $CPU "$BIN" bw --bytes 1073741824 --threads 1 --stride 64 --reps 5 --100R --pattern=random \
+  --prefetch_distance 0,1,2,4,8,16,32,64,128,256 \
+  > "$SRC/results/csv/bw_prefetch_sweep.csv"
+
 # 3) Read/Write mix @64B
 echo "[3/7] R/W mix"
 for MIX in 100R 100W 70R30W 50R50W; do
@@ -35,13 +59,39 @@ for MIX in 100R 100W 70R30W 50R50W; do
     > "$SRC/results/bw/mix_${MIX}.csv"
 done
 
-# 4) Intensity sweep (throughput vs threads)
+# 4) Intensity sweep (throughput vs threads): barrier start, 2 s wall-clock runs,
+#    aggregate bytes sampled every 10 ms (time series shows turbo/thermal decay)
 echo "[4/7] intensity sweep"
 for T in 1 2 4 8; do
-  taskset -c $THREADSET "$BIN" bw --bytes 1073741824 --threads $T --stride 64 --reps 5 --100R \
+  taskset -c $THREADSET "$BIN" bw --bytes 1073741824 --threads $T --cpu0 0 --stride 64 --reps 5 --100R \
+    --duration_ms 2000 --sample_ms 10 --warm_ms 200 --series "$SRC/results/bw/intensity_T${T}_series.csv" \
     > "$SRC/results/bw/intensity_T${T}.csv"
 done
 
+# 4b) Loaded latency: pinned probe + traffic threads, delay swept idle → saturation (MLC-free)
+echo "[4b/7] loaded latency"
+"$BIN" loaded --bytes 1073741824 --probe_mb 256 --cpu $CPU --threads 7 --max_delay 4096 --reps 3 --100R \
+  > "$SRC/results/csv/intensity_loaded_latency.csv"
+
+# 4c) Achievable DRAM bandwidth: full-line vector kernels (compare with theoretical peak)
+echo "[4c/7] streaming kernels"
+for K in load store copy triad; do
+  for NT in "" --nt; do
+    taskset -c $THREADSET "$BIN" bw --bytes 1073741824 --threads 4 --reps 5 --iters 4 --kernel=$K $NT \
+      > "$SRC/results/bw/kernel_${K}${NT:+_nt}.csv"
+  done
+done
+
+# 4d) Core-to-core coherence latency (cache-line ping-pong over every CPU pair)
+echo "[4d/7] core-to-core ping-pong"
+"$BIN" c2c --mode=cas --iters 100000 --reps 5 --matrix "$SRC/results/csv/c2c_matrix.csv" \
+  > "$SRC/results/csv/c2c_latency.csv"
+
+# 4e) Noisy neighbour: victim chase just under LLC vs aggressors on other physical cores
+echo "[4e/7] LLC contention"
+"$BIN" contention --cpu $CPU --victim=chase --min_agg_kb 256 --max_agg_kb 262144 --reps 3 \
+  > "$SRC/results/csv/contention.csv"
+
 # 5) Working-set transitions covered by (1).
 
 # 6) Kernel microbenchmark (cache-miss impact)
@@ -49,11 +99,26 @@ echo "[6/7] kernel cache-miss impact"
 taskset -c $CPU "$BIN" kernel --n 67108864  --reps 5 > "$SRC/results/kernel/saxpy_local.csv"
 taskset -c $CPU "$BIN" kernel --n 268435456 --random --reps 5 > "$SRC/results/kernel/saxpy_random.csv"
 
+# 6b) Irregular kernels (gather/scatter/CSR SpMV/hash probe) vs working set and index distribution
+echo "[6b/7] irregular kernels"
+for T in gather scatter spmv hashprobe; do
+  for D in uniform zipf clustered; do
+    OUTK="$SRC/results/kernel/irregular_${T}_${D}.csv"; : > "$OUTK"
+    for WS in 65536 1048576 16777216 268435456 1073741824; do
+      taskset -c $CPU "$BIN" kernel --type=$T --dist=$D --ws_bytes $WS --reps 3 --iters 3 \
+        | { [ -s "$OUTK" ] && tail -n +2 || cat; } >> "$OUTK"
+    done
+  done
+done
+
 # 7) TLB impact (page_span + huge)
 echo "[7/7] kernel TLB impact"
 taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --reps 5 \
   > "$SRC/results/kernel/saxpy_tlb_span16.csv"
 taskset -c $CPU "$BIN" kernel --ws_bytes 1073741824 --stride 1 --page_span 16 --huge --reps 5 \
   > "$SRC/results/kernel/saxpy_tlb_span16_huge.csv"
+# TLB reach with explicit page backing (2m/1g need vm.nr_hugepages / hugepagesz=1G; skipped otherwise)
+taskset -c $CPU "$BIN" tlb --min_pages 16 --max_pages 262144 --pages 4k,thp,2m,1g --reps 3 \
+  --out "$SRC/results/csv/tlb_kernel_perf.csv"
 
 echo "All sweeps complete. CSVs in results/."
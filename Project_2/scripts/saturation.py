@@ -0,0 +1,129 @@
+"""Throughput-latency knee (optimal concurrency) with bootstrap confidence intervals.
+
+Shared by the memlab intensity figures (Project_2 make_all_plots.py,
+scripts/plot_all.py) and the fio queue-depth sweeps (Project_3/plot_all.py).
+
+Model: below saturation each extra request in flight adds throughput at the
+light-load latency R0. Past it, throughput is capped at Xmax and only
+latency grows. That gives the Little's-law bound
+
+    X(N) = Xmax * min(N / N*, 1),   N* = Xmax * R0
+
+and N* is the knee: the least concurrency (threads, queue depth,
+outstanding lines) that reaches the plateau, so more concurrency only adds
+queueing delay. The change point N* is found by exhaustive search on a
+log grid over the measured range, and Xmax then has a closed form.
+
+The runs at each concurrency level are resampled with replacement to
+bootstrap the knee. The reported CI is the percentile interval of N*
+(left NaN when no knee is found).
+`saturated` is False when the knee sits at the largest level measured,
+which means the sweep never saturated and N* is a lower bound at best.
+`found` is False when the hockey stick does not beat a flat line by an
+F-test at the 5% level: the sweep was already on the plateau at its
+smallest level, so there is no knee to report.
+"""
+import math
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Knee:
+    n: float                 # knee concurrency N*
+    x_max: float             # plateau throughput
+    r0: float                # implied light-load latency N*/Xmax (in the units of n/x)
+    n_lo: float = math.nan   # bootstrap CI of N*
+    n_hi: float = math.nan
+    x_lo: float = math.nan   # bootstrap CI of Xmax
+    x_hi: float = math.nan
+    saturated: bool = True
+    found: bool = True       # False: no significant rise before the plateau
+    boot: int = 0
+
+    def curve(self, n):
+        return self.x_max * np.minimum(np.asarray(n, float) / self.n, 1.0)
+
+    def label(self, unit="N", fmt="{:.1f}"):
+        if not self.found:
+            return "no knee"
+        s = f"knee {unit}≈{fmt.format(self.n)}"
+        if self.boot:
+            s += f" [{fmt.format(self.n_lo)}–{fmt.format(self.n_hi)}]"
+        return s if self.saturated else s + " (not saturated)"
+
+# upper 5% point of F(1, d), by residual degrees of freedom d (3.84 as d -> inf)
+_F95 = {1: 161.4, 2: 18.51, 3: 10.13, 4: 7.71, 5: 6.61, 6: 5.99, 7: 5.59, 8: 5.32,
+        9: 5.12, 10: 4.96, 12: 4.75, 15: 4.54, 20: 4.35, 30: 4.17, 60: 4.00}
+
+def _f_crit(d):
+    return 3.84 if d >= 120 else _F95[max(k for k in _F95 if k <= d)]
+
+def _grid(n):
+    lo, hi = float(np.min(n)), float(np.max(n))
+    return np.geomspace(lo, hi, 256)
+
+def _significant(x, sse):
+    """F-test of the hockey stick (residual `sse`) against a flat line through
+    the level means `x`; the knee adds one parameter."""
+    x = np.asarray(x, float)
+    d = len(x) - 2
+    sse_flat = float(((x - x.mean()) ** 2).sum())
+    if d < 1:   # two levels: any rise is a knee, nothing left to test it with
+        return sse_flat > 0.0 and x[-1] > x[0]
+    if sse_flat <= 0.0:
+        return False
+    if sse <= 0.0:
+        return True
+    return (sse_flat - sse) / (sse / d) > _f_crit(d)
+
+def fit_curve(n, x, grid=None):
+    """(N*, Xmax, sse) of the hockey stick for arrays of concurrency and throughput.
+    Rows are candidates from `grid`, so a (B, len(n)) matrix fits B curves at once."""
+    n = np.asarray(n, float); x = np.atleast_2d(np.asarray(x, float))
+    k = _grid(n) if grid is None else grid
+    m = np.minimum(n[None, :] / k[:, None], 1.0)                # (K, L) shape of each candidate
+    xmax = (x @ m.T) / (m * m).sum(axis=1)[None, :]             # (B, K) closed-form plateau
+    sse = (x * x).sum(axis=1)[:, None] - xmax * (x @ m.T)       # (B, K) residual at that plateau
+    best = sse.argmin(axis=1)
+    rows = np.arange(x.shape[0])
+    return k[best], xmax[rows, best], sse[rows, best]
+
+def knee(n, x, boot=1000, ci=0.95, seed=0):
+    """Knee of throughput `x` against concurrency `n` (one entry per run; several
+    runs may share a level). With boot > 0 and repeated runs, adds a bootstrap CI."""
+    n = np.asarray(n, float); x = np.asarray(x, float)
+    ok = np.isfinite(n) & np.isfinite(x) & (n > 0)
+    n, x = n[ok], x[ok]
+    levels, inv = np.unique(n, return_inverse=True)
+    if len(levels) < 2:
+        raise ValueError(f"need at least 2 concurrency levels, have {len(levels)}")
+    means = np.bincount(inv, weights=x) / np.bincount(inv)
+    grid = _grid(levels)
+    k, xm, sse = fit_curve(levels, means, grid)
+    out = Knee(float(k[0]), float(xm[0]), float(k[0] / xm[0]) if xm[0] > 0 else math.nan,
+               saturated=bool(k[0] < levels[-1]),
+               found=bool(_significant(means, float(sse[0]))))
+    groups = [x[inv == i] for i in range(len(levels))]
+    if not out.found or boot <= 0 or all(len(g) < 2 for g in groups):
+        return out
+    rng = np.random.default_rng(seed)
+    # resample the runs of each level independently, then refit every replicate at once
+    sample = np.column_stack([g[rng.integers(0, len(g), (boot, len(g)))].mean(axis=1) for g in groups])
+    kb, xb, _ = fit_curve(levels, sample, grid)
+    a = (1.0 - ci) / 2.0 * 100.0
+    out.n_lo, out.n_hi = (float(v) for v in np.percentile(kb, [a, 100.0 - a]))
+    out.x_lo, out.x_hi = (float(v) for v in np.percentile(xb, [a, 100.0 - a]))
+    out.boot = boot
+    return out
+
+def knee_frame(df, n_col, x_col, level_col=None, **kw):
+    """knee() on DataFrame columns. level_col groups runs when the concurrency
+    value itself varies per run (e.g. outstanding lines = X*R): each run gets its
+    level's mean n."""
+    n = df[n_col] if level_col is None else df.groupby(level_col)[n_col].transform("mean")
+    return knee(n.to_numpy(), df[x_col].to_numpy(), **kw)
+
+def nearest(levels, k):
+    """Index of the measured level closest to the knee on a log scale (for annotating)."""
+    levels = np.asarray(levels, float)
+    return int(np.argmin(np.abs(np.log(levels) - math.log(k.n))))
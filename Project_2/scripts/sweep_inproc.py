@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""In-process version of run_sweeps.sh steps 1, 2, 3, 6 and 7.
+
+One pinned, prefaulted arena is mapped once and every grid point runs inside
+it through libmemlab, so no point pays for process start-up or page faults.
+CSV names and columns match what the CLI writes, so the plotting scripts
+work unchanged.
+
+  python3 scripts/sweep_inproc.py --out results --cpu 0 --backing thp
+"""
+import argparse, csv, pathlib, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+import memlab
+
+ap = argparse.ArgumentParser()
+ap.add_argument('--out', default='results')
+ap.add_argument('--lib', default=None, help='path to libmemlab (default: $MEMLAB_LIB / build dirs)')
+ap.add_argument('--cpu', type=int, default=0)
+ap.add_argument('--backing', default='default', choices=sorted(memlab.BACKING))
+ap.add_argument('--min-kb', type=int, default=8)
+ap.add_argument('--max-mb', type=int, default=512)
+ap.add_argument('--bw-bytes', type=int, default=512 << 20)
+ap.add_argument('--kernel-bytes', type=int, default=256 << 20)
+ap.add_argument('--lat-iters', type=int, default=5_000_000)
+ap.add_argument('--reps', type=int, default=5)
+ap.add_argument('--steps', default='lat,ps,mix,kernel', help='comma list of lat,ps,mix,kernel')
+A = ap.parse_args()
+
+OUT = pathlib.Path(A.out)
+for d in ('lat', 'bw', 'kernel'):
+    (OUT/d).mkdir(parents=True, exist_ok=True)
+steps = set(A.steps.split(','))
+if A.lib: memlab.load(A.lib)
+
+def write(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+    print('wrote', path)
+
+arena_bytes = max(A.max_mb << 20, A.bw_bytes, 2 * A.kernel_bytes)
+t0 = time.perf_counter()
+arena = memlab.Arena(arena_bytes, backing=A.backing, cpu=A.cpu)
+print(f'# arena {arena.nbytes} B ({A.backing}, AnonHugePages {arena.anon_huge_bytes} B) '
+      f'mapped+prefaulted in {time.perf_counter()-t0:.2f}s; isa={memlab.isa()} tsc_hz={memlab.tsc_hz():.0f}')
+timing = {}
+
+# 1) Zero-queue latency vs working set
+if 'lat' in steps:
+    t = time.perf_counter(); rows = []
+    sz = A.min_kb * 1024
+    while sz <= A.max_mb << 20:
+        for r in range(A.reps):
+            ns = arena.latency_ns(sz, 'random', 64, 64, A.lat_iters)
+            rows.append([sz, 'random', 64, A.lat_iters, r, f'{ns:.6f}'])
+        sz <<= 1
+    write(OUT/'lat'/'latency_ws.csv', ['bytes','pattern','stride_B','iter','repetition','lat_ns_est'], rows)
+    timing['lat'] = time.perf_counter() - t
+
+BW_HEADER = ['bytes','threads','stride_B','rw','pattern','repetition','GBps','lat_est_ns','kernel','isa','prefetch_dist']
+def bw_rows(stride, rw, pattern):
+    rows = []
+    for r in range(A.reps):
+        g = arena.bw_gbps(A.bw_bytes, threads=1, cpu0=A.cpu, stride=stride, rw=rw,
+                          random=(pattern == 'random'), rep=r)
+        lat = A.bw_bytes / (g * 1e9) * 1e9 if g > 0 else 0.0
+        rows.append([A.bw_bytes, 1, stride, rw, pattern, r, f'{g:.6f}', f'{lat:.6f}', 'touch', 'scalar', 0])
+    return rows
+
+# 2) Pattern x stride, 100% reads
+if 'ps' in steps:
+    t = time.perf_counter()
+    for S in (64, 256, 1024):
+        for pat in ('seq', 'random'):
+            write(OUT/'bw'/f'bw_{pat}_{S}_100R.csv', BW_HEADER, bw_rows(S, '100R', pat))
+    timing['ps'] = time.perf_counter() - t
+
+# 3) Read/write mix @64B
+if 'mix' in steps:
+    t = time.perf_counter()
+    for mix in ('100R', '100W', '70R30W', '50R50W'):
+        write(OUT/'bw'/f'mix_{mix}.csv', BW_HEADER, bw_rows(64, mix, 'seq'))
+    timing['mix'] = time.perf_counter() - t
+
+# 6/7) SAXPY cache and TLB impact (page_span boosts the stride like `memlab kernel`)
+if 'kernel' in steps:
+    t = time.perf_counter()
+    for name, span in (('saxpy_local', 1), ('saxpy_tlb_span16', 16)):
+        stride = 1 + (span - 1) * 4096 // 4
+        rows = []
+        n = A.kernel_bytes // 4
+        acc = 5 * ((n + stride - 1) // stride)
+        for r in range(A.reps):
+            sec, g = arena.saxpy(A.kernel_bytes, stride=stride, iters=5)
+            rows.append([A.kernel_bytes, stride, span, int(A.backing in ('thp', '2m', '1g')), r, f'{sec:.6f}', f'{g:.6f}',
+                         'saxpy', 'seq', acc, f'{sec * 1e9 / acc:.6f}'])
+        write(OUT/'kernel'/f'{name}.csv',
+              ['ws_bytes','stride_elems','page_span','huge','repetition','sec','GBps_effective',
+               'type','dist','accesses','ns_per_access'], rows)
+    timing['kernel'] = time.perf_counter() - t
+
+arena.close()
+print('# step wall time (s): ' + ', '.join(f'{k}={v:.2f}' for k, v in timing.items())
+      + f'; total {time.perf_counter()-t0:.2f}')
@@ -0,0 +1,119 @@
+// src/tlb_bench.cpp
+#include "util.h"
+#include <vector>
+#include <string>
+#include <algorithm>
+#include <cstdio>
+
+// TLB reach: a dependent ring with one node per `page_stride` bytes (default
+// 4 KiB, i.e. one touched line per small page) is walked over a growing span.
+// The same span is backed by 4 KiB pages, THP, or hugetlb 2 MiB / 1 GiB pages;
+// each hop needs a new translation on 4 KiB pages, while huge pages fold
+// 512 (or 262144) hops into one entry. Rows follow tlb_kernel_perf.csv.
+
+static bool parse_backing(const std::string& s, PageBacking& out) {
+  if      (s == "4k")      out = PageBacking::SMALL;
+  else if (s == "thp")     out = PageBacking::THP;
+  else if (s == "2m")      out = PageBacking::HUGE_2M;
+  else if (s == "1g")      out = PageBacking::HUGE_1G;
+  else if (s == "default") out = PageBacking::DEFAULT;
+  else return false;
+  return true;
+}
+
+void run_tlb_bench(int argc, char** argv) {
+  size_t min_pages   = 16;
+  size_t max_pages   = 262144;      // x 4 KiB = 1 GiB span
+  size_t page_stride = 4096;        // bytes between touched nodes
+  size_t iters       = 2'000'000;
+  int    reps = 3, cpu = -1;
+  Pattern pat = Pattern::RANDOM;
+  std::string backings = "4k,thp,2m,1g";
+  std::string counters = "cycles,instructions,dTLB-load-misses";
+  std::string out;                  // CSV path; stdout if empty
+
+  for (int i=1; i<argc; ) {
+    if      (parse_szt (i,argc,argv,"--min_pages",   min_pages)) {}
+    else if (parse_szt (i,argc,argv,"--max_pages",   max_pages)) {}
+    else if (parse_szt (i,argc,argv,"--page_stride", page_stride)) {}
+    else if (parse_szt (i,argc,argv,"--iters",       iters)) {}
+    else if (parse_int (i,argc,argv,"--reps",        reps)) {}
+    else if (parse_int (i,argc,argv,"--cpu",         cpu)) {}
+    else if (parse_str (i,argc,argv,"--pages",       backings)) {}
+    else if (parse_str (i,argc,argv,"--counters",    counters)) {}
+    else if (parse_str (i,argc,argv,"--out",         out)) {}
+    else if (parse_flag(i,argc,argv,"--pattern=random")) pat = Pattern::RANDOM;
+    else if (parse_flag(i,argc,argv,"--pattern=seq"))    pat = Pattern::SEQ;
+    else ++i;
+  }
+  if (page_stride < 64 || (page_stride & (page_stride - 1))) {
+    std::fprintf(stderr, "--page_stride must be a power of two >= 64 (got %zu)\n", page_stride);
+    return;
+  }
+  min_pages = std::max<size_t>(1, min_pages);
+
+  std::vector<PageBacking> list;
+  for (size_t pos = 0; pos <= backings.size(); ) {
+    size_t comma = backings.find(',', pos);
+    std::string b = backings.substr(pos, comma == std::string::npos ? std::string::npos : comma - pos);
+    pos = (comma == std::string::npos) ? backings.size() + 1 : comma + 1;
+    PageBacking pb;
+    if (b.empty()) continue;
+    if (parse_backing(b, pb)) list.push_back(pb);
+    else std::fprintf(stderr, "# tlb: unknown page backing '%s' (4k|thp|2m|1g)\n", b.c_str());
+  }
+
+  pin_to_cpu(cpu);
+  PerfCounters pc;
+  if (!counters.empty()) pc.open(counters);
+
+  CSV csv;
+  csv.set_header("size_B,hugepages,run_id,cycles,instr,dtlb_load_misses,"
+                 "page_B,pages_touched,backing_pages,iter,ns_per_access,anon_huge_B");
+
+  const size_t max_span = max_pages * page_stride;
+  for (PageBacking pb : list) {
+    Arena a = arena_alloc(max_span, pb);
+    if (!a.ptr) {
+      std::fprintf(stderr, "# tlb: cannot map %zu bytes with %s pages (hugetlb pool / privileges?) - skipped\n",
+                   max_span, page_backing_name(pb));
+      continue;
+    }
+    touch_memory(a.ptr, a.bytes);
+    // THP is best effort: report what the kernel actually gave us
+    const size_t anon_huge = anon_huge_bytes(a.ptr);
+    const size_t page_B = (pb == PageBacking::THP && anon_huge > 0) ? (size_t(2) << 20) : a.page_bytes;
+    if (pb == PageBacking::THP && anon_huge == 0)
+      std::fprintf(stderr, "# tlb: THP requested but AnonHugePages=0 (check /sys/kernel/mm/transparent_hugepage/enabled)\n");
+    std::fprintf(stderr, "# tlb: %s pages, arena %zu B, AnonHugePages %zu B\n",
+                 page_backing_name(pb), a.bytes, anon_huge);
+
+    uint64_t* idx = reinterpret_cast<uint64_t*>(a.ptr);
+    for (size_t np = min_pages; np <= max_pages; np <<= 1) {
+      const size_t span = np * page_stride;
+      size_t start;
+      build_ring(idx, span, page_stride, pat, 0, 1, &start);
+      for (int R=0; R<reps; ++R) {
+        pc.start();
+        double ns = chase_ns(idx, start, iters);
+        pc.stop();
+        csv.add_row(std::to_string(span) + "," +
+                    page_backing_name(pb) + "," +
+                    std::to_string(R+1) + "," +
+                    pc.value("cycles") + "," +
+                    pc.value("instructions") + "," +
+                    pc.value("dTLB-load-misses") + "," +
+                    std::to_string(page_B) + "," +
+                    std::to_string(np) + "," +
+                    std::to_string((span + page_B - 1) / page_B) + "," +
+                    std::to_string(iters) + "," +
+                    std::to_string(ns) + "," +
+                    std::to_string(anon_huge));
+      }
+    }
+    arena_free(a);
+  }
+
+  if (out.empty()) csv.print();
+  else if (csv.write(out)) std::fprintf(stderr, "# tlb: wrote %s\n", out.c_str());
+}
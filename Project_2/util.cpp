@@ -7,6 +7,10 @@
 #include <cmath>
 #include <string>   // for stoi/stoul/stod/stoull
 #include <cstdint>  // for uint8_t/uint64_t
+#include <cstdlib>  // for getenv/atof
+#include <cctype>
+#include <thread>
+#include <filesystem>
 
 #ifdef _WIN32
   #ifndef NOMINMAX
@@ -19,28 +23,42 @@
   #include <pthread.h>
   #include <unistd.h>
   #include <sys/mman.h>
+  #include <time.h>
 #endif
 // ------- parsing -------
 static bool next_has(int i, int argc) { return (i+1) < argc; }
 
+// Accepts both "--flag value" and "--flag=value"; advances i past what it consumed.
+static const char* take_value(int& i, int argc, char** argv, const char* flag) {
+    if (i >= argc) return nullptr;
+    size_t n = std::strlen(flag);
+    if (std::strcmp(argv[i], flag)==0 && next_has(i,argc)) { i += 2; return argv[i-1]; }
+    if (std::strncmp(argv[i], flag, n)==0 && argv[i][n]=='=') { ++i; return argv[i-1] + n + 1; }
+    return nullptr;
+}
+
 bool parse_flag(int& i, int argc, char** argv, const char* flag) {
     if (i < argc && std::strcmp(argv[i], flag) == 0) { ++i; return true; }
     return false;
 }
 bool parse_int (int& i, int argc, char** argv, const char* flag, int& out) {
-    if (i < argc && std::strcmp(argv[i], flag)==0 && next_has(i,argc)) { out = std::stoi(argv[++i]); ++i; return true; }
+    if (const char* v = take_value(i,argc,argv,flag)) { out = std::stoi(v); return true; }
     return false;
 }
 bool parse_szt (int& i, int argc, char** argv, const char* flag, size_t& out) {
-    if (i < argc && std::strcmp(argv[i], flag)==0 && next_has(i,argc)) { out = (size_t)std::stoull(argv[++i]); ++i; return true; }
+    if (const char* v = take_value(i,argc,argv,flag)) { out = (size_t)std::stoull(v); return true; }
     return false;
 }
 bool parse_dbl (int& i, int argc, char** argv, const char* flag, double& out) {
-    if (i < argc && std::strcmp(argv[i], flag)==0 && next_has(i,argc)) { out = std::stod(argv[++i]); ++i; return true; }
+    if (const char* v = take_value(i,argc,argv,flag)) { out = std::stod(v); return true; }
     return false;
 }
 bool parse_uint(int& i, int argc, char** argv, const char* flag, unsigned& out) {
-    if (i < argc && std::strcmp(argv[i], flag)==0 && next_has(i,argc)) { out = (unsigned)std::stoul(argv[++i]); ++i; return true; }
+    if (const char* v = take_value(i,argc,argv,flag)) { out = (unsigned)std::stoul(v); return true; }
+    return false;
+}
+bool parse_str (int& i, int argc, char** argv, const char* flag, std::string& out) {
+    if (const char* v = take_value(i,argc,argv,flag)) { out = v; return true; }
     return false;
 }
 
@@ -58,6 +76,166 @@ void pin_to_cpu(int cpu) {
 #endif
 }
 
+// ------- topology -------
+std::vector<int> parse_cpu_list(const std::string& s) {
+    std::vector<int> out;
+    size_t pos = 0;
+    while (pos < s.size()) {
+        size_t comma = s.find(',', pos);
+        std::string tok = s.substr(pos, comma == std::string::npos ? std::string::npos : comma - pos);
+        pos = (comma == std::string::npos) ? s.size() : comma + 1;
+        if (tok.empty() || !std::isdigit(static_cast<unsigned char>(tok[0]))) continue;
+        size_t dash = tok.find('-');
+        int lo = std::atoi(tok.c_str());
+        int hi = (dash == std::string::npos) ? lo : std::atoi(tok.c_str() + dash + 1);
+        for (int c = lo; c <= hi; ++c) out.push_back(c);
+    }
+    return out;
+}
+
+#ifdef __linux__
+static int read_sysfs_int(const std::string& path, int fallback) {
+    FILE* f = std::fopen(path.c_str(), "r");
+    if (!f) return fallback;
+    int v = fallback;
+    if (std::fscanf(f, "%d", &v) != 1) v = fallback;
+    std::fclose(f);
+    return v;
+}
+#endif
+
+std::vector<CpuTopo> cpu_topology() {
+    std::vector<int> cpus;
+#ifdef __linux__
+    if (FILE* f = std::fopen("/sys/devices/system/cpu/online", "r")) {
+        char buf[1024] = {0};
+        if (std::fgets(buf, sizeof(buf), f)) cpus = parse_cpu_list(buf);
+        std::fclose(f);
+    }
+#endif
+    if (cpus.empty())
+        for (unsigned c = 0; c < std::max(1u, std::thread::hardware_concurrency()); ++c) cpus.push_back(int(c));
+    std::vector<CpuTopo> out;
+    for (int c : cpus) {
+        CpuTopo t;
+        t.cpu = c; t.core = c; t.package = 0;
+#ifdef __linux__
+        std::string dir = "/sys/devices/system/cpu/cpu" + std::to_string(c) + "/topology/";
+        t.core    = read_sysfs_int(dir + "core_id", c);
+        t.package = read_sysfs_int(dir + "physical_package_id", 0);
+#endif
+        out.push_back(t);
+    }
+    return out;
+}
+
+const char* cpu_relation(const CpuTopo& a, const CpuTopo& b) {
+    if (a.cpu == b.cpu)         return "same_cpu";
+    if (a.package != b.package) return "cross_socket";
+    if (a.core == b.core)       return "smt_sibling";
+    return "cross_core";
+}
+
+std::vector<CacheLevel> cache_geometry() {
+    std::vector<CacheLevel> out;
+#ifdef __linux__
+    for (int i = 0; ; ++i) {
+        std::string dir = "/sys/devices/system/cpu/cpu0/cache/index" + std::to_string(i) + "/";
+        FILE* f = std::fopen((dir + "type").c_str(), "r");
+        if (!f) break;
+        char type[32] = {0};
+        if (std::fscanf(f, "%31s", type) != 1) type[0] = 0;
+        std::fclose(f);
+        CacheLevel c;
+        c.level = read_sysfs_int(dir + "level", 0);
+        c.type  = type;
+        c.line  = size_t(read_sysfs_int(dir + "coherency_line_size", 64));
+        c.ways  = size_t(std::max(0, read_sysfs_int(dir + "ways_of_associativity", 0)));
+        if (FILE* g = std::fopen((dir + "size").c_str(), "r")) {
+            size_t v = 0; char unit = 0;
+            if (std::fscanf(g, "%zu%c", &v, &unit) >= 1)
+                c.size = v * (unit == 'K' ? 1024 : unit == 'M' ? 1024*1024 : 1);
+            std::fclose(g);
+        }
+        if (FILE* g = std::fopen((dir + "shared_cpu_list").c_str(), "r")) {
+            char buf[1024] = {0};
+            if (std::fgets(buf, sizeof(buf), g)) c.shared_cpus = std::max<int>(1, int(parse_cpu_list(buf).size()));
+            std::fclose(g);
+        }
+        out.push_back(c);
+    }
+#elif defined(_WIN32)
+    DWORD len = 0;
+    GetLogicalProcessorInformation(nullptr, &len);
+    std::vector<SYSTEM_LOGICAL_PROCESSOR_INFORMATION> info(len / sizeof(SYSTEM_LOGICAL_PROCESSOR_INFORMATION));
+    if (!info.empty() && GetLogicalProcessorInformation(info.data(), &len)) {
+        for (auto& e : info) {
+            if (e.Relationship != RelationCache || !(e.ProcessorMask & 1)) continue;
+            CacheLevel c;
+            c.level = e.Cache.Level;
+            c.type  = e.Cache.Type == CacheData ? "Data" : e.Cache.Type == CacheInstruction ? "Instruction" : "Unified";
+            c.size  = e.Cache.Size;
+            c.line  = e.Cache.LineSize;
+            c.ways  = e.Cache.Associativity;
+            int n = 0;
+            for (ULONG_PTR m = e.ProcessorMask; m; m >>= 1) n += int(m & 1);
+            c.shared_cpus = std::max(1, n);
+            out.push_back(c);
+        }
+    }
+#endif
+    std::sort(out.begin(), out.end(), [](const CacheLevel& a, const CacheLevel& b) {
+        return a.level != b.level ? a.level < b.level : a.type < b.type;
+    });
+    return out;
+}
+
+size_t llc_bytes() {
+    size_t best = 0;
+    int lvl = 0;
+    for (auto& c : cache_geometry())
+        if (c.type != "Instruction" && c.level >= lvl) { lvl = c.level; best = c.size; }
+    return best;
+}
+
+// ------- machine identity / cache files -------
+std::string machine_id() {
+    char host[256] = "unknown";
+    std::string model = "unknown";
+#ifdef _WIN32
+    if (const char* h = std::getenv("COMPUTERNAME")) std::snprintf(host, sizeof host, "%s", h);
+    if (const char* id = std::getenv("PROCESSOR_IDENTIFIER")) model = id;
+#else
+    gethostname(host, sizeof host - 1);
+    if (FILE* f = std::fopen("/proc/cpuinfo", "r")) {
+        char line[512];
+        while (std::fgets(line, sizeof line, f)) {
+            if (std::strncmp(line, "model name", 10) != 0) continue;
+            const char* v = std::strchr(line, ':');
+            if (v) { model = v + 1 + (v[1] == ' '); model.erase(model.find_last_not_of("\r\n") + 1); }
+            break;
+        }
+        std::fclose(f);
+    }
+#endif
+    std::string id = std::string(host) + ";" + model + ";" + std::to_string(cpu_topology().size()) + " cpus";
+    for (auto& ch : id) if (ch == ',' || ch == '\n') ch = ' ';
+    return id;
+}
+
+std::string memlab_cache_file(const char* env_var, const char* name) {
+    if (const char* f = std::getenv(env_var)) return f;
+    const char* home = std::getenv("HOME");
+#ifdef _WIN32
+    if (!home) home = std::getenv("LOCALAPPDATA");
+#endif
+    if (!home) return name;
+    const std::string dir = std::string(home) + "/.cache/memlab";
+    std::error_code ec;
+    std::filesystem::create_directories(dir, ec);
+    return dir + "/" + name;
+}
+
 // ------- memory touch / hugepages -------
 void prefault_bytes(uint8_t* p, size_t n, size_t page) {
     if (!p || n==0) return;
@@ -73,6 +251,97 @@ void prefer_hugepages(void* ptr, size_t n) {
 #endif
 }
 
+const char* page_backing_name(PageBacking b) {
+    switch (b) {
+        case PageBacking::DEFAULT: return "default";
+        case PageBacking::SMALL:   return "4k";
+        case PageBacking::THP:     return "thp";
+        case PageBacking::HUGE_2M: return "2m";
+        case PageBacking::HUGE_1G: return "1g";
+    }
+    return "?";
+}
+
+Arena arena_alloc(size_t bytes, PageBacking backing) {
+    Arena a;
+    if (bytes == 0) return a;
+    const size_t page  = backing == PageBacking::HUGE_1G ? (size_t(1) << 30)
+                       : backing == PageBacking::HUGE_2M ? (size_t(2) << 20) : 4096;
+    const size_t align = backing == PageBacking::THP ? (size_t(2) << 20) : page;
+    size_t len = (bytes + align - 1) & ~(align - 1);
+#ifdef _WIN32
+    DWORD type = MEM_RESERVE | MEM_COMMIT;
+    if (backing == PageBacking::HUGE_1G) return a;
+    if (backing == PageBacking::HUGE_2M) type |= MEM_LARGE_PAGES;   // needs SeLockMemoryPrivilege
+    void* m = VirtualAlloc(nullptr, len, type, PAGE_READWRITE);
+    if (!m) return a;
+    a.map = m; a.map_bytes = len;
+    a.ptr = static_cast<uint8_t*>(m);
+#else
+    int flags = MAP_PRIVATE | MAP_ANONYMOUS;
+    size_t map_len = len;
+    if (backing == PageBacking::HUGE_2M || backing == PageBacking::HUGE_1G) {
+#ifdef MAP_HUGETLB
+        const int shift = backing == PageBacking::HUGE_1G ? 30 : 21;
+        flags |= MAP_HUGETLB | (shift << 26);   // MAP_HUGE_SHIFT
+#else
+        return a;
+#endif
+    } else if (backing == PageBacking::THP) {
+        map_len += align;                       // slack to align the start to 2 MiB
+    }
+    void* m = mmap(nullptr, map_len, PROT_READ | PROT_WRITE, flags, -1, 0);
+    if (m == MAP_FAILED) return a;
+    a.map = m; a.map_bytes = map_len;
+    uintptr_t p = (reinterpret_cast<uintptr_t>(m) + align - 1) & ~uintptr_t(align - 1);
+    a.ptr = reinterpret_cast<uint8_t*>(p);
+    if (backing == PageBacking::THP) prefer_hugepages(a.ptr, len);
+#ifdef MADV_NOHUGEPAGE
+    if (backing == PageBacking::SMALL) madvise(a.ptr, len, MADV_NOHUGEPAGE);
+#endif
+#endif
+    a.bytes = len;
+    a.page_bytes = page;
+    a.backing = backing;
+    return a;
+}
+
+size_t anon_huge_bytes(const void* p) {
+#ifdef __linux__
+    FILE* f = std::fopen("/proc/self/smaps", "r");
+    if (!f) return 0;
+    const uintptr_t addr = reinterpret_cast<uintptr_t>(p);
+    char line[4096];
+    bool inside = false;
+    size_t kb = 0;
+    while (std::fgets(line, sizeof(line), f)) {
+        unsigned long lo = 0, hi = 0;
+        char dash = 0;
+        if (std::sscanf(line, "%lx%c%lx ", &lo, &dash, &hi) == 3 && dash == '-') {
+            if (inside) break;                  // past our mapping
+            inside = (addr >= lo && addr < hi);
+        } else if (inside && std::sscanf(line, "AnonHugePages: %zu kB", &kb) == 1) {
+            break;
+        }
+    }
+    std::fclose(f);
+    return inside ? kb * 1024 : 0;
+#else
+    (void)p;
+    return 0;
+#endif
+}
+
+void arena_free(Arena& a) {
+    if (!a.map) return;
+#ifdef _WIN32
+    VirtualFree(a.map, 0, MEM_RELEASE);
+#else
+    munmap(a.map, a.map_bytes);
+#endif
+    a = Arena{};
+}
+
 // ------- stats -------
 Stats mean_stdev(const std::vector<double>& v) {
     Stats s{};
@@ -105,3 +374,75 @@ uint64_t rdtscp_now() {
     return (uint64_t(hi) << 32) | lo;
 #endif
 }
+
+// ------- TSC calibration -------
+static double mono_raw_s() {
+#ifdef __linux__
+    timespec ts;
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+    return double(ts.tv_sec) + double(ts.tv_nsec) * 1e-9;
+#elif defined(_WIN32)
+    LARGE_INTEGER f, c;
+    QueryPerformanceFrequency(&f); QueryPerformanceCounter(&c);
+    return double(c.QuadPart) / double(f.QuadPart);
+#else
+    return std::chrono::duration<double>(std::chrono::steady_clock::now().time_since_epoch()).count();
+#endif
+}
+
+static double calibrate_tsc_hz() {
+    // median of 5 x 20 ms windows against the raw monotonic clock
+    std::vector<double> est;
+    for (int t = 0; t < 5; ++t) {
+        double s0 = mono_raw_s();
+        uint64_t c0 = rdtsc_now();
+        double s1 = s0;
+        while ((s1 = mono_raw_s()) - s0 < 0.020) {}
+        uint64_t c1 = rdtscp_now();
+        est.push_back(double(c1 - c0) / (s1 - s0));
+    }
+    std::sort(est.begin(), est.end());
+    return est[est.size() / 2];
+}
+
+double tsc_hz() {
+    static const double hz = [] {
+        if (const char* f = std::getenv("CPU_HZ")) {
+            double v = std::atof(f);
+            if (v > 0) return v;
+        }
+        return calibrate_tsc_hz();
+    }();
+    return hz;
+}
+
+uint64_t timer_overhead_cycles() {
+    static const uint64_t oh = [] {
+        uint64_t best = ~0ull;
+        for (int t = 0; t < 10000; ++t) {
+            uint64_t a = rdtscp_now();
+            uint64_t b = rdtscp_now();
+            best = std::min(best, b - a);
+        }
+        return best;
+    }();
+    return oh;
+}
+
+// ------- log histogram -------
+void LogHist::add(double ns) {
+    int b = ns <= kMin ? 0 : int(std::log2(ns / kMin) * kSub);
+    counts[size_t(std::clamp(b, 0, kBuckets - 1))]++;
+    ++n;
+}
+
+double LogHist::quantile(double q) const {
+    if (n == 0) return 0.0;
+    uint64_t target = uint64_t(std::ceil(q * double(n)));
+    uint64_t seen = 0;
+    for (int b = 0; b < kBuckets; ++b) {
+        seen += counts[size_t(b)];
+        if (seen >= std::max<uint64_t>(1, target)) return kMin * std::exp2((b + 0.5) / kSub);
+    }
+    return kMin * std::exp2(double(kBuckets) / kSub);
+}
@@ -5,6 +5,10 @@
 #include <vector>
 #include <chrono>
 #include <cstdio>
+#include <atomic>
+#if defined(_MSC_VER)
+#include <intrin.h>
+#endif
 
 // ---------- tiny CSV helper ----------
 struct CSV {
@@ -16,6 +20,14 @@ struct CSV {
         if (!header.empty()) std::puts(header.c_str());
         for (auto& r : rows) std::puts(r.c_str());
     }
+    bool write(const std::string& path) const {
+        FILE* f = std::fopen(path.c_str(), "w");
+        if (!f) { std::fprintf(stderr, "cannot write %s\n", path.c_str()); return false; }
+        if (!header.empty()) std::fprintf(f, "%s\n", header.c_str());
+        for (auto& r : rows) std::fprintf(f, "%s\n", r.c_str());
+        std::fclose(f);
+        return true;
+    }
 };
 
 // ---------- timing ----------
@@ -31,18 +43,84 @@ struct Timer {
 };
 
 // ---------- parsing helpers (replace getopt) ----------
+// Value flags accept both "--flag value" and "--flag=value".
 bool parse_flag(int& i, int argc, char** argv, const char* flag);
 bool parse_int (int& i, int argc, char** argv, const char* flag, int& out);
 bool parse_szt (int& i, int argc, char** argv, const char* flag, size_t& out); // NOTE: size_t&
 bool parse_dbl (int& i, int argc, char** argv, const char* flag, double& out);
 bool parse_uint(int& i, int argc, char** argv, const char* flag, unsigned& out);
+bool parse_str (int& i, int argc, char** argv, const char* flag, std::string& out);
+
+// ---------- threads ----------
+inline void cpu_relax() {
+#if defined(_MSC_VER)
+    _mm_pause();
+#else
+    __builtin_ia32_pause();
+#endif
+}
+
+// Spin start barrier: workers arrive and spin; the coordinator releases them
+// all at once after `n` have arrived, so no worker starts before the others.
+struct SpinStart {
+    std::atomic<int>  ready{0};
+    std::atomic<bool> go{false};
+    void arrive_and_wait() {
+        ready.fetch_add(1, std::memory_order_acq_rel);
+        while (!go.load(std::memory_order_acquire)) cpu_relax();
+    }
+    void release_when(int n) {
+        while (ready.load(std::memory_order_acquire) < n) cpu_relax();
+        go.store(true, std::memory_order_release);
+    }
+};
 
 // ---------- system & memory ----------
 void pin_to_cpu(int cpu);                             // -1 = no pin
+
+// Logical CPU placement from /sys/devices/system/cpu/cpuN/topology (Linux);
+// elsewhere every CPU is reported as its own core on package 0.
+struct CpuTopo { int cpu = 0, core = 0, package = 0; };
+std::vector<CpuTopo> cpu_topology();                  // online CPUs, ascending
+std::vector<int> parse_cpu_list(const std::string& s);  // "0,2,4-7" (sysfs list format)
+const char* cpu_relation(const CpuTopo& a, const CpuTopo& b);  // same_cpu|smt_sibling|cross_core|cross_socket
+
+// Cache hierarchy as seen by CPU 0 (sysfs cache/indexN on Linux,
+// GetLogicalProcessorInformation on Windows); empty if unknown.
+struct CacheLevel {
+    int         level = 0;
+    std::string type;            // Data | Instruction | Unified
+    size_t      size = 0, line = 64, ways = 0;
+    int         shared_cpus = 1; // logical CPUs sharing this instance
+};
+std::vector<CacheLevel> cache_geometry();
+size_t llc_bytes();              // last-level data/unified cache size, 0 if unknown
+// "host;cpu model;N cpus" (commas stripped) -- keys per-machine tuning and calibration files.
+std::string machine_id();
+// $<env_var> if set, else ~/.cache/memlab/<name> (directory created on demand).
+std::string memlab_cache_file(const char* env_var, const char* name);
 void prefault_bytes(uint8_t* p, size_t n, size_t page = 4096);
 inline void touch_memory(void* p, size_t n) { prefault_bytes(reinterpret_cast<uint8_t*>(p), n); }
 void prefer_hugepages(void* ptr, size_t n);           // no-op on Windows; MADV_HUGEPAGE on Linux
 
+// Anonymous mapping reused across a sweep. DEFAULT follows the system THP
+// policy, SMALL forces 4 KiB pages (MADV_NOHUGEPAGE), THP asks for transparent
+// huge pages on a 2 MiB-aligned range, HUGE_2M/HUGE_1G use MAP_HUGETLB and
+// fail (ptr == nullptr) when the hugetlb pool is empty. Not zeroed on reuse.
+enum class PageBacking { DEFAULT, SMALL, THP, HUGE_2M, HUGE_1G };
+const char* page_backing_name(PageBacking b);   // "default","4k","thp","2m","1g"
+struct Arena {
+    uint8_t* ptr   = nullptr;
+    size_t   bytes = 0;
+    void*    map   = nullptr;   // what to unmap (ptr may be aligned up inside it)
+    size_t   map_bytes = 0;
+    size_t   page_bytes = 4096; // page size requested for the mapping
+    PageBacking backing = PageBacking::DEFAULT;
+};
+Arena arena_alloc(size_t bytes, PageBacking backing = PageBacking::DEFAULT);
+size_t anon_huge_bytes(const void* p);   // AnonHugePages of the mapping holding p (/proc/self/smaps; 0 elsewhere)
+void  arena_free(Arena& a);
+
 // ---------- stats ----------
 struct Stats { double mean=0.0, stdev=0.0; };
 Stats mean_stdev(const std::vector<double>& v);
@@ -50,3 +128,72 @@ Stats mean_stdev(const std::vector<double>& v);
 // ---------- cycle counters (used by latency bench) ----------
 uint64_t rdtsc_now();
 uint64_t rdtscp_now();
+double   tsc_hz();                 // CPU_HZ env if set, else invariant TSC calibrated once vs CLOCK_MONOTONIC_RAW
+uint64_t timer_overhead_cycles();  // min cost of a back-to-back rdtscp pair
+inline double cycles_to_ns(double cycles) { return cycles * 1e9 / tsc_hz(); }
+
+// ---------- log-bucketed histogram (ns) ----------
+struct LogHist {
+    static constexpr int    kSub     = 16;           // buckets per power of two (~4.4% wide)
+    static constexpr double kMin     = 0.125;        // lower edge of bucket 0, ns
+    static constexpr int    kBuckets = 32 * kSub;    // 0.125 ns .. ~0.5 s
+    std::vector<uint64_t> counts = std::vector<uint64_t>(kBuckets, 0);
+    uint64_t n = 0;
+    void   add(double ns);
+    double quantile(double q) const;                 // geometric bucket midpoint
+};
+
+// ---------- hardware counters (perf_counters.cpp, Linux perf_event_open) ----------
+// open("cycles,instructions,...") once; start()/stop() bracket each timed repetition.
+// Counts are extrapolated by time_enabled/time_running; *_mux columns carry that
+// running ratio (1.0 = never multiplexed). Events that cannot be read are left empty.
+struct PerfCounters {
+    struct Reading { double scaled = 0.0, ratio = 0.0; bool valid = false; };
+    std::vector<std::string> names;
+    std::vector<int>         fds;
+    std::vector<Reading>     last;
+    bool open(const std::string& list);
+    void start();
+    void stop();
+    std::string csv_header() const;   // ",cycles,cycles_mux,..." (empty if none)
+    std::string csv_values() const;   // matches csv_header()
+    std::string value(const std::string& name) const;   // last scaled count of one event, "" if absent
+    PerfCounters() = default;
+    PerfCounters(const PerfCounters&) = delete;
+    PerfCounters& operator=(const PerfCounters&) = delete;
+    ~PerfCounters();
+};
+
+// ---------- pointer chase (latency_bench.cpp; shared with loaded) ----------
+// Rings are built in place over `bytes` of `idx`: one node per `granule` bytes
+// (64 = cache line, 4096 = page), so every hop touches a distinct line. The
+// next-pointer sits in one line of the node; for page granules that line is
+// scattered so nodes do not all map to the same cache sets.
+// With chains > 1 the nodes are dealt round-robin into independent rings;
+// starts[k] receives the first element index of ring k.
+enum class Pattern { SEQ, STRIDE, RANDOM };
+size_t ring_nodes(size_t bytes, size_t granule);
+void   build_ring(uint64_t* idx, size_t bytes, size_t granule, Pattern pat, size_t strideB,
+                  size_t chains, size_t* starts);
+double chase_ns(const uint64_t* idx, size_t start, size_t iters);   // mean ns per dependent hop
+
+// ---------- bandwidth & kernel engines (bandwidth_bench.cpp, kernel_bench.cpp; shared with memlab_api) ----------
+enum class RW     { R, W, R70W30, R50W50 };
+// TOUCH is the original one-byte-per-step walk; the others move full lines
+// with the widest vectors the build targets.
+enum class Kernel { TOUCH, LOAD, STORE, COPY, TRIAD };
+struct BwPoint {
+    size_t bytes = 0, stride = 64, iters = 1;
+    int    threads = 1, cpu0 = -1;
+    RW     rw = RW::R;
+    bool   random = false;
+    Kernel kernel = Kernel::TOUCH;
+    bool   nt = false;
+    size_t prefetch = 0;         // random touch: software prefetch distance (accesses)
+};
+// One fixed-iteration repetition over a prefaulted, 64 B-aligned `base`
+// (TRIAD expects doubles initialised to 1.0); returns aggregate GB/s.
+double bw_gbps(uint8_t* base, const BwPoint& p, int rep);
+const char* vector_isa();          // "avx512" | "avx2" | "sse2" (compile-time)
+// `iters` strided SAXPY passes over n floats; returns elapsed seconds.
+double saxpy_seconds(float a, const float* x, float* y, size_t n, size_t stride, size_t iters);
@@ -0,0 +1,8 @@
+// src/vec_auto.cpp
+// Plain loops, auto-vectorized for the baseline x86-64 target.
+#define VEC_NS       vec_auto
+#define VEC_ISA_NAME "SSE2+"
+#define VEC_WIDTH    0
+#include "vec_kernels.inc"
+
+const VecKernels* vec_kernels_auto() { return &VEC_NS::table; }
@@ -0,0 +1,8 @@
+// src/vec_avx2.cpp
+// AVX2+FMA intrinsics with scalar or masked tails.
+#define VEC_NS       vec_avx2
+#define VEC_ISA_NAME "AVX2"
+#define VEC_WIDTH    256
+#include "vec_kernels.inc"
+
+const VecKernels* vec_kernels_avx2() { return &VEC_NS::table; }
@@ -0,0 +1,8 @@
+// src/vec_avx512.cpp
+// AVX-512 intrinsics with scalar or masked (k-register) tails.
+#define VEC_NS       vec_avx512
+#define VEC_ISA_NAME "AVX512"
+#define VEC_WIDTH    512
+#include "vec_kernels.inc"
+
+const VecKernels* vec_kernels_avx512() { return &VEC_NS::table; }
@@ -0,0 +1,775 @@
+// src/vec_bench.cpp
+#include "util.h"
+#include "vec_kernels.h"
+#include <vector>
+#include <string>
+#include <algorithm>
+#include <cmath>
+#include <thread>
+#include <functional>
+#include <fstream>
+#include <sstream>
+#include <cstring>
+#include <cstdlib>
+#include <filesystem>
+
+// Project 1 harness: saxpy/dot/mul/stencil in f32/f64 over every vector
+// variant in one process, single- or multi-threaded. Rows use the Project_1 results_clean.csv schema
+// (hint keeps the mode: token the plotters parse; check is the max relative
+// error against a double-precision reference), so clean_csv.py and the
+// plot_*.py scripts read the output unchanged. --sweep replays the grids of
+// the old sweep_*.ps1 scripts without a process launch per point;
+// --sweep=scaling adds strong (fixed N) and weak (N per thread) scaling rows;
+// --sweep=blocked times an iterated stencil naively and with autotuned
+// temporal blocking (tuned configurations persist per machine).
+
+// defined in vec_<isa>.cpp; the AVX ones are only built on x86 (MEMLAB_VEC_X86)
+const VecKernels* vec_kernels_scalar();
+const VecKernels* vec_kernels_auto();
+const VecKernels* vec_kernels_avx2();
+const VecKernels* vec_kernels_avx512();
+
+static bool cpu_has(VecMode m) {
+  if (m == VecMode::SCALAR || m == VecMode::AUTO) return true;
+#if !defined(MEMLAB_VEC_X86)
+  return false;
+#elif defined(_MSC_VER)
+  if (m == VecMode::AVX2) return IsProcessorFeaturePresent(PF_AVX2_INSTRUCTIONS_AVAILABLE);
+  return IsProcessorFeaturePresent(PF_AVX512F_INSTRUCTIONS_AVAILABLE);
+#else
+  __builtin_cpu_init();
+  if (m == VecMode::AVX2) return __builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma");
+  return __builtin_cpu_supports("avx512f") && __builtin_cpu_supports("avx512vl") &&
+         __builtin_cpu_supports("avx512bw") && __builtin_cpu_supports("avx512dq");
+#endif
+}
+
+const char* vec_mode_name(VecMode m) {
+  switch (m) {
+    case VecMode::SCALAR: return "SCALAR";
+    case VecMode::AUTO:   return "AUTO";
+    case VecMode::AVX2:   return "AVX2";
+    default:              return "AVX512";
+  }
+}
+
+const VecKernels* vec_kernels(VecMode m) {
+  if (!cpu_has(m)) return nullptr;
+  switch (m) {
+    case VecMode::SCALAR: return vec_kernels_scalar();
+    case VecMode::AUTO:   return vec_kernels_auto();
+#if defined(MEMLAB_VEC_X86)
+    case VecMode::AVX2:   return vec_kernels_avx2();
+    case VecMode::AVX512: return vec_kernels_avx512();
+#endif
+    default:              return nullptr;
+  }
+}
+
+enum class VecKernel { SAXPY, DOT, MUL, STENCIL };
+
+static const char* vk_name(VecKernel k) {
+  switch (k) {
+    case VecKernel::SAXPY: return "saxpy";
+    case VecKernel::DOT:   return "dot";
+    case VecKernel::MUL:   return "mul";
+    default:               return "stencil";
+  }
+}
+
+static bool vk_parse(const std::string& s, VecKernel& k) {
+  if      (s == "saxpy")   k = VecKernel::SAXPY;
+  else if (s == "dot")     k = VecKernel::DOT;
+  else if (s == "mul")     k = VecKernel::MUL;
+  else if (s == "stencil") k = VecKernel::STENCIL;
+  else return false;
+  return true;
+}
+
+static std::vector<std::string> split_csv_list(const std::string& s) {
+  std::vector<std::string> out;
+  size_t p = 0;
+  while (p <= s.size()) {
+    size_t q = s.find(',', p);
+    if (q == std::string::npos) q = s.size();
+    if (q > p) out.push_back(s.substr(p, q - p));
+    p = q + 1;
+  }
+  return out;
+}
+
+// One grid point; the sweep grids below are lists of these.
+struct VecPoint {
+  VecKernel   kernel = VecKernel::SAXPY;
+  bool        f64 = false;
+  size_t      N = 1 << 20, stride = 1, misalign = 0;
+  int         tail = 0, reps = 7, warmup = 2;
+  std::string label = "unit";
+  int         threads = 1;
+  std::string scaling = "none";   // strong | weak | none
+  int         steps = 1;          // stencil time steps per call (blocked rows)
+  bool        blocked = false;    // naive vs tuned temporally blocked stencil
+};
+
+// Per-element flop and byte counts match the original project_1 accounting.
+static double elements(const VecPoint& p, size_t n) {
+  if (p.kernel == VecKernel::STENCIL) return n < 3 ? 0.0 : double((n - 2 + p.stride - 1) / p.stride);
+  return double((n + p.stride - 1) / p.stride);
+}
+static double flops_per_elem(VecKernel k) {
+  return k == VecKernel::MUL ? 1.0 : k == VecKernel::STENCIL ? 5.0 : 2.0;
+}
+static double words_per_elem(VecKernel k) {
+  return k == VecKernel::DOT ? 2.0 : k == VecKernel::STENCIL ? 4.0 : 3.0;
+}
+
+// Three operand buffers sized for the largest point in the run, plus room
+// for the byte misalignment; reused across the whole sweep. Threaded points
+// map their own (untouched) buffers so each worker first-touches its part.
+struct VecBuffers {
+  Arena x, y, z;
+};
+
+// Pinned workers that each run job(k) when released; with one CPU the caller
+// runs the job itself. Waits spin, then yield, so an oversubscribed run still
+// makes progress.
+class VecTeam {
+ public:
+  explicit VecTeam(const std::vector<int>& cpus) : n_(int(cpus.size())) {
+    for (int k = 1; k < n_; ++k)
+      th_.emplace_back([this, k, cpu = cpus[size_t(k)]]() {
+        pin_to_cpu(cpu);
+        uint64_t seen = 0;
+        for (;;) {
+          wait([&]{ return gen_.load(std::memory_order_acquire) != seen; });
+          seen = gen_.load(std::memory_order_acquire);
+          if (quit_.load(std::memory_order_acquire)) return;
+          (*job_)(k);
+          done_.fetch_add(1, std::memory_order_acq_rel);
+        }
+      });
+  }
+  ~VecTeam() {
+    quit_.store(true, std::memory_order_release);
+    gen_.fetch_add(1, std::memory_order_acq_rel);
+    for (auto& t : th_) t.join();
+  }
+  int size() const { return n_; }
+  // job(k) on every worker k (the caller is worker 0); returns when all are done
+  void run(const std::function<void(int)>& job) {
+    job_ = &job;
+    done_.store(0, std::memory_order_release);
+    gen_.fetch_add(1, std::memory_order_acq_rel);
+    job(0);
+    wait([&]{ return done_.load(std::memory_order_acquire) == n_ - 1; });
+  }
+
+ private:
+  template <class Pred> static void wait(Pred ready) {
+    for (int spins = 0; !ready(); ++spins) {
+      if (spins < 4096) cpu_relax(); else std::this_thread::yield();
+    }
+  }
+  int n_;
+  std::vector<std::thread> th_;
+  const std::function<void(int)>* job_ = nullptr;
+  std::atomic<uint64_t> gen_{0};
+  std::atomic<int> done_{0};
+  std::atomic<bool> quit_{false};
+};
+
+// Static partition of [lo, hi) into `parts` contiguous ranges whose starts
+// stay on the stride grid and on 64-element boundaries (whole cache lines).
+static std::vector<std::pair<size_t,size_t>> partition(size_t lo, size_t hi, int parts, size_t stride) {
+  std::vector<std::pair<size_t,size_t>> r;
+  const size_t q = 64 * stride;
+  size_t chunk = (hi - lo + size_t(parts) - 1) / size_t(parts);
+  chunk = (chunk + q - 1) / q * q;
+  for (int k = 0; k < parts; ++k) {
+    size_t a = std::min(hi, lo + size_t(k) * chunk), b = std::min(hi, a + chunk);
+    r.push_back({a, b});
+  }
+  return r;
+}
+
+template <class T>
+static void fill(T* x, T* y, T* z, size_t lo, size_t hi) {
+  for (size_t i = lo; i < hi; ++i) {
+    x[i] = T(1) + T(i % 7) * T(0.125);
+    y[i] = T(0.5) + T(i % 5) * T(0.25);
+    z[i] = T(0);
+  }
+}
+
+// One kernel call over output elements [lo, hi) of an n-element problem
+// (stencil ranges cover interior points, so the halo comes from x[lo-1], x[hi]).
+template <class T>
+static T call_range(const VecOps<T>& ops, VecKernel k, T* x, T* y, T* z,
+                    size_t lo, size_t hi, size_t s) {
+  if (hi <= lo) return T(0);
+  switch (k) {
+    case VecKernel::SAXPY:   ops.saxpy(T(2), x + lo, y + lo, hi - lo, s); break;
+    case VecKernel::DOT:     return ops.dot(x + lo, y + lo, hi - lo, s);
+    case VecKernel::MUL:     ops.mul(x + lo, y + lo, z + lo, hi - lo, s); break;
+    case VecKernel::STENCIL: ops.stencil(x + lo - 1, y + lo - 1, hi - lo + 2, s); break;
+  }
+  return T(0);
+}
+
+struct VecStats { double median_s = 0, p10_s = 0, p90_s = 0, check = 0; };
+
+// Each worker owns one static range: it first-touches its slice of the
+// operands, then every repetition repeats the call until the team's span is at
+// least min_s (so tiny N are not timer-bound); the reported time is per call.
+// check is the max relative error of one team call against a double reference.
+template <class T>
+static VecStats measure(const VecOps<T>& ops, const VecPoint& p, VecBuffers& b, VecTeam& team, double min_s) {
+  T* x = reinterpret_cast<T*>(b.x.ptr + p.misalign);
+  T* y = reinterpret_cast<T*>(b.y.ptr + p.misalign);
+  T* z = reinterpret_cast<T*>(b.z.ptr + p.misalign);
+  const size_t n = p.N - size_t(p.tail ? 1 : 0);   // tail_jagged: one element short of the power of two
+  const size_t s = p.stride;
+  const int nt = team.size();
+  const bool st_k = p.kernel == VecKernel::STENCIL;
+  const auto own  = partition(0, n, nt, s);
+  const auto work = st_k ? partition(1, n > 1 ? n - 1 : 1, nt, s) : own;
+  std::vector<T> partial(size_t(nt) * 16, T(0));     // one cache line apart
+  const std::function<void(int)> init = [&](int k) { fill(x, y, z, own[size_t(k)].first, own[size_t(k)].second); };
+  const std::function<void(int)> once = [&](int k) {
+    partial[size_t(k) * 16] = call_range(ops, p.kernel, x, y, z, work[size_t(k)].first, work[size_t(k)].second, s);
+  };
+
+  VecStats st;
+  team.run(init);
+  std::vector<double> ref;
+  switch (p.kernel) {
+    case VecKernel::SAXPY:
+      for (size_t i = 0; i < n; i += s) ref.push_back(2.0 * double(x[i]) + double(y[i]));
+      break;
+    case VecKernel::DOT:
+      ref.push_back(0.0);
+      for (const auto& w : work) for (size_t i = w.first; i < w.second; i += s) ref[0] += double(x[i]) * double(y[i]);
+      break;
+    case VecKernel::MUL:
+      for (size_t i = 0; i < n; i += s) ref.push_back(double(x[i]) * double(y[i]));
+      break;
+    case VecKernel::STENCIL:
+      for (const auto& w : work)
+        for (size_t i = w.first; i < w.second; i += s)
+          ref.push_back(kStencilC0 * double(x[i-1]) + kStencilC1 * double(x[i]) + kStencilC2 * double(x[i+1]));
+      break;
+  }
+  team.run(once);
+  auto rel = [&](double got, double want) {
+    st.check = std::max(st.check, std::fabs(got - want) / std::max(1e-30, std::fabs(want)));
+  };
+  size_t j = 0;
+  switch (p.kernel) {
+    case VecKernel::SAXPY: for (size_t i = 0; i < n; i += s) rel(double(y[i]), ref[j++]); break;
+    case VecKernel::MUL:   for (size_t i = 0; i < n; i += s) rel(double(z[i]), ref[j++]); break;
+    case VecKernel::DOT: {
+      double got = 0.0;
+      for (int k = 0; k < nt; ++k) got += double(partial[size_t(k) * 16]);
+      rel(got, ref[0]);
+      break;
+    }
+    case VecKernel::STENCIL:
+      for (const auto& w : work) for (size_t i = w.first; i < w.second; i += s) rel(double(y[i]), ref[j++]);
+      break;
+  }
+  team.run(init);
+
+  auto timed = [&](size_t calls) {
+    const std::function<void(int)> job = [&](int k) {
+      T sink = T(0);
+      for (size_t c = 0; c < calls; ++c)
+        sink += call_range(ops, p.kernel, x, y, z, work[size_t(k)].first, work[size_t(k)].second, s);
+      partial[size_t(k) * 16] = sink;
+    };
+    Timer t; t.start();
+    team.run(job);
+    return t.stop_s();
+  };
+  double one = 0.0;
+  for (int w = 0; w < std::max(1, p.warmup); ++w) one = timed(1);
+  const size_t calls = one > 0.0 ? std::max<size_t>(1, size_t(std::ceil(min_s / one))) : 1;
+  std::vector<double> per;
+  for (int r = 0; r < std::max(1, p.reps); ++r) per.push_back(timed(calls) / double(calls));
+  volatile T keep = partial[0]; (void)keep;
+  std::sort(per.begin(), per.end());
+  auto q = [&](double f) { return per[size_t(f * double(per.size() - 1) + 0.5)]; };
+  st.median_s = q(0.5); st.p10_s = q(0.1); st.p90_s = q(0.9);
+  return st;
+}
+
+static std::string fmt_g(double v) {
+  char buf[32];
+  std::snprintf(buf, sizeof buf, "%.3g", v);
+  return buf;
+}
+
+static void add_row(CSV& csv, const VecPoint& p, const char* vecmode, const char* isa,
+                    const VecStats& st, double hz, const std::string& extra = "") {
+  const size_t n = p.N - size_t(p.tail ? 1 : 0);
+  const double el = elements(p, n) * double(p.steps);   // blocked rows: naive-equivalent traffic
+  const double wb = p.f64 ? 8.0 : 4.0;
+  const double s = st.median_s;
+  const double gflops = s > 0 ? el * flops_per_elem(p.kernel) / s / 1e9 : 0.0;
+  const double gibps  = s > 0 ? el * words_per_elem(p.kernel) * wb / s / double(1ull << 30) : 0.0;
+  const double cpe    = el > 0 && hz > 0 ? s * hz / el : 0.0;
+  csv.add_row(std::string(vk_name(p.kernel)) + "," + (p.f64 ? "f64" : "f32") + "," +
+              std::to_string(p.N) + "," + std::to_string(p.stride) + "," +
+              std::to_string(p.misalign) + "," + std::to_string(p.tail) + "," +
+              std::to_string(st.median_s * 1e3) + "," + std::to_string(st.p10_s * 1e3) + "," +
+              std::to_string(st.p90_s * 1e3) + "," + std::to_string(gflops) + "," +
+              std::to_string(gibps) + "," + std::to_string(cpe) + "," + p.label + "," +
+              "mode:" + vecmode + " isa:" + isa + extra + "," + fmt_g(st.check) + "," + vecmode + "," +
+              std::to_string(p.threads) + "," + p.scaling);
+}
+
+// ---------------- temporally blocked stencil + autotuner (--sweep=blocked) ----------------
+// `steps` sweeps of the 3-point stencil, ping-ponging between two arrays with
+// fixed end points. The naive version streams the whole array once per step.
+// The blocked one cuts the interior into tiles; each tile is copied with a
+// `depth`-wide halo into a scratch pair, advanced `depth` steps in cache by
+// the same per-ISA stencil kernel (redundantly recomputing the shrinking
+// halo), and written back, so DRAM sees one pass per `depth` steps.
+
+struct StencilCfg {
+  size_t tile = 4096, depth = 1;
+  int    threads = 1;
+};
+
+template <class T>
+static T* stencil_naive(const VecOps<T>& ops, T* src, T* dst, size_t n, int steps) {
+  for (int t = 0; t < steps; ++t) { ops.stencil(src, dst, n, 1); std::swap(src, dst); }
+  return src;
+}
+
+// The naive sweep with each step's interior split over the team (one
+// barrier per step), so naive and tuned can be compared on equal threads.
+template <class T>
+static T* stencil_naive_team(const VecOps<T>& ops, T* src, T* dst, size_t n, int steps, VecTeam& team) {
+  const auto parts = partition(1, n - 1, team.size(), 1);
+  for (int t = 0; t < steps; ++t) {
+    const std::function<void(int)> job = [&](int k) {
+      const auto [a, b] = parts[size_t(k)];
+      if (b > a) ops.stencil(src + a - 1, dst + a - 1, b - a + 2, 1);   // writes dst[a, b) only
+    };
+    team.run(job);
+    std::swap(src, dst);
+  }
+  return src;
+}
+
+// Advances output range [a, b) of dst by d steps from src, using scratch of
+// at least 2*(b-a+2d) elements.
+template <class T>
+static void stencil_tile(const VecOps<T>& ops, const T* src, T* dst, size_t n,
+                         size_t a, size_t b, size_t d, T* scratch) {
+  const size_t lo = a > d ? a - d : 0, hi = std::min(n, b + d), len = hi - lo;
+  T* s0 = scratch;
+  T* s1 = scratch + len;
+  std::memcpy(s0, src + lo, len * sizeof(T));
+  for (size_t t = 0; t < d; ++t) {
+    ops.stencil(s0, s1, len, 1);
+    s1[0] = s0[0]; s1[len - 1] = s0[len - 1];   // edges: fixed ends or halo that is already stale
+    std::swap(s0, s1);
+  }
+  std::memcpy(dst + a, s0 + (a - lo), (b - a) * sizeof(T));
+}
+
+template <class T>
+static T* stencil_blocked(const VecOps<T>& ops, T* src, T* dst, size_t n, int steps,
+                          const StencilCfg& c, VecTeam& team, std::vector<std::vector<T>>& scratch) {
+  const size_t tiles = (n - 2 + c.tile - 1) / c.tile;
+  const size_t nt = size_t(team.size());
+  for (int done = 0; done < steps; ) {
+    const size_t d = std::min<size_t>(c.depth, size_t(steps - done));
+    const std::function<void(int)> job = [&](int k) {
+      T* sc = scratch[size_t(k)].data();
+      for (size_t j = tiles * size_t(k) / nt; j < tiles * size_t(k + 1) / nt; ++j) {
+        const size_t a = 1 + j * c.tile, b = std::min(n - 1, a + c.tile);
+        stencil_tile(ops, src, dst, n, a, b, d, sc);
+      }
+    };
+    team.run(job);
+    std::swap(src, dst);
+    done += int(d);
+  }
+  return src;
+}
+
+// Per-call stats of `call` (same repetition stretching as measure()).
+static VecStats time_calls(const std::function<void()>& call, int reps, int warmup, double min_s) {
+  VecStats st;
+  auto timed = [&](size_t calls) {
+    Timer t; t.start();
+    for (size_t c = 0; c < calls; ++c) call();
+    return t.stop_s();
+  };
+  double one = 0.0;
+  for (int w = 0; w < std::max(1, warmup); ++w) one = timed(1);
+  const size_t calls = one > 0.0 ? std::max<size_t>(1, size_t(std::ceil(min_s / one))) : 1;
+  std::vector<double> per;
+  for (int r = 0; r < std::max(1, reps); ++r) per.push_back(timed(calls) / double(calls));
+  std::sort(per.begin(), per.end());
+  auto q = [&](double f) { return per[size_t(f * double(per.size() - 1) + 0.5)]; };
+  st.median_s = q(0.5); st.p10_s = q(0.1); st.p90_s = q(0.9);
+  return st;
+}
+
+// Best configurations, one CSV line each; later lines win, so retuning appends.
+// An entry is only reused for the thread grid it was searched over (`grid`,
+// e.g. 1;2;4). naive_ms is the naive sweep on the winner's thread count.
+struct TuneStore {
+  static constexpr const char* kHeader = "machine,vecmode,dtype,N,steps,grid,tile,depth,threads,tuned_ms,naive_ms";
+  std::string path, machine;
+  std::vector<std::vector<std::string>> rows;
+  bool stale = false;   // file has an older header: rewritten on the next add
+
+  static std::string grid_key(const std::vector<int>& grid) {
+    std::string g;
+    for (int t : grid) g += (g.empty() ? "" : ";") + std::to_string(t);
+    return g;
+  }
+  void load() {
+    std::ifstream f(path);
+    bool first = true;
+    for (std::string line; std::getline(f, line); first = false) {
+      if (!line.empty() && line.back() == '\r') line.pop_back();
+      if (first && line != kHeader) stale = true;
+      std::vector<std::string> c;
+      std::stringstream ss(line);
+      for (std::string tok; std::getline(ss, tok, ','); ) c.push_back(tok);
+      if (c.size() == 11 && c[0] != "machine") rows.push_back(c);
+    }
+  }
+  bool find(const std::string& mode, const char* dtype, size_t N, int steps, const std::vector<int>& grid,
+            StencilCfg& out) const {
+    for (auto it = rows.rbegin(); it != rows.rend(); ++it) {
+      const auto& c = *it;
+      if (c[0] == machine && c[1] == mode && c[2] == dtype && c[3] == std::to_string(N) &&
+          c[4] == std::to_string(steps) && c[5] == grid_key(grid)) {
+        out.tile = std::strtoull(c[6].c_str(), nullptr, 10);
+        out.depth = std::strtoull(c[7].c_str(), nullptr, 10);
+        out.threads = std::atoi(c[8].c_str());
+        return out.tile > 0 && out.depth > 0 && out.threads > 0;
+      }
+    }
+    return false;
+  }
+  void add(const std::string& mode, const char* dtype, size_t N, int steps, const std::vector<int>& grid,
+           const StencilCfg& c, double tuned_ms, double naive_ms) {
+    rows.push_back({machine, mode, dtype, std::to_string(N), std::to_string(steps), grid_key(grid),
+                    std::to_string(c.tile), std::to_string(c.depth), std::to_string(c.threads),
+                    std::to_string(tuned_ms), std::to_string(naive_ms)});
+    std::error_code ec;
+    const auto dir = std::filesystem::path(path).parent_path();
+    if (!dir.empty()) std::filesystem::create_directories(dir, ec);
+    const bool fresh = stale || !std::filesystem::exists(path);
+    FILE* f = std::fopen(path.c_str(), fresh ? "w" : "a");
+    if (!f) { std::fprintf(stderr, "cannot write %s\n", path.c_str()); return; }
+    if (fresh) std::fprintf(f, "%s\n", kHeader);
+    for (size_t j = fresh ? 0 : rows.size() - 1; j < rows.size(); ++j)
+      for (size_t i = 0; i < rows[j].size(); ++i)
+        std::fprintf(f, "%s%s", rows[j][i].c_str(), i + 1 < rows[j].size() ? "," : "\n");
+    std::fclose(f);
+    stale = false;
+  }
+};
+
+// Naive and tuned rows for one blocked point. The configuration comes from the
+// store unless `retune`; otherwise tile x depth x threads is searched and the
+// winner appended. Naive is timed on one thread and, when the winner is
+// threaded, on the same team, so naive/tuned at equal threads isolates the
+// temporal blocking. Teams run on the shared (prefaulted) buffers.
+template <class T>
+static void run_blocked(CSV& csv, const VecPoint& p, const std::string& mode, const VecKernels& k,
+                        const VecOps<T>& ops, VecBuffers& b, const std::vector<int>& order,
+                        const std::vector<int>& thread_grid, TuneStore& store, bool retune,
+                        double hz, double min_s) {
+  const size_t n = std::max<size_t>(3, p.N);
+  const char* dtype = p.f64 ? "f64" : "f32";
+  T* x = reinterpret_cast<T*>(b.x.ptr);
+  T* y = reinterpret_cast<T*>(b.y.ptr);
+  T* z = reinterpret_cast<T*>(b.z.ptr);
+  auto init = [&]() { fill(x, y, z, 0, n); y[0] = x[0]; y[n-1] = x[n-1]; };
+
+  auto team_for = [&](int t) {
+    std::vector<int> cpus;
+    for (int i = 0; i < t; ++i) cpus.push_back(order[size_t(i) % order.size()]);
+    return cpus;
+  };
+  StencilCfg best;
+  bool have = !retune && store.find(mode, dtype, n, p.steps, thread_grid, best);
+  const bool searched = !have;
+  double best_s = 0.0;
+  if (!have) {
+    for (int t : thread_grid) {
+      VecTeam team(team_for(t));
+      for (size_t tile = 1024; tile <= std::max<size_t>(1024, std::min<size_t>(n, size_t(1) << 16)); tile *= 2) {
+        for (size_t d = 1; d <= size_t(p.steps); d *= 2) {
+          StencilCfg c{tile, d, t};
+          std::vector<std::vector<T>> sc(size_t(t), std::vector<T>(2 * (tile + 2 * d)));
+          init();
+          VecStats st = time_calls([&]{ stencil_blocked(ops, x, y, n, p.steps, c, team, sc); }, 3, 1, min_s);
+          if (!have || st.median_s < best_s) { best = c; best_s = st.median_s; have = true; }
+        }
+      }
+    }
+  }
+
+  VecTeam team(team_for(best.threads));
+  init();
+  const VecStats naive = time_calls([&]{ stencil_naive(ops, x, y, n, p.steps); }, p.reps, p.warmup, min_s);
+  VecStats naive_team = naive;
+  if (best.threads > 1) {
+    init();
+    naive_team = time_calls([&]{ stencil_naive_team(ops, x, y, n, p.steps, team); }, p.reps, p.warmup, min_s);
+  }
+  if (searched) {
+    store.add(mode, dtype, n, p.steps, thread_grid, best, best_s * 1e3, naive_team.median_s * 1e3);
+    std::fprintf(stderr, "# vec: tuned %s %s N=%zu steps=%d -> tile=%zu depth=%zu threads=%d\n",
+                 mode.c_str(), dtype, n, p.steps, best.tile, best.depth, best.threads);
+  }
+  std::vector<std::vector<T>> sc(size_t(best.threads), std::vector<T>(2 * (best.tile + 2 * best.depth)));
+  // check: one tuned call against one naive call from the same initial state
+  init();
+  std::vector<T> ref(n), tmp(n);
+  std::memcpy(ref.data(), x, n * sizeof(T)); std::memcpy(tmp.data(), y, n * sizeof(T));
+  const T* want = stencil_naive(ops, ref.data(), tmp.data(), n, p.steps);
+  const T* got  = stencil_blocked(ops, x, y, n, p.steps, best, team, sc);
+  VecStats tuned;
+  for (size_t i = 0; i < n; ++i)
+    tuned.check = std::max(tuned.check, std::fabs(double(got[i]) - double(want[i])) / std::max(1e-30, std::fabs(double(want[i]))));
+  if (best.threads > 1) {   // and the threaded naive sweep against the serial one
+    init();
+    const T* par = stencil_naive_team(ops, x, y, n, p.steps, team);
+    for (size_t i = 0; i < n; ++i)
+      naive_team.check = std::max(naive_team.check, std::fabs(double(par[i]) - double(want[i])) / std::max(1e-30, std::fabs(double(want[i]))));
+  }
+  init();
+  VecStats st = time_calls([&]{ stencil_blocked(ops, x, y, n, p.steps, best, team, sc); }, p.reps, p.warmup, min_s);
+  st.check = tuned.check;
+
+  const std::string steps = " steps:" + std::to_string(p.steps);
+  VecPoint q = p;
+  q.label = "naive"; q.threads = 1;
+  add_row(csv, q, mode.c_str(), k.isa, naive, hz, steps);
+  if (best.threads > 1) {
+    q.threads = best.threads;
+    add_row(csv, q, mode.c_str(), k.isa, naive_team, hz, steps);
+  }
+  q.label = "tuned"; q.threads = best.threads;
+  add_row(csv, q, mode.c_str(), k.isa, st, hz,
+          steps + " tile:" + std::to_string(best.tile) + " depth:" + std::to_string(best.depth));
+}
+
+// Knobs of the scaling grid: thread counts, fixed N (strong), N per thread (weak).
+struct ScalingGrid {
+  std::vector<int> threads;
+  size_t strong_N = size_t(1) << 25, weak_N = size_t(1) << 23;
+  int    steps = 8;               // blocked sweep: stencil time steps
+};
+
+// Grids of sweep_locality/stride/alignment/tail.ps1, plus the scaling grid.
+static void sweep_points(const std::string& name, const ScalingGrid& g, std::vector<VecPoint>& out) {
+  const VecKernel all4[] = {VecKernel::SAXPY, VecKernel::DOT, VecKernel::MUL, VecKernel::STENCIL};
+  const VecKernel three[] = {VecKernel::SAXPY, VecKernel::DOT, VecKernel::MUL};
+  for (bool f64 : {false, true}) {
+    if (name == "locality") {
+      for (auto k : all4)
+        for (int e = 13; e <= 23; ++e)
+          out.push_back({k, f64, size_t(1) << e, 1, 0, 0, 7, 2, "unit"});
+    } else if (name == "stride") {
+      for (auto k : all4)
+        for (size_t s : {1, 2, 4, 8, 16, 32})
+          out.push_back({k, f64, size_t(1) << 20, s, 0, 0, 9, 3, "stride"});
+    } else if (name == "alignment") {
+      for (auto k : three)
+        for (size_t m = 0; m < 64; ++m)
+          out.push_back({k, f64, size_t(1) << 20, 1, m, 0, 9, 3, "mis"});
+    } else if (name == "tail") {
+      for (auto k : three)
+        for (int tj : {0, 1})
+          out.push_back({k, f64, size_t(1) << 20, 1, 0, tj, 11, 3, "tail"});
+    } else if (name == "scaling") {
+      for (auto k : all4)
+        for (int t : g.threads) {
+          out.push_back({k, f64, g.strong_N,             1, 0, 0, 7, 2, "scaling", t, "strong"});
+          out.push_back({k, f64, g.weak_N * size_t(t),   1, 0, 0, 7, 2, "scaling", t, "weak"});
+        }
+    } else if (name == "blocked") {
+      for (int e = 13; e <= 24; ++e)
+        out.push_back({VecKernel::STENCIL, f64, size_t(1) << e, 1, 0, 0, 5, 1, "blocked", 1, "none", g.steps, true});
+    }
+  }
+}
+
+void run_vec_bench(int argc, char** argv) {
+  VecPoint one;
+  std::string kernel = "saxpy", dtype = "f32", sweeps, modes = "SCALAR,AUTO,AVX2,AVX512", out;
+  double min_us = 200.0;        // minimum timed span per repetition
+  int cpu = -1;
+  bool no_header = false, masked = true;
+  std::string threads, cpus;    // thread counts (list) and explicit worker CPUs
+  ScalingGrid grid;
+  std::string tune_file = memlab_cache_file("MEMLAB_TUNE_FILE", "stencil_tune.csv");
+  bool retune = false;
+
+  for (int i=1; i<argc; ) {
+    if      (parse_str (i,argc,argv,"--kernel",      kernel)) {}
+    else if (parse_str (i,argc,argv,"--dtype",       dtype)) {}
+    else if (parse_szt (i,argc,argv,"--N",           one.N)) {}
+    else if (parse_szt (i,argc,argv,"--stride",      one.stride)) {}
+    else if (parse_szt (i,argc,argv,"--misalign",    one.misalign)) {}
+    else if (parse_int (i,argc,argv,"--tail_jagged", one.tail)) {}
+    else if (parse_int (i,argc,argv,"--reps",        one.reps)) {}
+    else if (parse_int (i,argc,argv,"--warmup",      one.warmup)) {}
+    else if (parse_str (i,argc,argv,"--label",       one.label)) {}
+    else if (parse_str (i,argc,argv,"--sweep",       sweeps)) {}
+    else if (parse_str (i,argc,argv,"--modes",       modes)) {}
+    else if (parse_dbl (i,argc,argv,"--min_us",      min_us)) {}
+    else if (parse_int (i,argc,argv,"--cpu",         cpu)) {}
+    else if (parse_str (i,argc,argv,"--out",         out)) {}
+    else if (parse_str (i,argc,argv,"--threads",     threads)) {}
+    else if (parse_str (i,argc,argv,"--cpus",        cpus)) {}
+    else if (parse_szt (i,argc,argv,"--strong_N",    grid.strong_N)) {}
+    else if (parse_szt (i,argc,argv,"--weak_N",      grid.weak_N)) {}
+    else if (parse_int (i,argc,argv,"--steps",       grid.steps)) {}
+    else if (parse_str (i,argc,argv,"--tune_file",   tune_file)) {}
+    else if (parse_flag(i,argc,argv,"--tuned"))      one.blocked = true;
+    else if (parse_flag(i,argc,argv,"--retune"))     retune = true;
+    else if (parse_flag(i,argc,argv,"--no-header"))  no_header = true;
+    else if (parse_flag(i,argc,argv,"--no-masked"))  masked = false;
+    else ++i;
+  }
+  grid.steps = std::max(1, grid.steps);
+
+  // workers go on distinct physical cores first, then on SMT siblings
+  std::vector<int> order = cpus.empty() ? std::vector<int>{} : parse_cpu_list(cpus);
+  if (order.empty()) {
+    std::vector<CpuTopo> topo = cpu_topology();
+    std::vector<std::pair<int,int>> seen;
+    std::vector<int> second;
+    if (cpu >= 0) { for (auto& t : topo) if (t.cpu == cpu) { order.push_back(cpu); seen.push_back({t.package, t.core}); } }
+    for (auto& t : topo) {
+      if (t.cpu == cpu) continue;
+      std::pair<int,int> key{t.package, t.core};
+      if (std::find(seen.begin(), seen.end(), key) == seen.end()) { seen.push_back(key); order.push_back(t.cpu); }
+      else second.push_back(t.cpu);
+    }
+    order.insert(order.end(), second.begin(), second.end());
+    if (order.empty()) order.push_back(cpu);
+  }
+  for (auto& t : split_csv_list(threads)) grid.threads.push_back(std::max(1, std::atoi(t.c_str())));
+  if (grid.threads.empty()) {
+    if (sweeps.find("scaling") != std::string::npos || sweeps.find("blocked") != std::string::npos ||
+        sweeps == "all" || one.blocked) {
+      for (int t = 1; t < int(order.size()); t *= 2) grid.threads.push_back(t);
+      grid.threads.push_back(int(order.size()));
+    } else {
+      grid.threads.push_back(1);
+    }
+  }
+
+  std::vector<VecPoint> pts;
+  if (sweeps.empty()) {
+    if (!vk_parse(kernel, one.kernel)) { std::fprintf(stderr, "vec: unknown --kernel %s\n", kernel.c_str()); return; }
+    one.f64 = dtype == "f64";
+    one.stride = std::max<size_t>(1, one.stride);
+    one.tail = one.tail ? 1 : 0;
+    if (one.blocked) {   // threads are a tuning dimension here, not a grid
+      if (one.kernel != VecKernel::STENCIL) { std::fprintf(stderr, "vec: --tuned needs --kernel stencil\n"); return; }
+      one.steps = grid.steps;
+      one.stride = 1; one.misalign = 0; one.tail = 0; one.label = "blocked";
+      pts.push_back(one);
+    }
+    else for (int t : grid.threads) { one.threads = t; pts.push_back(one); }
+  } else {
+    for (auto& s : split_csv_list(sweeps == "all" ? "locality,stride,alignment,tail,scaling" : sweeps)) {
+      size_t before = pts.size();
+      sweep_points(s, grid, pts);
+      if (pts.size() == before) std::fprintf(stderr, "vec: unknown sweep '%s' ignored\n", s.c_str());
+    }
+  }
+
+  std::vector<std::pair<VecMode, const VecKernels*>> variants;
+  for (auto& m : split_csv_list(modes)) {
+    VecMode vm;
+    if      (m == "SCALAR") vm = VecMode::SCALAR;
+    else if (m == "AUTO")   vm = VecMode::AUTO;
+    else if (m == "AVX2")   vm = VecMode::AVX2;
+    else if (m == "AVX512") vm = VecMode::AVX512;
+    else { std::fprintf(stderr, "vec: unknown mode '%s' ignored\n", m.c_str()); continue; }
+    const VecKernels* k = vec_kernels(vm);
+    if (!k) { std::fprintf(stderr, "# vec: %s not available on this CPU/build; skipped\n", m.c_str()); continue; }
+    variants.push_back({vm, k});
+  }
+
+  for (auto& p : pts) {
+    if (p.threads > int(order.size())) {
+      std::fprintf(stderr, "# vec: %d threads on %zu CPUs; workers will share CPUs\n", p.threads, order.size());
+      break;
+    }
+  }
+
+  size_t max_bytes = 0;
+  for (auto& p : pts) if (p.threads == 1) max_bytes = std::max(max_bytes, p.N * (p.f64 ? 8 : 4) + p.misalign);
+  pin_to_cpu(cpu);
+  VecBuffers b;
+  b.x = arena_alloc(max_bytes + 64);
+  b.y = arena_alloc(max_bytes + 64);
+  b.z = arena_alloc(max_bytes + 64);
+  if (!b.x.ptr || !b.y.ptr || !b.z.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", max_bytes); return; }
+  touch_memory(b.x.ptr, b.x.bytes); touch_memory(b.y.ptr, b.y.bytes); touch_memory(b.z.ptr, b.z.bytes);
+  const double hz = tsc_hz();
+  TuneStore store;
+  for (auto& p : pts) {
+    if (!p.blocked) continue;
+    store.path = tune_file; store.machine = machine_id(); store.load();
+    std::fprintf(stderr, "# vec: stencil tuning file %s (%zu entries)\n", tune_file.c_str(), store.rows.size());
+    break;
+  }
+
+  CSV csv;
+  if (!no_header)
+    csv.set_header("kernel,dtype,N,stride,misalign,tail,median_ms,p10_ms,p90_ms,gflops,gibps,cpe,"
+                   "label,hint,check,vecmode,threads,scaling");
+  std::fprintf(stderr, "# vec: %zu points x %zu variants\n", pts.size(), variants.size());
+  for (auto& p : pts) {
+    std::vector<int> team_cpus;
+    for (int t = 0; t < p.threads; ++t) team_cpus.push_back(order[size_t(t) % order.size()]);
+    if (p.threads > 1) pin_to_cpu(team_cpus[0]);
+    VecTeam team(team_cpus);
+    VecBuffers pb = b;
+    if (p.threads > 1) {   // fresh, untouched pages: placement follows the workers' first touch
+      const size_t bytes = p.N * (p.f64 ? 8 : 4) + p.misalign + 64;
+      pb.x = arena_alloc(bytes); pb.y = arena_alloc(bytes); pb.z = arena_alloc(bytes);
+      if (!pb.x.ptr || !pb.y.ptr || !pb.z.ptr) { std::fprintf(stderr, "cannot map %zu bytes\n", bytes); break; }
+    }
+    for (auto& [vm, k] : variants) {
+      const std::string name = vec_mode_name(vm);
+      auto run = [&](const VecOps<float>& f, const VecOps<double>& d, const std::string& mode) {
+        if (p.blocked) {
+          if (p.f64) run_blocked(csv, p, mode, *k, d, pb, order, grid.threads, store, retune, hz, min_us * 1e-6);
+          else       run_blocked(csv, p, mode, *k, f, pb, order, grid.threads, store, retune, hz, min_us * 1e-6);
+          return;
+        }
+        VecStats st = p.f64 ? measure(d, p, pb, team, min_us * 1e-6) : measure(f, p, pb, team, min_us * 1e-6);
+        add_row(csv, p, mode.c_str(), k->isa, st, hz);
+      };
+      run(k->f32, k->f64, name);
+      // masked-tail variant only differs when the length is not a vector multiple
+      if (masked && p.tail && p.stride == 1 && k->f32_masked.saxpy)
+        run(k->f32_masked, k->f64_masked, name + "_MASKED");
+    }
+    if (p.threads > 1) {
+      arena_free(pb.x); arena_free(pb.y); arena_free(pb.z);
+      pin_to_cpu(cpu);
+    }
+  }
+  if (out.empty()) csv.print(); else csv.write(out);
+  arena_free(b.x); arena_free(b.y); arena_free(b.z);
+}
@@ -0,0 +1,40 @@
+// src/vec_kernels.h
+// Project 1 vector kernels (saxpy, dot, mul, 3-point stencil), compiled once
+// per instruction set from vec_kernels.inc and picked at run time. Each
+// vec_<isa>.cpp is built with its own -march/-m flags (see CMakeLists.txt), so
+// one binary carries the SCALAR, AUTO, AVX2 and AVX-512 variants that used to
+// need three separate project_1 builds.
+#pragma once
+#include <cstddef>
+
+// n = elements in the arrays, s = element stride (s=1 is the unit-stride loop).
+template <class T>
+struct VecOps {
+  void (*saxpy)(T a, const T* x, T* y, size_t n, size_t s);       // y = a*x + y
+  T    (*dot)(const T* x, const T* y, size_t n, size_t s);         // sum x*y
+  void (*mul)(const T* x, const T* y, T* z, size_t n, size_t s);   // z = x*y
+  void (*stencil)(const T* x, T* y, size_t n, size_t s);           // y[i] = c0*x[i-1] + c1*x[i] + c2*x[i+1]
+  // `iters` rounds of kFmaChains independent a = a*m + c chains held in
+  // registers (peak-FLOP probe); stores their sum to *sink, returns flops.
+  double (*fma)(T* sink, size_t iters);
+};
+
+struct VecKernels {
+  const char*    isa;      // what the variant was compiled for
+  VecOps<float>  f32;
+  VecOps<double> f64;
+  // Unit-stride loops whose remainder is one masked vector op instead of a
+  // scalar epilogue; all-null for variants without mask support.
+  VecOps<float>  f32_masked;
+  VecOps<double> f64_masked;
+};
+
+inline constexpr double kStencilC0 = 0.25, kStencilC1 = 0.5, kStencilC2 = 0.25;
+// enough chains to cover FMA latency x issue ports on current x86 cores
+inline constexpr int    kFmaChains = 12;
+
+enum class VecMode { SCALAR, AUTO, AVX2, AVX512 };
+
+const char*       vec_mode_name(VecMode m);
+// nullptr when the variant was not built for this target or the CPU lacks it.
+const VecKernels* vec_kernels(VecMode m);
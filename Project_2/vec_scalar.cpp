@@ -0,0 +1,8 @@
+// src/vec_scalar.cpp
+// Plain loops with the vectorizer switched off (see CMakeLists.txt).
+#define VEC_NS       vec_scalar
+#define VEC_ISA_NAME "SSE2+"
+#define VEC_WIDTH    0
+#include "vec_kernels.inc"
+
+const VecKernels* vec_kernels_scalar() { return &VEC_NS::table; }
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Columnar cache of fio JSON results, so figures do not re-parse out/*.json.
+
+``update(out)`` decodes every new fio output in ``out/`` exactly once into
+``out/fio.store`` and records its (size, mtime) in the schema. The next run
+only reads the files that were added since. If a known file was changed or
+removed, the store is rebuilt. The store is a directory of raw little-endian
+column files, read back through ``np.memmap`` (same layout as
+Project_1/results_store.py), holding three tables:
+
+  runs   one row per (file, job, direction with I/O): job options (rw, bs,
+         iodepth, ioengine, numjobs, rwmixread, direct), runtime, io_bytes,
+         bandwidth, IOPS and min/max/mean/stddev/N of slat, clat and lat
+  pct    fio's percentile list per run and stat: (run, stat, pct, value_ns)
+  bins   the latency histogram per run and stat from ``--output-format=json+``:
+         (run, stat, value_ns, count)
+
+``percentiles()`` recomputes any percentile from the bins, merging every job
+and direction of a file. Without bins it interpolates fio's own list, which
+is exact at the points fio printed. ``jobs()`` is the per-file view the
+plots use.
+"""
+import argparse, fnmatch, json, os, re, sys
+import numpy as np
+import pandas as pd
+
+STATS = ("slat", "clat", "lat")          # pct/bins `stat` column holds the index into this
+DIRS  = ("read", "write", "trim")
+TABLES = {   # table -> (categorical, int64, float64) columns
+    "runs": (("file", "job", "dir", "rw", "ioengine"),
+             ("jobno", "bs_B", "iodepth", "numjobs", "rwmixread", "direct", "runtime_ms", "io_bytes", "total_ios"),
+             ("bw_Bps", "iops") + tuple(f"{s}_{m}" for s in STATS for m in ("min_ns", "max_ns", "mean_ns", "stddev_ns", "N"))),
+    "pct":  ((), ("run", "stat"), ("pct", "value_ns")),
+    "bins": ((), ("run", "stat", "value_ns", "count"), ()),
+}
+SCHEMA = "schema.json"
+
+def store_for(out_dir):
+    return os.path.join(out_dir, "fio.store")
+
+def _size(s, which=0):
+    """fio size option ('4k', '128KiB', '4096', '4k,64k' = read,write) -> bytes, -1 if unparsable"""
+    parts = str(s).split(",")
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(i?b)?\s*", parts[min(which, len(parts) - 1)], re.IGNORECASE)
+    if not m: return -1
+    return int(float(m.group(1)) * 1024 ** " kmgt".index(m.group(2).lower() or " "))
+
+def _int(x, default=-1):
+    try: return int(float(x))
+    except (TypeError, ValueError): return default
+
+def load(path):
+    """Decoded fio JSON. fio may print notes before the JSON (and json+ after
+    it), so decoding starts at the first '{' and stops at the end of the object."""
+    with open(path, "rb") as f:
+        txt = f.read().decode("utf-8", errors="replace")
+    return json.JSONDecoder().raw_decode(txt, txt.index("{"))[0]
+
+def parse(name, d, run0):
+    """Rows of the three tables for one decoded fio output; run ids start at run0."""
+    runs, pct, bins = [], [], []
+    glob_opts = d.get("global options", {})
+    for jobno, j in enumerate(d.get("jobs", [])):
+        o = {**glob_opts, **j.get("job options", {})}
+        for di, dr in enumerate(DIRS):
+            s = j.get(dr)
+            if not s or not (s.get("total_ios") or s.get("io_bytes")):   # fio prints all directions, most idle
+                continue
+            run = run0 + len(runs)
+            bw = s.get("bw_bytes")
+            r = dict(file=name, job=j.get("jobname", o.get("name", "")), dir=dr, rw=o.get("rw", ""),
+                     ioengine=o.get("ioengine", ""), jobno=jobno, bs_B=_size(o.get("bs", "4k"), di),
+                     iodepth=_int(o.get("iodepth", 1)), numjobs=_int(o.get("numjobs", 1)),
+                     rwmixread=_int(o.get("rwmixread")), direct=_int(o.get("direct", 0)),
+                     runtime_ms=_int(s.get("runtime")), io_bytes=_int(s.get("io_bytes")),
+                     total_ios=_int(s.get("total_ios")),
+                     bw_Bps=float(bw) if bw is not None else s.get("bw", np.nan) * 1024.0, iops=s.get("iops", np.nan))
+            for si, st in enumerate(STATS):
+                lat = s.get(f"{st}_ns") or {}
+                for m in ("min", "max", "mean", "stddev"):
+                    r[f"{st}_{m}_ns"] = lat.get(m, np.nan)
+                r[f"{st}_N"] = lat.get("N", np.nan)
+                p = lat.get("percentile") or {}
+                if p:
+                    pct.append((np.full(len(p), run), np.full(len(p), si),
+                                np.fromiter(map(float, p.keys()), float, len(p)),
+                                np.fromiter(p.values(), float, len(p))))
+                b = lat.get("bins") or {}
+                if b:
+                    bins.append((np.full(len(b), run), np.full(len(b), si),
+                                 np.fromiter(map(int, b.keys()), np.int64, len(b)),
+                                 np.fromiter(b.values(), np.int64, len(b))))
+            runs.append(r)
+    return runs, pct, bins
+
+class Store:
+    def __init__(self, path):
+        self.path = path
+        meta = os.path.join(path, SCHEMA)
+        if os.path.exists(meta):
+            with open(meta, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = self._empty()
+
+    @staticmethod
+    def _empty():
+        return {"version": 1, "files": {}, "rows": {t: 0 for t in TABLES},
+                "categories": {c: [] for c in TABLES["runs"][0]}}
+
+    def rows(self, table):
+        return self.meta["rows"][table]
+
+    def _col_file(self, table, col):
+        return os.path.join(self.path, f"{table}.{col}.bin")
+
+    @staticmethod
+    def _dtype(table, col):
+        cats, ints, _ = TABLES[table]
+        return np.int32 if col in cats else np.int64 if col in ints else np.float64
+
+    def column(self, table, col):
+        """Memory-mapped column (codes for categorical ones)."""
+        n = self.rows(table)
+        if n == 0:
+            return np.empty(0, self._dtype(table, col))
+        return np.memmap(self._col_file(table, col), dtype=self._dtype(table, col), mode="r", shape=(n,))
+
+    def frame(self, table, ids=None, columns=None):
+        """DataFrame of the given row ids (all rows if None); categorical columns stay categorical."""
+        cats, ints, floats = TABLES[table]
+        out = {}
+        for col in columns or cats + ints + floats:
+            arr = np.asarray(self.column(table, col) if ids is None else self.column(table, col)[ids])
+            out[col] = pd.Categorical.from_codes(arr, self.meta["categories"][col]) if col in cats else arr
+        return pd.DataFrame(out)
+
+    def _write(self, table, cols):
+        cats, ints, floats = TABLES[table]
+        n = self.rows(table)
+        for col in cats + ints + floats:
+            f = self._col_file(table, col)
+            if os.path.exists(f):   # drop bytes of an append that never reached schema.json
+                os.truncate(f, n * np.dtype(self._dtype(table, col)).itemsize)
+            arr = np.asarray(cols[col], self._dtype(table, col))
+            with open(f, "ab") as fh:
+                fh.write(arr.astype(arr.dtype.newbyteorder("<")).tobytes())
+        self.meta["rows"][table] = n + len(cols[(cats + ints + floats)[0]])
+
+    def append(self, files, runs, pct, bins):
+        """Add parsed rows; `files` maps file name -> (size, mtime_ns, first run id)."""
+        os.makedirs(self.path, exist_ok=True)
+        cats = self.meta["categories"]
+        cols = {}
+        for c in TABLES["runs"][0]:
+            lookup = {v: i for i, v in enumerate(cats[c])}
+            codes = []
+            for r in runs:
+                v = str(r[c])
+                if v not in lookup:
+                    lookup[v] = len(cats[c]); cats[c].append(v)
+                codes.append(lookup[v])
+            cols[c] = codes
+        for c in TABLES["runs"][1] + TABLES["runs"][2]:
+            cols[c] = [r[c] for r in runs]
+        self._write("runs", cols)
+        for table, parts in (("pct", pct), ("bins", bins)):
+            names = TABLES[table][1] + TABLES[table][2]
+            self._write(table, {c: np.concatenate([p[i] for p in parts]) if parts else [] for i, c in enumerate(names)})
+        self.meta["files"].update({k: list(v) for k, v in files.items()})
+        tmp = os.path.join(self.path, SCHEMA + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.path, SCHEMA))   # schema last: readers never see a half-written store
+
+def update(out_dir, store=None, pattern="*.json", verbose=False):
+    """Ingest fio outputs in `out_dir` the store has not seen; returns the store path."""
+    store = store or store_for(out_dir)
+    s = Store(store)
+    seen = s.meta["files"]
+    on_disk = {}
+    for e in os.scandir(out_dir):
+        if e.is_file() and fnmatch.fnmatch(e.name, pattern):
+            st = e.stat()
+            on_disk[e.name] = (st.st_size, st.st_mtime_ns)
+    if any(k not in on_disk or tuple(v[:2]) != on_disk[k] for k, v in seen.items()):
+        if verbose: print(f"[fio_store] inputs changed or removed, rebuilding {store}", file=sys.stderr)
+        s.meta = s._empty()
+    new = sorted(k for k in on_disk if k not in s.meta["files"])
+    if not new:
+        return store
+    runs, pct, bins, files = [], [], [], {}
+    run0 = s.rows("runs")
+    for name in new:
+        try:
+            r, p, b = parse(name, load(os.path.join(out_dir, name)), run0 + len(runs))
+        except (ValueError, KeyError) as e:   # e.g. an interrupted run left a truncated file
+            print(f"[fio_store] skipping {name}: {e}", file=sys.stderr)
+            continue
+        files[name] = (*on_disk[name], run0 + len(runs))
+        runs += r; pct += p; bins += b
+    s.append(files, runs, pct, bins)
+    if verbose: print(f"[fio_store] +{len(files)} files, {len(runs)} runs -> {store}", file=sys.stderr)
+    return store
+
+def percentiles(store, qs=(50, 95, 99, 99.9), stat="clat"):
+    """Latency percentiles (ns) of `stat` per file, columns p50, p95, ...
+    From the merged histogram of all the file's runs where bins exist, else
+    interpolated from fio's percentile list of the run with the most I/Os."""
+    s = Store(store)
+    si = STATS.index(stat)
+    runs = s.frame("runs", columns=["file", "total_ios"])
+    runs["file"] = runs["file"].astype(str)
+    name = lambda q: f"p{q:g}".replace(".", "")
+    out = pd.DataFrame(index=pd.Index(runs["file"].unique(), name="file"))
+
+    b = s.frame("bins")
+    b = b[b["stat"] == si]
+    if len(b):
+        b = b.assign(file=runs["file"].to_numpy()[b["run"]]).groupby(["file", "value_ns"])["count"].sum().reset_index()
+        cum = b.groupby("file")["count"].cumsum()
+        tot = b.groupby("file")["count"].transform("sum")
+        for q in qs:
+            out.loc[:, name(q)] = b[cum >= tot * q / 100.0].groupby("file")["value_ns"].first().astype(float)
+
+    p = s.frame("pct")
+    p = p[p["stat"] == si]
+    todo = out.index if len(out.columns) == 0 else out.index[out.isna().all(axis=1)]
+    if len(p) and len(todo):
+        top = runs.loc[runs["file"].isin(todo)].sort_values("total_ios").groupby("file").tail(1)
+        p = p[p["run"].isin(top.index)].sort_values(["run", "pct"])
+        for run, g in p.groupby("run"):
+            f = runs.at[run, "file"]
+            for q in qs:
+                out.loc[f, name(q)] = np.interp(q, g["pct"], g["value_ns"], left=np.nan, right=np.nan)
+    return out.reindex(columns=[name(q) for q in qs])
+
+def jobs(store, qs=(50, 95, 99, 99.9)):
+    """One row per fio output file: options of its first job, summed MBps/IOPS
+    over jobs and directions, I/O-weighted mean completion latency and clat
+    percentiles, all latencies in ms."""
+    r = Store(store).frame("runs")
+    if r.empty:
+        return pd.DataFrame(columns=["file", "job", "rw", "bs_B", "iodepth", "ioengine", "rwmixread",
+                                     "MBps", "IOPS", "lat_ms"] + [f"p{q:g}_ms".replace(".", "") for q in qs])
+    r["file"] = r["file"].astype(str)
+    # clat as the old per-file reader had it, lat where fio reported no clat
+    r["lat_mean_ns_w"] = r["clat_mean_ns"].where(r["clat_mean_ns"] > 0, r["lat_mean_ns"]) * r["total_ios"]
+    g = r.groupby("file", sort=False)
+    out = g[["job", "rw", "bs_B", "iodepth", "ioengine", "rwmixread"]].first()
+    out["job"], out["rw"], out["ioengine"] = (out[c].astype(str) for c in ("job", "rw", "ioengine"))
+    out["MBps"] = g["bw_Bps"].sum() / 1048576.0
+    out["IOPS"] = g["iops"].sum()
+    out["lat_ms"] = g["lat_mean_ns_w"].sum() / g["total_ios"].sum().where(lambda n: n > 0) / 1e6
+    pc = percentiles(store, qs) / 1e6
+    out = out.join(pc.rename(columns=lambda c: c + "_ms"))
+    return out.reset_index()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("out", nargs="?", default="out", help="directory of fio JSON outputs")
+    ap.add_argument("--store", default=None, help="store directory (default: <out>/fio.store)")
+    ap.add_argument("--pct", type=float, nargs="*", default=[50, 95, 99, 99.9], help="clat percentiles to list")
+    ap.add_argument("--csv", default=None, help="write the per-file table here (default: stdout)")
+    A = ap.parse_args()
+    st = update(A.out, A.store, verbose=True)
+    jobs(st, tuple(A.pct)).to_csv(A.csv or sys.stdout, index=False)
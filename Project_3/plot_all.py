@@ -1,38 +1,31 @@
 #!/usr/bin/env python3
-import json, glob, re, math, os
+import fnmatch, glob, re, math, os, sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# knee detection shared with the memlab intensity sweeps
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Project_2", "scripts"))
+import saturation
+import fio_store
+
 OUT = "out"
 os.makedirs(OUT, exist_ok=True)
 
-def sec_key(j):
-    # fio sometimes nests stats under 'read'/'write' or 'trim'; pick whichever exists
-    for k in ("read","write","randread","randwrite"):
-        if k in j: return k
-    # fallback: jobs[0] may already be the dict of metrics
-    return None
-
-def metrics_from_job(j):
-    bw_bytes = j.get("bw_bytes")
-    MBps = (bw_bytes/1048576.0) if bw_bytes is not None else j.get("bw",0)/1024.0
-    IOPS = j.get("iops",0.0)
-    lat = j.get("clat_ns") or j.get("lat_ns") or {}
-    mean = lat.get("mean", float("nan"))/1e6
-    pct  = lat.get("percentile") or lat.get("percentiles") or {}
-    p95  = (pct.get("95.000000") if "95.000000" in pct else float("nan"))/1e6
-    p99  = (pct.get("99.000000") if "99.000000" in pct else float("nan"))/1e6
-    return dict(MBps=MBps, IOPS=IOPS, lat_ms=mean, p95_ms=p95, p99_ms=p99)
+# every fio JSON in out/ is decoded once into out/fio.store (new files only on later runs);
+# the figures below read its per-file table instead of re-opening the JSON
+RUNS = fio_store.jobs(fio_store.update(OUT)).set_index("file")
+
+def have(path):
+    return os.path.basename(path) in RUNS.index
+
+def outputs(pattern):
+    """out/ paths of the cached fio results whose name matches a glob"""
+    return [f"{OUT}/{f}" for f in RUNS.index if fnmatch.fnmatch(f, pattern)]
 
 def read_json(path):
-    d = json.load(open(path))
-    j0 = d["jobs"][0]
-    k  = sec_key(j0)
-    j  = j0[k] if k else j0
-    m  = metrics_from_job(j)
-    m["path"] = path
-    return m
+    r = RUNS.loc[os.path.basename(path)]
+    return dict(MBps=r["MBps"], IOPS=r["IOPS"], lat_ms=r["lat_ms"], p95_ms=r["p95_ms"], p99_ms=r["p99_ms"], path=path)
 
 # ---------- 1) Zero-queue table ----------
 zfiles = [
@@ -56,7 +49,7 @@ zero_df.to_csv(f"{OUT}/zero_queue_pretty.csv", index=False)
 # ---------- 2) Block-size sweeps ----------
 def collect_bs(kind):  # kind in {"rand","seq"}
     rec=[]
-    for p in glob.glob(f"{OUT}/bs_{kind}_*_*.json"):
+    for p in outputs(f"bs_{kind}_*_*.json"):
         m = re.search(rf"{OUT}/bs_{kind}_(R|W)_(\d+k)_(\d+)\.json", p)
         if not m: continue
         op, bs, rep = m.groups()
@@ -105,7 +98,7 @@ seq_df  = collect_bs("seq");   plot_bs(seq_df,  "seq")
 
 # ---------- 3) Read/Write mix ----------
 mix_rows=[]
-for p in glob.glob(f"{OUT}/mix_*.json"):
+for p in outputs("mix_*.json"):
     r = read_json(p)
     label = re.search(rf"{OUT}/mix_(.+?)_1\.json", p).group(1)
     mix_rows.append(dict(label=label, IOPS=r["IOPS"], MBps=r["MBps"], latavg_ms=r["lat_ms"]))
@@ -117,45 +110,50 @@ fig.tight_layout(); fig.savefig(f"{OUT}/rw_mix.png", dpi=200); plt.close(fig)
 
 # ---------- 4) QD trade-off with error bars ----------
 def collect_qd(prefix):
+    """(per-run rows, per-QD mean/std)"""
     rows=[]
-    for p in glob.glob(f"{OUT}/{prefix}_*.json"):
+    for p in outputs(f"{prefix}_*.json"):
         m = re.search(rf"{OUT}/{re.escape(prefix)}_(\d+)_(\d+)\.json", p)
         if not m: continue
         qd, rep = map(int, m.groups())
         r = read_json(p); rows.append(dict(qd=qd, rep=rep, **r))
     df = pd.DataFrame(rows)
-    return df.groupby("qd").agg(MBps=("MBps","mean"), MBps_std=("MBps","std"),
-                                IOPS=("IOPS","mean"),  IOPS_std=("IOPS","std"),
-                                lat_ms=("lat_ms","mean"), lat_std=("lat_ms","std")).reset_index()
+    return df, df.groupby("qd").agg(MBps=("MBps","mean"), MBps_std=("MBps","std"),
+                                    IOPS=("IOPS","mean"),  IOPS_std=("IOPS","std"),
+                                    lat_ms=("lat_ms","mean"), lat_std=("lat_ms","std")).reset_index()
 
-def tradeoff_scatter(df, ycol, title, fname):
+def tradeoff_scatter(runs, df, ycol, title, fname):
     fig, ax = plt.subplots(figsize=(9,6))
     ax.errorbar(df["lat_ms"], df[ycol], xerr=df["lat_std"], yerr=df[f"{ycol}_std"], marker="o")
     ax.set_title(title); ax.set_xlabel("Avg latency (ms)"); ax.set_ylabel("IOPS" if ycol=="IOPS" else "MB/s")
-    # knee ~ lowest latency before flattening; annotate QD≈1 visually
-    i0 = df["qd"].idxmin()
-    ax.annotate("knee ~ QD1", (df.loc[i0,"lat_ms"], df.loc[i0,ycol]), xytext=(df.loc[i0,"lat_ms"]+0.001, df.loc[i0,ycol]+(50 if ycol=="IOPS" else 2)), arrowprops=dict(arrowstyle="->"))
+    # knee of the Little's-law bound X(QD) = Xmax*min(QD/QD*,1), bootstrapped over the repeats
+    k = saturation.knee_frame(runs, "qd", ycol)
+    i = saturation.nearest(df["qd"], k)
+    ax.axhline(k.x_max, ls=":", color="gray", lw=1)
+    ax.annotate(f"{k.label('QD')}\nplateau {k.x_max:.0f} {'IOPS' if ycol=='IOPS' else 'MB/s'}",
+                (df.loc[i,"lat_ms"], df.loc[i,ycol]), xytext=(20,-40), textcoords="offset points",
+                arrowprops=dict(arrowstyle="->"))
     fig.tight_layout(); fig.savefig(fname, dpi=200); plt.close(fig)
+    return k
 
-qd4k  = collect_qd("qd_4k_rand");     qd4k["qd"]=qd4k["qd"]
-qd128 = collect_qd("qd_128k_seq");    qd128["qd"]=qd128["qd"]
-tradeoff_scatter(qd4k,  "IOPS", "Throughput vs Latency (4k rand)",   f"{OUT}/qd_tradeoff_4k_rand_err.png")
-tradeoff_scatter(qd128, "MBps", "Throughput vs Latency (128k seq)", f"{OUT}/qd_tradeoff_128k_seq_err.png")
+qd4k_runs,  qd4k  = collect_qd("qd_4k_rand")
+qd128_runs, qd128 = collect_qd("qd_128k_seq")
+knees = [dict(sweep=name, qd_knee=k.n if k.found else float("nan"), qd_lo=k.n_lo, qd_hi=k.n_hi,
+              plateau=k.x_max, unit=unit, saturated=k.saturated, found=k.found)
+         for name, unit, k in [
+    ("4k_rand",  "IOPS", tradeoff_scatter(qd4k_runs,  qd4k,  "IOPS", "Throughput vs Latency (4k rand)",   f"{OUT}/qd_tradeoff_4k_rand_err.png")),
+    ("128k_seq", "MB/s", tradeoff_scatter(qd128_runs, qd128, "MBps", "Throughput vs Latency (128k seq)", f"{OUT}/qd_tradeoff_128k_seq_err.png"))]]
+pd.DataFrame(knees).to_csv(f"{OUT}/qd_knee.csv", index=False)
 
 # ---------- 5) Tail latency ----------
 def p_from_json(p):
-    d=json.load(open(p))["jobs"][0]
-    k=sec_key(d); j=d[k] if k else d
-    pct=(j.get("clat_ns") or j.get("lat_ns") or {}).get("percentile",{})
-    def g(key): 
-        v=pct.get(key); 
-        return float("nan") if v is None else v/1e6
-    return dict(p50=g("50.000000"), p95=g("95.000000"), p99=g("99.000000"), p999=g("99.900000"))
+    r=RUNS.loc[os.path.basename(p)]
+    return dict(p50=r["p50_ms"], p95=r["p95_ms"], p99=r["p99_ms"], p999=r["p999_ms"])
 
 tail=[]
 for qd in (8,64):
     path=f"{OUT}/tail_4k_rand_qd{qd}_1.json"
-    if os.path.exists(path):
+    if have(path):
         r=p_from_json(path); r["qd"]=qd; tail.append(r)
 if tail:
     tdf=pd.DataFrame(tail).sort_values("qd")
@@ -170,7 +168,7 @@ def label_from_ws(p):
     return "256MiB window" if "ws_small" in p else "8GiB window"
 ws=[]
 for p in [f"{OUT}/ws_small.json", f"{OUT}/ws_large.json"]:
-    if os.path.exists(p):
+    if have(p):
         r=read_json(p); ws.append(dict(label=label_from_ws(p), MBps=r["MBps"], lat_ms=r["lat_ms"]))
 if ws:
     wdf=pd.DataFrame(ws)
@@ -196,7 +194,7 @@ if logs:
     ax.legend(); fig.tight_layout(); fig.savefig(f"{OUT}/slc_bw.png", dpi=200); plt.close(fig)
 
 # ---------- 8) Compressibility ----------
-if all(os.path.exists(f"{OUT}/{x}.json") for x in ["comp0","comp50"]):
+if all(have(f"{OUT}/{x}.json") for x in ["comp0","comp50"]):
     c0=read_json(f"{OUT}/comp0.json")["MBps"]; c5=read_json(f"{OUT}/comp50.json")["MBps"]
     fig,ax=plt.subplots(figsize=(9,5))
     ax.bar(["0% (incompressible)","50%"], [c0,c5])